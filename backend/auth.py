@@ -140,8 +140,9 @@ class AuthManager:
                     "user_id": token[3:13],  # First 10 chars after ws_
                     "permissions": ["chat", "search", "image", "tts"],
                     "rate_limit": {
-                        "requests_per_minute": 60,
-                        "requests_per_day": 1000
+                        "requests_per_minute": settings.RATE_LIMIT_PER_MINUTE,
+                        "requests_per_day": 1000,
+                        "enforced": not settings.NO_RATE_LIMIT
                     },
                     "usage": {
                         "requests_today": 45,
@@ -0,0 +1,4 @@
+"""
+Gateway Benchmarks
+Offline load tests against a local mock upstream; see README.md for usage
+"""
@@ -0,0 +1,120 @@
+"""
+Load Generator
+Concurrent chat-completion load with latency, TTFT and inter-chunk timing per request
+"""
+
+import asyncio
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+
+@dataclass
+class Sample:
+    latency: float = 0.0
+    ttft: Optional[float] = None
+    chunks: int = 0
+    gaps: List[float] = field(default_factory=list)
+    status: int = 0
+    error: Optional[str] = None
+
+
+def _has_content(line: str) -> bool:
+    # Role-only and finish events carry no text; gateways encode compactly, upstreams may not
+    return '"content"' in line and '"content":""' not in line and '"content": ""' not in line
+
+
+async def _one(client: httpx.AsyncClient, url: str, payload: Dict[str, Any], stream: bool) -> Sample:
+    sample = Sample()
+    start = time.perf_counter()
+    try:
+        if not stream:
+            response = await client.post(url, json=payload)
+            sample.status = response.status_code
+            response.read()
+        else:
+            async with client.stream("POST", url, json=payload) as response:
+                sample.status = response.status_code
+                last = None
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: ") or not _has_content(line):
+                        continue
+                    now = time.perf_counter()
+                    if sample.ttft is None:
+                        sample.ttft = now - start
+                    else:
+                        sample.gaps.append(now - last)
+                    last = now
+                    sample.chunks += 1
+        if sample.status >= 400:
+            sample.error = f"HTTP {sample.status}"
+    except Exception as e:
+        sample.error = type(e).__name__
+    sample.latency = time.perf_counter() - start
+    return sample
+
+
+async def run_load(
+    url: str,
+    make_payload: Callable[[int], Dict[str, Any]],
+    requests: int,
+    concurrency: int,
+    stream: bool,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 120.0
+) -> Dict[str, Any]:
+    """Send ``requests`` requests with at most ``concurrency`` in flight; returns a summary"""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    samples: List[Sample] = []
+    next_index = 0
+
+    async with httpx.AsyncClient(timeout=timeout, limits=limits, headers=headers) as client:
+        async def worker():
+            nonlocal next_index
+            while next_index < requests:
+                index = next_index
+                next_index += 1
+                samples.append(await _one(client, url, make_payload(index), stream))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - start
+    return summarize(samples, wall)
+
+
+def _percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"p50_ms": None, "p99_ms": None, "mean_ms": None}
+    ordered = sorted(values)
+
+    def at(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+    return {
+        "p50_ms": round(at(0.50) * 1000, 3),
+        "p99_ms": round(at(0.99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+    }
+
+
+def summarize(samples: List[Sample], wall: float) -> Dict[str, Any]:
+    ok = [s for s in samples if s.error is None]
+    errors: Dict[str, int] = {}
+    for s in samples:
+        if s.error is not None:
+            errors[s.error] = errors.get(s.error, 0) + 1
+    chunks = sum(s.chunks for s in ok)
+    return {
+        "requests": len(samples),
+        "ok": len(ok),
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(ok) / wall, 2) if wall else 0.0,
+        "chunks_per_second": round(chunks / wall, 1) if wall else 0.0,
+        "latency": _percentiles([s.latency for s in ok]),
+        "ttft": _percentiles([s.ttft for s in ok if s.ttft is not None]),
+        "chunk_gap": _percentiles([gap for s in ok for gap in s.gaps]),
+    }
@@ -0,0 +1,440 @@
+"""
+Microbenchmarks
+Per-function timings of the request hot path on realistic inputs, saved as JSON baselines
+
+    python -m benchmarks.micro run --output baseline.json
+    python -m benchmarks.micro run --filter format_prompt --output current.json
+    python -m benchmarks.micro compare baseline.json current.json --threshold 0.10
+"""
+
+import argparse
+import base64
+import fnmatch
+import gzip
+import importlib
+import importlib.util
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+# Benchmarks whose module cannot be imported here are reported as skipped, never stubbed
+SKIP_ERRORS = (ImportError, AttributeError)
+
+SENTENCES = [
+    "Dr. Smith reviewed the Q3 report from Acme Inc. before the 9 a.m. meeting.",
+    "The function returns a list of tokens, e.g. words and punctuation, in order.",
+    "Can you explain why the cache hit ratio dropped to 0.42 after the deploy?",
+    "Use `asyncio.gather` to run the requests concurrently and collect the results.",
+    "The U.S. team shipped v2.3.1 on Jan. 5, three days ahead of schedule!",
+    "Here is the updated configuration; note that the timeout is now 30 s.",
+    "Prof. Lee's paper (see https://example.org/papers/42) covers this in detail.",
+    "Streaming responses should flush the first token as soon as it arrives.",
+    "I tried the suggestion above, but the test still fails with a KeyError.",
+    "Mr. Jones asked whether the API supports images... it does, via content parts.",
+]
+
+CODE_BLOCK = (
+    "```python\n"
+    "def retry(fn, attempts=3, delay=0.5):\n"
+    "    for attempt in range(attempts):\n"
+    "        try:\n"
+    "            return fn()\n"
+    "        except ConnectionError:\n"
+    "            time.sleep(delay * 2 ** attempt)\n"
+    "    raise RuntimeError('out of retries')\n"
+    "```\n"
+)
+
+MODEL_FAMILIES = [
+    "meta-llama/Meta-Llama-3.1-8B-Instruct", "meta-llama/Llama-3.3-70B-Instruct",
+    "Qwen/Qwen2.5-72B-Instruct", "Qwen/Qwen2.5-Coder-32B-Instruct", "deepseek-ai/DeepSeek-V3",
+    "deepseek-ai/DeepSeek-R1", "mistralai/Mistral-Small-24B-Instruct-2501", "google/gemma-2-27b-it",
+    "gpt-4o", "gpt-4o-mini", "o3-mini", "claude-3-5-sonnet", "gemini-2.0-flash", "llama-3.3-70b-versatile",
+    "@cf/meta/llama-3.1-8b-instruct", "microsoft/phi-4", "nvidia/Llama-3.1-Nemotron-70B-Instruct",
+]
+
+
+# --- Realistic inputs ---
+
+def paragraph(rng: random.Random, sentences: int) -> str:
+    return " ".join(rng.choice(SENTENCES) for _ in range(sentences))
+
+
+def long_history(turns: int = 200, seed: int = 1) -> List[Dict[str, Any]]:
+    """A system prompt followed by ``turns`` user/assistant exchanges of a few paragraphs each"""
+    rng = random.Random(seed)
+    messages = [{"role": "system", "content": paragraph(rng, 8)}]
+    for turn in range(turns):
+        messages.append({"role": "user", "content": paragraph(rng, rng.randint(1, 6))})
+        reply = "\n\n".join(paragraph(rng, rng.randint(3, 8)) for _ in range(rng.randint(1, 3)))
+        if turn % 5 == 0:
+            reply += "\n\n" + CODE_BLOCK
+        messages.append({"role": "assistant", "content": reply})
+    messages.append({"role": "user", "content": paragraph(rng, 3)})
+    return messages
+
+
+def multimodal_history(turns: int = 40, image_bytes: int = 48 * 1024, seed: int = 2) -> List[Dict[str, Any]]:
+    """Chat history whose user turns carry text parts and inline base64 images"""
+    rng = random.Random(seed)
+    image = "data:image/png;base64," + base64.b64encode(rng.randbytes(image_bytes)).decode("ascii")
+    messages: List[Dict[str, Any]] = [{"role": "system", "content": paragraph(rng, 4)}]
+    for _ in range(turns):
+        parts = [{"type": "text", "text": paragraph(rng, rng.randint(1, 4))}]
+        for _ in range(rng.randint(0, 2)):
+            parts.append({"type": "image_url", "image_url": {"url": image, "detail": "auto"}})
+        parts.append({"type": "text", "text": paragraph(rng, 1)})
+        messages.append({"role": "user", "content": parts})
+        messages.append({"role": "assistant", "content": paragraph(rng, rng.randint(2, 6))})
+    return messages
+
+
+def streamed_output(size: int = 64 * 1024, seed: int = 3) -> str:
+    """A long markdown answer with code blocks and the odd stray control character"""
+    rng = random.Random(seed)
+    pieces: List[str] = []
+    length = 0
+    while length < size:
+        piece = paragraph(rng, rng.randint(2, 6)) + "\n\n"
+        if rng.random() < 0.15:
+            piece += CODE_BLOCK + "\n"
+        if rng.random() < 0.05:
+            piece = piece.replace(" ", "\x00 ", 1).replace(".", ".\x1b", 1)
+        pieces.append(piece)
+        length += len(piece)
+    return "".join(pieces)[:size]
+
+
+def stream_deltas(text: str, seed: int = 4) -> List[str]:
+    """``text`` split the way upstreams stream it: a few characters to a few words per delta"""
+    rng = random.Random(seed)
+    deltas = []
+    position = 0
+    while position < len(text):
+        step = rng.randint(1, 24)
+        deltas.append(text[position:position + step])
+        position += step
+    return deltas
+
+
+def compressed_chunks(data: bytes, encoding: str, chunk_size: int = 1024) -> List[bytes]:
+    """``data`` compressed with ``encoding`` and cut into network-sized reads"""
+    if encoding == "gzip":
+        compressed = gzip.compress(data)
+    elif encoding == "deflate":
+        compressed = zlib.compress(data)
+    elif encoding == "br":
+        compressed = importlib.import_module("brotli").compress(data)
+    elif encoding == "zstd":
+        compressed = importlib.import_module("zstandard").ZstdCompressor().compress(data)
+    else:
+        compressed = data
+    return [compressed[i:i + chunk_size] for i in range(0, len(compressed), chunk_size)]
+
+
+def model_catalog(providers: int = 60, seed: int = 5) -> Dict[str, List[str]]:
+    """Provider -> AVAILABLE_MODELS in the shapes real providers publish them"""
+    rng = random.Random(seed)
+    catalog = {}
+    for index in range(providers):
+        models = rng.sample(MODEL_FAMILIES, rng.randint(3, 12))
+        if index % 4 == 0:
+            models = [m.split("/", 1)[-1].lower() for m in models]
+        models += [f"provider{index}-model-{n}" for n in range(rng.randint(5, 40))]
+        catalog[f"Provider{index}"] = models
+    return catalog
+
+
+# --- Registry ---
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    description: str = ""
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, description: str = ""):
+    """Register ``setup``; it builds the inputs and returns the zero-argument callable to time"""
+    def register(setup: Callable[[], Callable[[], Any]]):
+        BENCHMARKS[name] = Benchmark(name, setup, description)
+        return setup
+    return register
+
+
+def load_module_file(relative_path: str, name: str):
+    """Import one self-contained module without running its package ``__init__``"""
+    spec = importlib.util.spec_from_file_location(name, backend_dir / relative_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def openai_api():
+    api = importlib.import_module("providers.OPENAI.api")
+    if not api.AppConfig.provider_map:
+        api.initialize_provider_map()
+    return api
+
+
+# --- Targets ---
+
+@benchmark("clean_text.full_output", "OPENAI/api.py clean_text on a 64 KB answer")
+def _clean_text_full():
+    clean_text = openai_api().clean_text
+    text = streamed_output()
+    return lambda: clean_text(text)
+
+
+@benchmark("clean_text.stream_deltas", "OPENAI/api.py clean_text called once per streamed delta")
+def _clean_text_deltas():
+    clean_text = openai_api().clean_text
+    deltas = stream_deltas(streamed_output())
+
+    def run():
+        for delta in deltas:
+            clean_text(delta)
+    return run
+
+
+@benchmark("format_prompt.long_history", "OPENAI/utils.py format_prompt over 200 turns")
+def _format_prompt_long():
+    format_prompt = importlib.import_module("providers.OPENAI.utils").format_prompt
+    messages = long_history()
+    return lambda: format_prompt(messages, add_special_tokens=True)
+
+
+@benchmark("format_prompt.multimodal", "OPENAI/utils.py format_prompt over text and image parts")
+def _format_prompt_multimodal():
+    format_prompt = importlib.import_module("providers.OPENAI.utils").format_prompt
+    messages = multimodal_history()
+    return lambda: format_prompt(messages, add_special_tokens=True)
+
+
+@benchmark("count_tokens.long_history", "OPENAI/utils.py count_tokens over 200 turns of content")
+def _count_tokens_long():
+    count_tokens = importlib.import_module("providers.OPENAI.utils").count_tokens
+    contents = [m["content"] for m in long_history()]
+    return lambda: count_tokens(contents)
+
+
+@benchmark("count_tokens.full_output", "OPENAI/utils.py count_tokens on a 64 KB answer")
+def _count_tokens_output():
+    count_tokens = importlib.import_module("providers.OPENAI.utils").count_tokens
+    text = streamed_output()
+    return lambda: count_tokens(text)
+
+
+@benchmark("get_last_user_message.multimodal", "OPENAI/utils.py get_last_user_message with content parts")
+def _last_user_message():
+    get_last_user_message = importlib.import_module("providers.OPENAI.utils").get_last_user_message
+    messages = multimodal_history()
+    # Trailing assistant turns make the reverse scan do real work
+    messages += [{"role": "assistant", "content": "..."}] * 20
+    return lambda: get_last_user_message(messages)
+
+
+@benchmark("sentence_tokenizer.full_output", "TTS/utils.py SentenceTokenizer.tokenize on a 64 KB answer")
+def _sentence_tokenizer():
+    # TTS/__init__ imports every TTS provider; utils.py itself only needs the stdlib
+    tokenizer = load_module_file("providers/TTS/utils.py", "benchmarks._tts_utils").SentenceTokenizer()
+    text = streamed_output().replace("\x00", "").replace("\x1b", "")
+    return lambda: tokenizer.tokenize(text)
+
+
+@benchmark("sentence_tokenizer.paragraph", "TTS/utils.py SentenceTokenizer.tokenize on one TTS request")
+def _sentence_tokenizer_short():
+    tokenizer = load_module_file("providers/TTS/utils.py", "benchmarks._tts_utils").SentenceTokenizer()
+    text = paragraph(random.Random(6), 6)
+    return lambda: tokenizer.tokenize(text)
+
+
+def _resolve(model_identifier: str):
+    resolve = openai_api().resolve_provider_and_model
+    return lambda: resolve(model_identifier)
+
+
+@benchmark("resolve_provider_and_model.pinned", "OPENAI/api.py resolution of Provider/model")
+def _resolve_pinned():
+    return _resolve("DeepInfra/meta-llama/Meta-Llama-3.1-8B-Instruct")
+
+
+@benchmark("resolve_provider_and_model.routed", "OPENAI/api.py resolution of a bare model id")
+def _resolve_routed():
+    return _resolve("gpt-4o-mini")
+
+
+@benchmark("resolve_provider_and_model.alias", "OPENAI/api.py resolution through the alias table")
+def _resolve_alias():
+    return _resolve("llama-3.3-70b-instruct")
+
+
+@benchmark("model_router.resolve", "gateway ModelRouter over 60 providers: exact, alias, prefix and miss")
+def _model_router():
+    from gateway.routing import ModelRouter
+
+    router = ModelRouter.from_mapping(model_catalog(), prefix_matching=True)
+    queries = ["gpt-4o", "meta-llama/llama-3.3-70b-instruct", "llama-3.3-70b", "provider7-model-3", "no-such-model"]
+
+    def run():
+        for query in queries:
+            router.resolve(query)
+    return run
+
+
+@benchmark("sse_encoder.stream_deltas", "gateway ChunkEncoder over every chunk of a 64 KB streamed answer")
+def _sse_encoder():
+    from gateway.sse import ChunkEncoder
+
+    chunks = [
+        {"id": "chatcmpl-bench", "object": "chat.completion.chunk", "created": 1700000000, "model": "bench",
+         "choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}]}
+        for delta in stream_deltas(streamed_output())
+    ]
+
+    def run():
+        encoder = ChunkEncoder("chatcmpl-bench")
+        for chunk in chunks:
+            encoder.encode(chunk)
+    return run
+
+
+def _decompress(encoding: str):
+    decompressor_class = importlib.import_module("providers.OPENAI.BLACKBOXAI").StreamingDecompressor
+    chunks = compressed_chunks(streamed_output(256 * 1024).encode("utf-8"), encoding)
+
+    def run():
+        decompressor = decompressor_class(encoding)
+        for chunk in chunks:
+            decompressor.decompress_chunk(chunk)
+        decompressor.finalize()
+    return run
+
+
+for _encoding in ("gzip", "deflate", "br", "zstd"):
+    benchmark(
+        f"streaming_decompressor.{_encoding}",
+        f"BLACKBOXAI.py StreamingDecompressor over a 256 KB {_encoding} stream in 1 KB reads",
+    )(lambda encoding=_encoding: _decompress(encoding))
+
+
+# --- Running and comparing ---
+
+def measure(fn: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, Any]:
+    """Per-call timings in microseconds: calls per round sized to ``min_time``, best and median round"""
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    rounds = [t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "min_us": round(min(rounds), 3),
+        "median_us": round(statistics.median(rounds), 3),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run(patterns: Optional[List[str]], repeat: int, min_time: float) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for name, bench in BENCHMARKS.items():
+        if patterns and not any(fnmatch.fnmatch(name, p) or p in name for p in patterns):
+            continue
+        try:
+            fn = bench.setup()
+        except SKIP_ERRORS as e:
+            results[name] = {"skipped": f"{type(e).__name__}: {e}"}
+            print(f"{name:<40} skipped ({type(e).__name__}: {e})")
+            continue
+        results[name] = {"description": bench.description, **measure(fn, repeat, min_time)}
+        print(f"{name:<40} {results[name]['median_us']:>14.3f} us  (min {results[name]['min_us']:.3f})")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "created": int(time.time()),
+            "repeat": repeat,
+            "min_time": min_time,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """Print median changes and return the benchmarks slower than ``threshold`` (0.10 = 10%)"""
+    regressions = []
+    before, after = baseline["results"], current["results"]
+    for name in sorted(set(before) | set(after)):
+        old, new = before.get(name), after.get(name)
+        if not old or not new or "skipped" in old or "skipped" in new:
+            state = "missing" if not old or not new else "skipped"
+            print(f"{name:<40} {state}")
+            continue
+        change = new["median_us"] / old["median_us"] - 1 if old["median_us"] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  improved"
+        print(f"{name:<40} {old['median_us']:>12.3f} -> {new['median_us']:>12.3f} us  {change:+7.1%}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="time the benchmarks")
+    run_parser.add_argument("--filter", action="append", help="glob or substring of benchmark names (repeatable)")
+    run_parser.add_argument("--repeat", type=int, default=7, help="timing rounds per benchmark")
+    run_parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per round")
+    run_parser.add_argument("--output", help="write the results as JSON to this file")
+
+    compare_parser = commands.add_parser("compare", help="flag regressions between two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="allowed median slowdown (0.10 = 10%%)")
+
+    commands.add_parser("list", help="list the benchmarks")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for name, bench in BENCHMARKS.items():
+            print(f"{name:<40} {bench.description}")
+    elif args.command == "run":
+        results = run(args.filter, args.repeat, args.min_time)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+    else:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.current, encoding="utf-8") as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Mock Upstream
+Local stand-in for provider APIs: OpenAI-style SSE, Perplexity-style events and plain JSON
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from gateway.sse import SSE_HEADERS
+
+
+@dataclass
+class UpstreamProfile:
+    """How the mock model "generates": delay before the first chunk, then fixed-size chunks"""
+    ttft: float = 0.05
+    chunks: int = 50
+    chunk_delay: float = 0.005
+    chunk_text: str = "lorem "
+
+    @property
+    def text(self) -> str:
+        return self.chunk_text * self.chunks
+
+
+def _completion(model: str, content: str) -> Dict[str, Any]:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4()}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+def create_app(profile: UpstreamProfile) -> FastAPI:
+    app = FastAPI(title="Mock upstream", docs_url=None, redoc_url=None, openapi_url=None)
+
+    async def generate() -> AsyncIterator[str]:
+        await asyncio.sleep(profile.ttft)
+        for i in range(profile.chunks):
+            if i:
+                await asyncio.sleep(profile.chunk_delay)
+            yield profile.chunk_text
+
+    async def generation_time() -> None:
+        await asyncio.sleep(profile.ttft + profile.chunk_delay * max(0, profile.chunks - 1))
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.post("/v1/chat/completions")
+    async def openai_chat(request: Request):
+        """OpenAI wire format: ``data: {chunk}`` events ending in ``data: [DONE]``, or one JSON body"""
+        body = await request.json()
+        model = body.get("model", "bench")
+        if not body.get("stream"):
+            await generation_time()
+            return _completion(model, profile.text)
+
+        request_id = f"chatcmpl-{uuid.uuid4()}"
+        created = int(time.time())
+
+        def event(delta: Dict[str, Any], finish_reason=None) -> str:
+            chunk = {
+                "id": request_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            return f"data: {json.dumps(chunk)}\n\n"
+
+        async def events():
+            yield event({"role": "assistant"})
+            async for piece in generate():
+                yield event({"content": piece})
+            yield event({}, finish_reason="stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+    @app.post("/perplexity/ask")
+    async def perplexity_ask(request: Request):
+        """Perplexity wire format: ``\\r\\n\\r\\n``-delimited events carrying the cumulative answer"""
+        await request.body()
+
+        async def events():
+            answer = ""
+            async for piece in generate():
+                answer += piece
+                steps = json.dumps([{"type": "answer", "value": answer}])
+                yield f"event: message\r\ndata: {json.dumps({'text': steps})}\r\n\r\n"
+            yield "event: end_of_stream\r\ndata: {}\r\n\r\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+    @app.post("/json/generate")
+    async def json_generate(request: Request):
+        """Plain JSON API: the whole answer in one response"""
+        await request.body()
+        await generation_time()
+        return {"text": profile.text}
+
+    return app
@@ -0,0 +1,163 @@
+"""
+Benchmark Providers
+Provider classes that talk to the mock upstream, for both gateways, plus repointing of real ones
+"""
+
+import json
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+WIRES = ("openai", "perplexity", "json")
+
+# Real OpenAI-compatible providers (OPENAI/api.py) and the attribute holding their endpoint
+REPOINTABLE = {
+    "DeepInfra": "base_url",
+    "Groq": "base_url",
+    "TextPollinations": "api_endpoint",
+}
+
+_client: Optional[httpx.Client] = None
+
+
+def _http() -> httpx.Client:
+    # One pooled client shared by every worker thread, like a provider's requests.Session
+    global _client
+    if _client is None:
+        limits = httpx.Limits(max_connections=1024, max_keepalive_connections=1024)
+        _client = httpx.Client(timeout=120, limits=limits)
+    return _client
+
+
+def _openai_stream(url: str, payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    with _http().stream("POST", url, json=payload) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line.startswith("data: "):
+                continue
+            data = line[len("data: "):]
+            if data == "[DONE]":
+                return
+            yield json.loads(data)
+
+
+def _perplexity_stream(url: str, payload: Dict[str, Any]) -> Iterator[str]:
+    """Yield the new part of the cumulative answer carried by each event"""
+    sent = 0
+    buffer = b""
+    with _http().stream("POST", url, json=payload) as response:
+        response.raise_for_status()
+        for raw in response.iter_bytes():
+            buffer += raw
+            *events, buffer = buffer.split(b"\r\n\r\n")
+            for event in events:
+                content = event.decode("utf-8")
+                if content.startswith("event: end_of_stream\r\n"):
+                    return
+                if not content.startswith("event: message\r\n"):
+                    continue
+                message = json.loads(content[len("event: message\r\ndata: "):])
+                for step in json.loads(message["text"]):
+                    if step.get("type") == "answer":
+                        answer = step["value"]
+                        yield answer[sent:]
+                        sent = len(answer)
+
+
+def _json_answer(url: str, payload: Dict[str, Any]) -> str:
+    response = _http().post(url, json=payload)
+    response.raise_for_status()
+    return response.json()["text"]
+
+
+def _openai_text(url: str, payload: Dict[str, Any]) -> str:
+    response = _http().post(url, json=payload)
+    response.raise_for_status()
+    return response.json()["choices"][0]["message"]["content"]
+
+
+class MockChatProvider:
+    """
+    ``main.py``-style provider (``chat(messages, stream)`` returning text) backed by the
+    mock upstream. Subclasses created by ``mock_chat_provider`` fix the wire format.
+    """
+
+    upstream_url = "http://127.0.0.1:9100"
+    wire = "openai"
+
+    def __init__(self, **kwargs):
+        self.model = kwargs.get("model", "bench")
+
+    def chat(self, messages: List[Dict[str, Any]], stream: bool = False, **kwargs) -> Any:
+        payload = {"model": self.model, "messages": messages, "stream": stream}
+        if self.wire == "perplexity":
+            chunks = _perplexity_stream(f"{self.upstream_url}/perplexity/ask", payload)
+            return chunks if stream else "".join(chunks)
+        if self.wire == "json":
+            return _json_answer(f"{self.upstream_url}/json/generate", payload)
+        url = f"{self.upstream_url}/v1/chat/completions"
+        if not stream:
+            return _openai_text(url, payload)
+        return (
+            chunk["choices"][0]["delta"].get("content") or ""
+            for chunk in _openai_stream(url, payload)
+        )
+
+
+class _Completions:
+    def __init__(self, client: "MockOpenAICompatible"):
+        self._client = client
+
+    def create(self, *, model: str, messages: List[Dict[str, Any]], stream: bool = False, **kwargs) -> Any:
+        client = self._client
+        payload = {"model": model, "messages": messages, "stream": stream}
+        if client.wire == "openai":
+            url = f"{client.upstream_url}/v1/chat/completions"
+            if stream:
+                return _openai_stream(url, payload)
+            response = _http().post(url, json=payload)
+            response.raise_for_status()
+            return response.json()
+        # Other wires are adapted to OpenAI chunks, as real providers do
+        if client.wire == "perplexity":
+            pieces = _perplexity_stream(f"{client.upstream_url}/perplexity/ask", payload)
+        else:
+            pieces = iter([_json_answer(f"{client.upstream_url}/json/generate", payload)])
+        chunks = (
+            {"object": "chat.completion.chunk", "model": model,
+             "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+            for piece in pieces
+        )
+        if stream:
+            return chunks
+        text = "".join(c["choices"][0]["delta"]["content"] for c in chunks)
+        return {
+            "object": "chat.completion", "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+        }
+
+
+class _Chat:
+    def __init__(self, client: "MockOpenAICompatible"):
+        self.completions = _Completions(client)
+
+
+class MockOpenAICompatible:
+    """``OPENAI/api.py``-style provider (``chat.completions.create``) backed by the mock upstream"""
+
+    AVAILABLE_MODELS = ["bench"]
+    upstream_url = "http://127.0.0.1:9100"
+    wire = "openai"
+
+    def __init__(self, **kwargs):
+        self.chat = _Chat(self)
+
+
+def mock_chat_provider(wire: str, upstream_url: str) -> type:
+    name = f"Mock{wire.capitalize()}"
+    return type(name, (MockChatProvider,), {"wire": wire, "upstream_url": upstream_url})
+
+
+def mock_openai_provider(wire: str, upstream_url: str) -> type:
+    name = f"Mock{wire.capitalize()}"
+    return type(name, (MockOpenAICompatible,), {"wire": wire, "upstream_url": upstream_url})
@@ -0,0 +1,146 @@
+"""
+Load Test Runner
+Starts the mock upstream and a gateway as subprocesses, drives load through both and reports
+
+    python -m benchmarks.run --target main --wire openai --stream --concurrency 32 --requests 500
+    python -m benchmarks.run --target api --model DeepInfra/meta-llama/Meta-Llama-3.1-8B-Instruct
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from benchmarks.loadgen import run_load  # noqa: E402
+from benchmarks.mock_upstream import UpstreamProfile  # noqa: E402
+from benchmarks.providers import WIRES  # noqa: E402
+
+CHAT_PATHS = {
+    "upstream": "/v1/chat/completions",
+    "main": "/api/chat/completions",
+    "api": "/v1/chat/completions",
+}
+READY_PATHS = {
+    "upstream": "/health",
+    "main": "/api/health",
+    "api": "/v1/models",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(server: str, port: int, extra: List[str]) -> subprocess.Popen:
+    command = [sys.executable, "-m", "benchmarks.serve", server, "--port", str(port), *extra]
+    return subprocess.Popen(command, cwd=str(backend_dir), env=dict(os.environ))
+
+
+def wait_ready(url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode} before {url} became ready")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout:.0f}s")
+
+
+def default_model(target: str, wire: str) -> str:
+    return f"bench-{wire}" if target == "main" else f"Mock{wire.capitalize()}/bench"
+
+
+def compare(gateway: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """Gateway cost on top of the upstream: latency, TTFT and per-chunk deltas in ms"""
+    def delta(metric: str, stat: str) -> Optional[float]:
+        a, b = gateway[metric][stat], baseline[metric][stat]
+        return round(a - b, 3) if a is not None and b is not None else None
+
+    return {
+        "latency_p50_ms": delta("latency", "p50_ms"),
+        "latency_p99_ms": delta("latency", "p99_ms"),
+        "ttft_p50_ms": delta("ttft", "p50_ms"),
+        "per_chunk_ms": delta("chunk_gap", "mean_ms"),
+    }
+
+
+def print_report(name: str, summary: Dict[str, Any]) -> None:
+    print(f"\n== {name} ==")
+    print(f"requests {summary['requests']}  ok {summary['ok']}  errors {summary['errors'] or 0}")
+    print(f"throughput {summary['throughput_rps']} req/s  {summary['chunks_per_second']} chunks/s")
+    for metric in ("latency", "ttft", "chunk_gap"):
+        stats = summary[metric]
+        print(f"{metric:<10} p50 {stats['p50_ms']} ms  p99 {stats['p99_ms']} ms  mean {stats['mean_ms']} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=["main", "api"], default="main")
+    parser.add_argument("--wire", choices=WIRES, default="openai", help="upstream wire format of the mock provider")
+    parser.add_argument("--model", help="model to request (default: the mock provider for --wire)")
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--no-baseline", action="store_true", help="skip the direct-to-upstream run")
+    parser.add_argument("--ttft", type=float, default=UpstreamProfile.ttft)
+    parser.add_argument("--chunks", type=int, default=UpstreamProfile.chunks)
+    parser.add_argument("--chunk-delay", type=float, default=UpstreamProfile.chunk_delay)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    profile = ["--ttft", str(args.ttft), "--chunks", str(args.chunks), "--chunk-delay", str(args.chunk_delay)]
+    upstream_port, gateway_port = free_port(), free_port()
+    upstream_url = f"http://127.0.0.1:{upstream_port}"
+    gateway_url = f"http://127.0.0.1:{gateway_port}"
+    model = args.model or default_model(args.target, args.wire)
+
+    def payload(index: int) -> Dict[str, Any]:
+        # Distinct prompts so coalescing and caching never merge benchmark requests
+        return {"model": model, "stream": args.stream, "messages": [{"role": "user", "content": f"benchmark {index}"}]}
+
+    processes = []
+    try:
+        processes.append(start_server("upstream", upstream_port, profile))
+        wait_ready(upstream_url + READY_PATHS["upstream"], processes[-1])
+        processes.append(start_server(args.target, gateway_port, ["--upstream", upstream_url]))
+        wait_ready(gateway_url + READY_PATHS[args.target], processes[-1])
+
+        results: Dict[str, Any] = {"config": vars(args)}
+        load = dict(requests=args.requests, concurrency=args.concurrency, stream=args.stream)
+        if not args.no_baseline and args.wire == "openai":
+            results["upstream"] = asyncio.run(run_load(upstream_url + CHAT_PATHS["upstream"], payload, **load))
+            print_report("upstream (direct)", results["upstream"])
+        results["gateway"] = asyncio.run(run_load(gateway_url + CHAT_PATHS[args.target], payload, **load))
+        print_report(f"{args.target} gateway", results["gateway"])
+        if "upstream" in results:
+            results["overhead"] = compare(results["gateway"], results["upstream"])
+            print("\ngateway overhead:", ", ".join(f"{k} {v}" for k, v in results["overhead"].items()))
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            process.wait(timeout=10)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
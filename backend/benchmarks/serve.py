@@ -0,0 +1,95 @@
+"""
+Benchmark Servers
+Runs the mock upstream, or a gateway wired to it, as a standalone process
+
+    python -m benchmarks.serve upstream --port 9100 --ttft 0.05 --chunks 50
+    python -m benchmarks.serve main --port 9200 --upstream http://127.0.0.1:9100
+    python -m benchmarks.serve api --port 9300 --upstream http://127.0.0.1:9100
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import uvicorn
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from benchmarks.mock_upstream import UpstreamProfile, create_app  # noqa: E402
+from benchmarks.providers import REPOINTABLE, WIRES, mock_chat_provider, mock_openai_provider  # noqa: E402
+
+
+def main_app(upstream_url: str):
+    """``main.py`` with ``bench-<wire>`` models routed to mock providers"""
+    # Nothing in the benchmark may reach the network or wait for warm-up
+    os.environ.setdefault("WARMUP_TOP_N", "0")
+    os.environ.setdefault("NO_RATE_LIMIT", "true")
+    import main
+    from gateway.routing import Route
+
+    webscout_api = main.webscout_api
+    mocks = {f"mock{wire}": mock_chat_provider(wire, upstream_url) for wire in WIRES}
+    factory = webscout_api.providers.factory
+    webscout_api.providers.factory = lambda name: mocks.get(name) or factory(name)
+
+    resolve_routes = webscout_api.resolve_routes
+
+    def bench_routes(model: str):
+        if model.startswith("bench-") and f"mock{model[len('bench-'):]}" in mocks:
+            return [Route(f"mock{model[len('bench-'):]}", "bench")]
+        return resolve_routes(model)
+
+    webscout_api.resolve_routes = bench_routes
+    return main.app
+
+
+def api_app(upstream_url: str):
+    """``OPENAI/api.py`` with ``Mock<Wire>/bench`` providers and real providers repointed"""
+    from providers.OPENAI import api as openai_api
+
+    app = openai_api.create_app()
+    for wire in WIRES:
+        cls = mock_openai_provider(wire, upstream_url)
+        openai_api.AppConfig.provider_map[cls.__name__] = cls
+        openai_api.AppConfig.provider_map[f"{cls.__name__}/bench"] = cls
+        openai_api.model_router.add(cls.__name__, cls.AVAILABLE_MODELS)
+    openai_api.refresh_model_listings()
+
+    for name, attribute in REPOINTABLE.items():
+        provider_class = openai_api.AppConfig.provider_map.get(name)
+        if provider_class is None:
+            continue
+        try:
+            instance = openai_api.get_provider_instance(provider_class)
+        except Exception as e:
+            print(f"Not repointing {name}: {e}", file=sys.stderr)
+            continue
+        setattr(instance, attribute, f"{upstream_url}/v1/chat/completions")
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("server", choices=["upstream", "main", "api"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--upstream", default="http://127.0.0.1:9100", help="mock upstream URL (gateways)")
+    parser.add_argument("--ttft", type=float, default=UpstreamProfile.ttft, help="upstream delay before the first chunk")
+    parser.add_argument("--chunks", type=int, default=UpstreamProfile.chunks, help="upstream chunks per response")
+    parser.add_argument("--chunk-delay", type=float, default=UpstreamProfile.chunk_delay, help="upstream delay between chunks")
+    parser.add_argument("--chunk-text", default=UpstreamProfile.chunk_text)
+    args = parser.parse_args()
+
+    if args.server == "upstream":
+        app = create_app(UpstreamProfile(args.ttft, args.chunks, args.chunk_delay, args.chunk_text))
+    elif args.server == "main":
+        app = main_app(args.upstream)
+    else:
+        app = api_app(args.upstream)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
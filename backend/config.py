@@ -23,6 +23,11 @@ class Settings(BaseSettings):
     # Authentication
     NO_AUTH: bool = True  # Default to no auth for easier setup
     NO_RATE_LIMIT: bool = True
+    RATE_LIMIT_PER_MINUTE: int = 60  # per API token
+    RATE_LIMIT_BURST: Optional[int] = None  # defaults to the per-minute limit
+    RATE_LIMIT_IP_PER_MINUTE: int = 120  # per client IP, with or without a token
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False  # key IPs by X-Forwarded-For behind a proxy
+    RATE_LIMIT_SYNC_SECONDS: float = 1.0  # workers merge counts into the shared store this often (0 = every request)
     SECRET_KEY: str = "your-secret-key-change-in-production"
     
     # Database
@@ -32,6 +37,62 @@ class Settings(BaseSettings):
     # Provider settings
     DEFAULT_PROVIDER: str = "ChatGPT"
     
+    # Provider execution (thread pool for blocking provider calls)
+    EXECUTOR_MAX_WORKERS: int = 256
+    PROVIDER_MAX_CONCURRENCY: int = 64
+    GLOBAL_MAX_CONCURRENCY: Optional[int] = None  # defaults to EXECUTOR_MAX_WORKERS
+    PROVIDER_QUEUE_MAX: int = 128  # waiters per queue before shedding with 429/503
+    PROVIDER_QUEUE_TIMEOUT: float = 10.0  # seconds a request may wait for a slot
+    # Native async provider calls run on the event loop, without a worker thread
+    ASYNC_PROVIDER_MAX_CONCURRENCY: int = 1024
+    ASYNC_GLOBAL_MAX_CONCURRENCY: int = 4096
+    
+    # Provider instance pool
+    PROVIDER_POOL_MAX_INSTANCES: int = 64
+    PROVIDER_POOL_MAX_MEMORY_MB: int = 256
+    PROVIDER_POOL_IDLE_TTL: int = 900  # seconds
+    
+    # Model catalog (precomputed /api/models, persisted under DATA_DIR)
+    MODEL_CATALOG_REFRESH_INTERVAL: int = 3600  # seconds
+    
+    # Warm-up of the busiest providers after boot (0 disables)
+    WARMUP_TOP_N: int = 5
+    WARMUP_TIMEOUT: int = 30  # seconds
+    
+    # Exact-match response cache for chat completions (opt-in; disk tier under DATA_DIR)
+    RESPONSE_CACHE_ENABLED: bool = False
+    RESPONSE_CACHE_DETERMINISTIC_ONLY: bool = True  # only temperature=0 or seeded requests
+    RESPONSE_CACHE_TTL: int = 3600  # seconds
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    RESPONSE_CACHE_MAX_MEMORY_MB: int = 64
+    RESPONSE_CACHE_MAX_DISK_MB: int = 512
+    
+    # Circuit breakers: open after N consecutive provider failures, back off exponentially
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_OPEN_SECONDS: int = 30
+    CIRCUIT_MAX_OPEN_SECONDS: int = 600
+    
+    # Spread a model's traffic over all providers serving it (latency/error/load aware)
+    LOAD_BALANCING_ENABLED: bool = True
+    
+    # Let "llama-3.3-70b" route to "llama-3.3-70b-versatile" and similar variants; the
+    # served model is always reported in the X-Resolved-Model response header
+    MODEL_PREFIX_MATCHING: bool = False
+    
+    # Identical concurrent chat requests share one upstream call (temperature 0, or
+    # clients sending "X-Request-Coalesce: on")
+    REQUEST_COALESCING_ENABLED: bool = False
+    
+    # Tiny streamed deltas arriving within this window are sent as one SSE event
+    # (0 disables; clients opt out per request with "X-Stream-Coalesce: off")
+    STREAM_COALESCE_WINDOW_MS: int = 20
+    STREAM_COALESCE_MAX_CHARS: int = 512  # flush early once this much text is waiting
+    
+    # Multi-worker deployments: worker processes and the state they share
+    # (redis://... or sqlite:///path; unset = SQLite under DATA_DIR with >1 worker, memory otherwise)
+    WEB_CONCURRENCY: int = 1
+    SHARED_STATE_URL: Optional[str] = None
+    
     # External API keys (optional)
     OPENAI_API_KEY: Optional[str] = None
     GOOGLE_API_KEY: Optional[str] = None
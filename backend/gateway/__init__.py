@@ -0,0 +1,16 @@
+"""
+Gateway Infrastructure for Neko-Webscout Full-Stack
+Shared request-path machinery used by both API servers
+"""
+
+from .catalog import ModelCatalog
+from .executor import ProviderExecutor
+from .pool import ProviderPool
+from .routing import ModelRouter, Route
+from .shared_state import MemoryStore, RedisStore, SharedStore, SQLiteStore
+from .warmup import TrafficStats, Warmup
+
+__all__ = [
+    "MemoryStore", "ModelCatalog", "ModelRouter", "ProviderExecutor", "ProviderPool",
+    "RedisStore", "Route", "SharedStore", "SQLiteStore", "TrafficStats", "Warmup",
+]
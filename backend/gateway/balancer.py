@@ -0,0 +1,52 @@
+"""
+Provider Load Balancing
+Spreads a canonical model's traffic over every provider serving it (power of two choices)
+"""
+
+import random
+from typing import List, Optional
+
+from .health import HealthRegistry
+from .routing import Route, normalize_model
+
+# Latency assumed for providers without samples yet: optimistic, so they get explored
+_UNKNOWN_LATENCY = 0.5
+
+
+class LoadBalancer:
+    """
+    Orders candidate routes so the first one is a good pick under current load.
+
+    Only routes serving the same model as the best-ranked one take part: their model
+    ids must have the same canonical id (``normalize_model``), so a prefix match on a
+    different variant is never balanced in. Two healthy candidates are sampled at
+    random and the cheaper one wins, where cost = latency EWMA x (1 + in-flight) /
+    success rate. The remaining routes follow as fallbacks, same-model routes first,
+    cheapest first.
+    """
+
+    def __init__(self, health: HealthRegistry, rng: Optional[random.Random] = None):
+        self.health = health
+        self._rng = rng or random.Random()
+
+    def cost(self, provider: str) -> float:
+        latency, error_rate, in_flight = self.health.load(provider)
+        if latency is None:
+            latency = _UNKNOWN_LATENCY
+        return latency * (1 + in_flight) / max(0.05, 1.0 - error_rate)
+
+    def order(self, routes: List[Route]) -> List[Route]:
+        if len(routes) < 2:
+            return routes
+        model = normalize_model(routes[0].model)
+        same = {r.provider for r in routes if normalize_model(r.model) == model}
+        candidates = [r for r in routes if r.provider in same and self.health.available(r.provider)]
+        if len(candidates) < 2:
+            return routes
+
+        first, second = self._rng.sample(candidates, 2)
+        winner = first if self.cost(first.provider) <= self.cost(second.provider) else second
+        rest = sorted(
+            (r for r in routes if r is not winner), key=lambda r: (r.provider not in same, self.cost(r.provider))
+        )
+        return [winner] + rest
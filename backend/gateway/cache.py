@@ -0,0 +1,313 @@
+"""
+Response Cache
+Exact-match cache of deterministic chat completions, in memory with a disk or shared-store tier
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from .pool import SAMPLING_PARAMS
+from .shared_state import SharedStore
+from .sse import delta_text
+
+logger = logging.getLogger(__name__)
+
+# Sampling parameters that do not change the generated text
+_KEY_EXCLUDED_PARAMS = frozenset({"stream", "user"})
+
+# Shared-store keys for cache entries are this prefix plus the request hash
+_STORE_PREFIX = "cache:"
+
+# Replayed streams are cut into pieces of roughly this many characters
+_REPLAY_CHUNK_CHARS = 64
+
+
+def normalize_messages(messages: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Messages reduced to the fields that affect the completion, in canonical form"""
+    normalized = []
+    for message in messages or ():
+        if hasattr(message, "dict") and not isinstance(message, dict):
+            message = message.dict(exclude_none=True)
+        if not isinstance(message, dict):
+            normalized.append({"role": "user", "content": str(message)})
+            continue
+        content = message.get("content")
+        if isinstance(content, str):
+            content = unicodedata.normalize("NFC", content).strip()
+        entry = {"role": message.get("role", "user"), "content": content}
+        if message.get("name"):
+            entry["name"] = message["name"]
+        normalized.append(entry)
+    return normalized
+
+
+def cache_key(provider: str, model: str, messages: Iterable[Any], params: Dict[str, Any]) -> str:
+    """Canonical hash of (resolved provider, model, normalized messages, sampling params)"""
+    sampling = {
+        k: v for k, v in params.items()
+        if k in SAMPLING_PARAMS and k not in _KEY_EXCLUDED_PARAMS and v is not None
+    }
+    canonical = json.dumps(
+        [provider.lower(), model, normalize_messages(messages), sampling],
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def is_deterministic(params: Dict[str, Any]) -> bool:
+    """Whether repeating the request should produce the same answer"""
+    return params.get("temperature") == 0 or params.get("seed") is not None
+
+
+def cache_policy(cache_control: Optional[str]) -> Tuple[bool, bool]:
+    """(lookup, store) for a request's ``Cache-Control`` header"""
+    directives = {part.strip().lower() for part in (cache_control or "").split(",")}
+    if "no-store" in directives:
+        return False, False
+    if "no-cache" in directives:
+        return False, True
+    return True, True
+
+
+def completion_text(value: Any) -> str:
+    """Assistant text of a completion (OpenAI dict, raw provider dict or plain text)"""
+    if isinstance(value, dict) and value.get("choices"):
+        message = value["choices"][0].get("message") or {}
+        return message.get("content") or ""
+    return delta_text(value) or ""
+
+
+def replay_pieces(text: str, size: int = _REPLAY_CHUNK_CHARS) -> List[str]:
+    """Split cached text into stream-sized pieces on whitespace boundaries"""
+    pieces, start = [], 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            space = text.rfind(" ", start, end)
+            if space > start:
+                end = space + 1
+        pieces.append(text[start:end])
+        start = end
+    return pieces
+
+
+async def replay_stream(text: str) -> AsyncIterator[str]:
+    """Cached text as an async chunk stream, for ``stream=True`` hits"""
+    for piece in replay_pieces(text):
+        yield piece
+
+
+class ResponseCache:
+    """
+    Two-tier exact-match cache.
+
+    Entries are JSON dicts (``{"value": ..., "text": ...}``): ``value`` is returned to
+    non-streaming callers and ``text`` is replayed to streaming ones. Each worker keeps
+    recent entries in memory. Behind that, a shared ``store`` (SQLite or Redis) holds
+    the entries every worker sees; without one, the disk tier lives in one file per
+    entry, so every worker on the host shares it.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        ttl: float = 3600.0,
+        max_entries: int = 1024,
+        max_memory_mb: int = 64,
+        max_disk_mb: int = 512,
+        deterministic_only: bool = True,
+        store: Optional[SharedStore] = None
+    ):
+        self.directory = directory
+        self.store = store if store is not None and store.shared else None
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_memory_bytes = max_memory_mb * 1024 * 1024
+        self.max_disk_bytes = max_disk_mb * 1024 * 1024
+        self.deterministic_only = deterministic_only
+        self._memory: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def cacheable(self, params: Dict[str, Any]) -> bool:
+        return not self.deterministic_only or is_deterministic(params)
+
+    # Memory tier
+
+    def _memory_get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._memory.get(key)
+            if item is None:
+                return None
+            expires, size, entry = item
+            if expires <= time.time():
+                del self._memory[key]
+                self._memory_bytes -= size
+                return None
+            self._memory.move_to_end(key)
+            return entry
+
+    def _memory_put(self, key: str, entry: Dict[str, Any], size: int, expires: float) -> None:
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= old[1]
+            self._memory[key] = (expires, size, entry)
+            self._memory_bytes += size
+            while self._memory and (
+                len(self._memory) > self.max_entries or self._memory_bytes > self.max_memory_bytes
+            ):
+                _, (_, evicted_size, _) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted_size
+
+    # Disk tier (blocking; called from worker threads)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _disk_get(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if record.get("expires", 0) <= time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return record["expires"], record["entry"]
+
+    def _disk_put(self, key: str, body: bytes) -> None:
+        if not self.directory:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write response cache entry {key}: {e}")
+            return
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+            else:
+                self._disk_bytes += len(body)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._trim_disk()
+
+    def _disk_files(self) -> List[Tuple[float, int, str]]:
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _trim_disk(self) -> None:
+        """Delete the oldest entries until the disk tier is back under 90% of its cap"""
+        files = sorted(self._disk_files())
+        total = sum(size for _, size, _ in files)
+        target = self.max_disk_bytes * 0.9
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+    # Shared-store tier (blocking; called from worker threads)
+
+    def _store_get(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        try:
+            record = self.store.get(_STORE_PREFIX + key)
+        except Exception as e:
+            logger.warning(f"Failed to read response cache entry {key}: {e}")
+            return None
+        if not record or record.get("expires", 0) <= time.time():
+            return None
+        return record["expires"], record["entry"]
+
+    def _store_put(self, key: str, entry: Dict[str, Any], expires: float) -> None:
+        try:
+            self.store.set(_STORE_PREFIX + key, {"expires": expires, "entry": entry}, ttl=self.ttl)
+        except Exception as e:
+            logger.warning(f"Failed to write response cache entry {key}: {e}")
+
+    # Public API
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._memory_get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        second_tier = self._store_get if self.store is not None else self._disk_get
+        record = await asyncio.get_running_loop().run_in_executor(None, second_tier, key)
+        if record is None:
+            self.misses += 1
+            return None
+        expires, entry = record
+        self._memory_put(key, entry, len(json.dumps(entry, ensure_ascii=False)), expires)
+        self.hits += 1
+        self.disk_hits += 1
+        return entry
+
+    async def put(self, key: str, value: Any, text: Optional[str] = None) -> None:
+        entry = {"value": value, "text": text if text is not None else ""}
+        expires = time.time() + self.ttl
+        try:
+            body = json.dumps({"expires": expires, "entry": entry}, ensure_ascii=False).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Response for {key} is not cacheable: {e}")
+            return
+        self._memory_put(key, entry, len(body), expires)
+        self.stores += 1
+        loop = asyncio.get_running_loop()
+        if self.store is not None:
+            await loop.run_in_executor(None, self._store_put, key, entry, expires)
+        else:
+            await loop.run_in_executor(None, self._disk_put, key, body)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        with self._lock:
+            return {
+                "entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+                "shared": self.store is not None,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
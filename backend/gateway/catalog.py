@@ -0,0 +1,265 @@
+"""
+Model Catalog
+Precomputed, versioned index of every provider's models, served from memory
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from fastapi.responses import Response
+
+from .shared_state import SharedStore
+
+logger = logging.getLogger(__name__)
+
+# Shared-state keys: the published catalog, and the lease of the worker building the next one
+_PAYLOAD_KEY = "catalog:payload"
+_BUILDER_KEY = "catalog:builder"
+
+
+def class_level_models(provider_class: Any) -> Optional[List[str]]:
+    """
+    A provider's models if the class itself declares them, else ``None``.
+
+    ``AVAILABLE_MODELS`` is looked up in the class dicts so a ``property`` (whose value
+    needs an instance) is detected rather than evaluated.
+    """
+    if not isinstance(provider_class, type):
+        return None
+    available = provider_class.__dict__.get("AVAILABLE_MODELS")
+    if available is None:
+        for base in provider_class.__mro__[1:]:
+            if "AVAILABLE_MODELS" in base.__dict__:
+                available = base.__dict__["AVAILABLE_MODELS"]
+                break
+    if isinstance(available, (dict, list, tuple, set, frozenset)):
+        return [str(model) for model in available]
+    return None
+
+
+def collect_models(provider_class: Any) -> List[str]:
+    """
+    List a provider's models, avoiding construction where possible.
+
+    Class-level ``AVAILABLE_MODELS`` is read directly. Only already-loaded providers that
+    compute their models at runtime are instantiated, and only while the catalog is being
+    built in the background, never on the request path.
+    """
+    if not isinstance(provider_class, type):
+        raise TypeError(f"{getattr(provider_class, '__name__', provider_class)!r} is not a provider class")
+
+    models = class_level_models(provider_class)
+    if models is not None:
+        return models
+    return list(provider_class().get_models())
+
+
+class ModelCatalog:
+    """Model index built once, refreshed in the background and persisted to disk"""
+
+    def __init__(
+        self,
+        list_providers: Callable[[], Iterable[str]],
+        loaded_provider: Callable[[str], Any],
+        static_models: Callable[[str], Optional[List[str]]] = lambda name: None,
+        path: Optional[str] = None,
+        refresh_interval: float = 3600.0,
+        store: Optional[SharedStore] = None,
+        sync_interval: float = 15.0
+    ):
+        self.list_providers = list_providers
+        self.loaded_provider = loaded_provider
+        self.static_models = static_models
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.store = store
+        self.sync_interval = sync_interval
+        self.payload: Optional[Dict[str, Any]] = None
+        self.body: bytes = b""
+        self.etag: str = ""
+        self._ready = asyncio.Event()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._update_task: Optional[asyncio.Task] = None
+        self._build_lock = asyncio.Lock()
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    def subscribe(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Call ``listener(payload)`` with the current catalog and every new version"""
+        self._listeners.append(listener)
+        if self.payload is not None:
+            listener(self.payload)
+
+    def build(self) -> Dict[str, Any]:
+        """Collect every provider's models without importing any (blocking; run off the event loop)
+
+        Providers that are already loaded are asked directly. The rest are listed from the
+        models their source declares, or marked ``deferred`` until first use if it declares
+        none.
+        """
+        all_models = {}
+        for provider_name in self.list_providers():
+            try:
+                provider_class = self.loaded_provider(provider_name)
+                if provider_class is not None:
+                    models = collect_models(provider_class)
+                else:
+                    models = self.static_models(provider_name)
+                if models is None:
+                    all_models[provider_name] = {"models": [], "count": 0, "deferred": True}
+                else:
+                    all_models[provider_name] = {"models": models, "count": len(models)}
+            except Exception as e:
+                all_models[provider_name] = {"models": [], "count": 0, "error": str(e)}
+
+        return {
+            "providers": all_models,
+            "total_providers": len(all_models),
+            "total_models": sum(info.get("count", 0) for info in all_models.values()),
+        }
+
+    def _publish(self, payload: Dict[str, Any]) -> None:
+        """Swap in a new catalog snapshot and its pre-encoded body"""
+        content = json.dumps(payload["providers"], sort_keys=True, ensure_ascii=False)
+        version = hashlib.sha1(content.encode("utf-8")).hexdigest()[:16]
+        payload = dict(payload, version=version, generated_at=payload.get("generated_at", int(time.time())))
+        self.payload = payload
+        self.body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.etag = f'"{version}"'
+        for listener in self._listeners:
+            try:
+                listener(payload)
+            except Exception as e:
+                logger.error(f"Model catalog listener failed: {e}")
+        self._ready.set()
+
+    def load(self) -> bool:
+        """Load a persisted catalog, if one exists and still matches the registry"""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable model catalog {self.path}: {e}")
+            return False
+        self._publish(payload)
+        return set(payload.get("providers", {})) == set(self.list_providers())
+
+    def save(self) -> None:
+        """Persist the current catalog atomically"""
+        if not self.path or self.payload is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(self.body)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to persist model catalog to {self.path}: {e}")
+
+    async def refresh(self) -> None:
+        """Rebuild the catalog in a worker thread and publish it"""
+        async with self._build_lock:
+            loop = asyncio.get_running_loop()
+            payload = await loop.run_in_executor(None, self.build)
+            payload["generated_at"] = int(time.time())
+            self._publish(payload)
+            await loop.run_in_executor(None, self.save)
+            if self._is_shared:
+                await loop.run_in_executor(None, self.store.set, _PAYLOAD_KEY, self.payload)
+            logger.info(f"Model catalog {self.etag} built: {payload['total_models']} models")
+
+    def provider_loaded(self, provider_name: str) -> None:
+        """Rebuild soon if a provider the catalog could not list has just been loaded"""
+        entry = (self.payload or {}).get("providers", {}).get(provider_name)
+        if not entry or not entry.get("deferred") or self.loaded_provider(provider_name) is None:
+            return
+        if self._update_task is None or self._update_task.done():
+            self._update_task = asyncio.create_task(self._refresh_safely())
+
+    @property
+    def _is_shared(self) -> bool:
+        return self.store is not None and self.store.shared
+
+    async def _claim_build(self) -> bool:
+        """In multi-worker mode only one worker per refresh interval builds the catalog"""
+        if not self._is_shared:
+            return True
+        lease = self.refresh_interval or 3600.0
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.store.add, _BUILDER_KEY, os.getpid(), lease)
+
+    async def _adopt_shared(self) -> None:
+        """Switch to a catalog another worker published, if it differs from ours"""
+        loop = asyncio.get_running_loop()
+        payload = await loop.run_in_executor(None, self.store.get, _PAYLOAD_KEY)
+        current = self.payload.get("version") if self.payload else None
+        if payload and payload.get("version") != current:
+            self._publish(payload)
+            logger.info(f"Model catalog {self.etag} adopted from shared state")
+
+    async def _refresh_loop(self, build_now: bool) -> None:
+        loop = asyncio.get_running_loop()
+        if self._is_shared:
+            await self._adopt_shared()
+        if build_now and await self._claim_build():
+            await self._refresh_safely()
+        next_build = loop.time() + self.refresh_interval
+
+        if not self._is_shared:
+            while self.refresh_interval:
+                await asyncio.sleep(self.refresh_interval)
+                await self._refresh_safely()
+            return
+
+        while True:
+            # Poll quickly until some worker has published a first catalog
+            await asyncio.sleep(self.sync_interval if self.payload is not None else 1.0)
+            try:
+                await self._adopt_shared()
+                if self.refresh_interval and loop.time() >= next_build:
+                    next_build = loop.time() + self.refresh_interval
+                    if await self._claim_build():
+                        await self._refresh_safely()
+            except Exception as e:
+                logger.error(f"Model catalog sync failed: {e}")
+
+    async def _refresh_safely(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.error(f"Model catalog refresh failed: {e}")
+            if self.payload is None:
+                # Never leave /api/models waiting on a build that will not come
+                self._publish({"providers": {}, "total_providers": 0, "total_models": 0})
+
+    async def start(self) -> None:
+        """Serve the persisted catalog immediately; build or refresh in the background"""
+        up_to_date = self.load()
+        self._refresh_task = asyncio.create_task(self._refresh_loop(build_now=not up_to_date))
+
+    async def stop(self) -> None:
+        for task in (self._refresh_task, self._update_task):
+            if task is not None:
+                task.cancel()
+        self._refresh_task = self._update_task = None
+
+    async def get(self) -> Dict[str, Any]:
+        """Current catalog payload, waiting for the first build if necessary"""
+        await self._ready.wait()
+        return self.payload
+
+    async def response(self, if_none_match: Optional[str] = None) -> Response:
+        """Pre-encoded catalog response with ETag / If-None-Match revalidation"""
+        await self._ready.wait()
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        tags = [tag.strip().lstrip("W/") for tag in (if_none_match or "").split(",")]
+        if "*" in tags or self.etag in tags:
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
@@ -0,0 +1,101 @@
+"""
+Stream Delta Coalescing
+Merges tiny streamed deltas into fewer SSE events within a short time window or size budget
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Callable, List, Mapping, Optional
+
+# Clients that need one event per upstream delta send ``X-Stream-Coalesce: off``
+OPT_OUT_HEADER = "x-stream-coalesce"
+_OFF = frozenset(("off", "false", "0", "no", "none"))
+
+
+def coalescing_requested(headers: Mapping[str, str]) -> bool:
+    """False when the request opted out of delta coalescing"""
+    value = headers.get(OPT_OUT_HEADER)
+    return value is None or value.strip().lower() not in _OFF
+
+
+def coalesce_deltas(
+    items: AsyncIterator[Any],
+    text: Callable[[Any], Optional[str]],
+    merge: Callable[[List[Any]], Any],
+    window: float,
+    max_chars: int
+) -> AsyncIterator[Any]:
+    """
+    Merge consecutive text deltas of a stream.
+
+    ``text(item)`` returns an item's delta, or ``None`` for items that must pass through
+    untouched (role, tool call and finish chunks); those flush whatever is buffered
+    first. The first non-empty delta is sent immediately so TTFT is unchanged. After
+    that, deltas are buffered until ``window`` seconds have passed since the first
+    buffered one or ``max_chars`` characters are waiting, then ``merge(items)`` is sent
+    as one item. The end of the stream, or an error, flushes the buffer. A ``window`` of
+    0 returns ``items`` unchanged.
+    """
+    if window <= 0:
+        return items
+    return _coalesce(items, text, merge, window, max_chars)
+
+
+async def _coalesce(items, text, merge, window, max_chars):
+    loop = asyncio.get_running_loop()
+    source = items.__aiter__()
+    buffer: List[Any] = []
+    size = 0
+    deadline = 0.0
+    started = False
+    pending: Optional[asyncio.Future] = None
+
+    def flush() -> Any:
+        nonlocal buffer, size
+        merged = buffer[0] if len(buffer) == 1 else merge(buffer)
+        buffer, size = [], 0
+        return merged
+
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(source.__anext__())
+            if buffer:
+                # The next delta keeps being awaited across the flush; only the wait times out
+                done, _ = await asyncio.wait({pending}, timeout=max(0.0, deadline - loop.time()))
+                if not done:
+                    yield flush()
+                    continue
+            try:
+                item = await pending
+            except StopAsyncIteration:
+                break
+            except Exception:
+                if buffer:
+                    yield flush()
+                raise
+            finally:
+                if pending.done():
+                    pending = None
+
+            delta = text(item)
+            if delta is None or not started:
+                if buffer:
+                    yield flush()
+                started = started or bool(delta)
+                yield item
+                continue
+            if not buffer:
+                deadline = loop.time() + window
+            buffer.append(item)
+            size += len(delta)
+            if size >= max_chars:
+                yield flush()
+        if buffer:
+            yield flush()
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+            await asyncio.wait({pending})
+        aclose = getattr(source, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,221 @@
+"""
+Provider Execution Layer
+Runs blocking provider calls on a sized thread pool so they never stall the event loop,
+and native async provider calls on the loop itself under their own admission limits
+"""
+
+import asyncio
+import inspect
+import time
+from collections.abc import AsyncIterator as AsyncIteratorABC, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from .limiter import AdmissionController
+
+
+# Returned by next() when a provider generator is exhausted
+_EXHAUSTED = object()
+
+
+class _LeasedStream:
+    """Async iterator over a provider stream that owns an admission slot until closed"""
+
+    def __init__(self, chunks: AsyncIterator[Any], release: Callable[[], None]):
+        self._chunks = chunks
+        self._release = release
+
+    def __aiter__(self) -> "_LeasedStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return await self._chunks.__anext__()
+        except BaseException:
+            # Exhausted, failed or cancelled: the slot is no longer needed
+            await self.aclose()
+            raise
+
+    async def aclose(self) -> None:
+        try:
+            await self._chunks.aclose()
+        finally:
+            release, self._release = self._release, None
+            if release is not None:
+                release()
+
+
+def native_coroutine(obj: Any, *names: str) -> Optional[Callable[..., Any]]:
+    """The first of ``names`` that is an ``async def`` method of ``obj``, if any"""
+    for name in names:
+        method = getattr(obj, name, None)
+        if method is not None and inspect.iscoroutinefunction(method):
+            return method
+    return None
+
+
+class ProviderExecutor:
+    """
+    Admission control in front of provider calls.
+
+    Synchronous calls run on a thread pool, so their limits default to the number of
+    worker threads. Native async calls (``run_async`` / ``open_async_stream``) run on the
+    event loop and need no thread, so they are admitted by a separate controller whose
+    limits can be far higher: an open stream then costs a socket, not a worker.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 256,
+        per_provider_limit: int = 64,
+        global_limit: Optional[int] = None,
+        max_queue: int = 128,
+        queue_timeout: float = 10.0,
+        async_per_provider_limit: int = 1024,
+        async_global_limit: int = 4096
+    ):
+        self.max_workers = max_workers
+        self.per_provider_limit = per_provider_limit
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="provider")
+        # More in-flight calls than worker threads would only queue inside the pool
+        self.limiter = AdmissionController(
+            per_provider_limit=per_provider_limit,
+            global_limit=global_limit or max_workers,
+            max_queue=max_queue,
+            queue_timeout=queue_timeout
+        )
+        self.async_limiter = AdmissionController(
+            per_provider_limit=async_per_provider_limit,
+            global_limit=async_global_limit,
+            max_queue=max_queue,
+            queue_timeout=queue_timeout
+        )
+
+    async def run(self, provider_name: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking call in the pool and return its result.
+
+        Raises ``Overloaded`` if no slot frees up within the queue deadline.
+        """
+        async with self.limiter.slot(provider_name):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, partial(func, *args, **kwargs))
+
+    async def open_stream(self, provider_name: str, func: Callable[..., Any], *args, **kwargs) -> AsyncIterator[Any]:
+        """
+        Admit a streaming call now, and return its chunks.
+
+        Unlike ``stream``, admission happens before this returns, so callers can still
+        answer ``Overloaded`` with a plain HTTP error instead of a mid-stream one. The
+        slot is held until the returned iterator is exhausted or closed.
+        """
+        start = time.monotonic()
+        await self.limiter.acquire(provider_name)
+        release = lambda: self.limiter.release(provider_name, time.monotonic() - start)
+        return _LeasedStream(self._iterate(func, *args, **kwargs), release)
+
+    async def stream(self, provider_name: str, func: Callable[..., Any], *args, **kwargs) -> AsyncIterator[Any]:
+        """
+        Run a blocking call in the pool and yield its output chunk by chunk.
+
+        If the call returns an iterator (e.g. a provider's streaming generator), each
+        ``next()`` is executed in the pool so a slow upstream only ever blocks a worker
+        thread. Any other return value is yielded once. The provider's concurrency slot
+        is held until the stream is exhausted or closed by the consumer.
+        """
+        chunks = await self.open_stream(provider_name, func, *args, **kwargs)
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await chunks.aclose()
+
+    async def run_async(self, provider_name: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Await a native async provider call on the event loop and return its result.
+
+        Raises ``Overloaded`` if no async slot frees up within the queue deadline.
+        """
+        async with self.async_limiter.slot(provider_name):
+            return await func(*args, **kwargs)
+
+    async def open_async_stream(self, provider_name: str, func: Callable[..., Any], *args, **kwargs) -> AsyncIterator[Any]:
+        """
+        Admit a native async streaming call now, and return its chunks.
+
+        The async counterpart of ``open_stream``: ``func`` is awaited on the event loop
+        when the first chunk is pulled, and its async iterator is relayed without any
+        worker thread. The async slot is held until the stream is exhausted or closed.
+        """
+        start = time.monotonic()
+        await self.async_limiter.acquire(provider_name)
+        release = lambda: self.async_limiter.release(provider_name, time.monotonic() - start)
+        return _LeasedStream(self._aiterate(func, *args, **kwargs), release)
+
+    async def _aiterate(self, func: Callable[..., Any], *args, **kwargs) -> AsyncIterator[Any]:
+        result = func(*args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        if not isinstance(result, AsyncIteratorABC):
+            yield result
+            return
+
+        try:
+            async for chunk in result:
+                yield chunk
+        finally:
+            aclose = getattr(result, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    async def _iterate(self, func: Callable[..., Any], *args, **kwargs) -> AsyncIterator[Any]:
+        result = await asyncio.wrap_future(self._pool.submit(partial(func, *args, **kwargs)))
+        if not isinstance(result, Iterator):
+            yield result
+            return
+
+        pending = None
+        try:
+            while True:
+                pending = self._pool.submit(next, result, _EXHAUSTED)
+                chunk = await asyncio.wrap_future(pending)
+                if chunk is _EXHAUSTED:
+                    break
+                yield chunk
+        finally:
+            self._close_iterator(result, pending)
+
+    def _close_iterator(self, iterator: Iterator, pending) -> None:
+        """Close an abandoned provider generator without racing an in-flight next()"""
+        close = getattr(iterator, "close", None)
+        if close is None:
+            return
+
+        def _close(_=None):
+            try:
+                close()
+            except Exception:
+                pass
+
+        if pending is not None and not pending.done():
+            pending.add_done_callback(_close)
+        else:
+            self._pool.submit(_close)
+
+    def queue_depth(self) -> int:
+        """Requests waiting for a thread-pool or async slot"""
+        return self.limiter.queue_depth() + self.async_limiter.queue_depth()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool sizing, in-flight calls, queue depth and queue wait times"""
+        return {
+            "max_workers": self.max_workers,
+            "per_provider_limit": self.per_provider_limit,
+            **self.limiter.stats(),
+            "async": self.async_limiter.stats(),
+        }
+
+    def shutdown(self) -> None:
+        """Stop accepting work and release idle worker threads"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
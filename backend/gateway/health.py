@@ -0,0 +1,386 @@
+"""
+Provider Health
+Passive health tracking and per-provider circuit breakers, fed by every real call
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Dict, Optional, Tuple
+
+from .limiter import Overloaded
+from .shared_state import SharedStore
+from .sse import delta_text
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# Shared-state key holding {provider: {"open_until", "at"}}: each breaker's latest state
+# change in any worker, with the time it changed
+_BREAKERS_KEY = "health:breakers"
+
+_HTML_MARKERS = ("<!doctype html", "<html", "<head>", "<body", "<title>")
+
+
+class ProviderUnavailable(Exception):
+    """Raised when a provider's circuit breaker rejects a call"""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(f"Provider '{provider}' is temporarily unavailable (circuit open)")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class UpstreamHTMLError(Exception):
+    """The upstream answered with an HTML page (error page, captcha, login wall)"""
+
+
+def looks_like_html(text: Any) -> bool:
+    """Whether a provider response is an HTML page rather than model output
+
+    Models wrap generated markup in code fences, so only a response that *starts* with
+    a document-level tag is treated as an upstream error page.
+    """
+    if not isinstance(text, str):
+        return False
+    head = text.lstrip()[:32].lower()
+    return head.startswith(_HTML_MARKERS)
+
+
+def _field(value: Any, name: str) -> Any:
+    if isinstance(value, dict):
+        return value.get(name)
+    return getattr(value, name, None)
+
+
+def response_text(result: Any) -> Optional[str]:
+    """Text of a provider result for the HTML check
+
+    OpenAI-shaped completions and chunks (pydantic objects or dicts) yield
+    ``choices[0].message.content`` or ``choices[0].delta.content``; anything else goes
+    through ``delta_text``.
+    """
+    if isinstance(result, (str, bytes)) or result is None:
+        return delta_text(result)
+    choices = _field(result, "choices")
+    if choices is None:
+        return delta_text(result) if isinstance(result, dict) else None
+    if not choices:
+        return None
+    choice = choices[0]
+    for name in ("message", "delta"):
+        content = _field(_field(choice, name), "content")
+        if isinstance(content, str):
+            return content
+    return None
+
+
+class _Breaker:
+    __slots__ = (
+        "state", "opened_at", "open_until", "changed_at", "trips", "probe_started",
+        "successes", "failures", "consecutive_failures",
+        "latency_ewma", "ttft_ewma", "error_ewma", "in_flight", "last_error",
+    )
+
+    def __init__(self):
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.open_until = 0.0
+        self.changed_at = 0.0
+        self.trips = 0
+        self.probe_started = 0.0
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.latency_ewma: Optional[float] = None
+        self.ttft_ewma: Optional[float] = None
+        self.error_ewma = 0.0
+        self.in_flight = 0
+        self.last_error: Optional[str] = None
+
+
+class HealthRegistry:
+    """
+    Per-provider success/error counts, latency and TTFT EWMAs, and a circuit breaker.
+
+    A breaker opens after ``failure_threshold`` consecutive failures and stays open for
+    ``open_seconds`` (doubling on every re-trip, up to ``max_open_seconds``). Then one
+    probe request is let through (half-open): success closes the breaker, failure opens
+    it again. With a shared store, breakers tripped or closed by one worker follow in all
+    of them; state changes are written to the store in batches by the sync task.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        open_seconds: float = 30.0,
+        max_open_seconds: float = 600.0,
+        probe_timeout: float = 120.0,
+        ewma_alpha: float = 0.2,
+        store: Optional[SharedStore] = None,
+        sync_interval: float = 2.0
+    ):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.probe_timeout = probe_timeout
+        self.ewma_alpha = ewma_alpha
+        self.store = store if store is not None and store.shared else None
+        self.sync_interval = sync_interval
+        self._breakers: Dict[str, _Breaker] = {}
+        self._pending: Dict[str, Dict[str, float]] = {}  # state changes not yet in the store
+        self._lock = threading.Lock()
+        self._sync_task: Optional[asyncio.Task] = None
+
+    def _get(self, provider: str) -> _Breaker:
+        breaker = self._breakers.get(provider)
+        if breaker is None:
+            breaker = self._breakers.setdefault(provider, _Breaker())
+        return breaker
+
+    def _ewma(self, current: Optional[float], sample: float) -> float:
+        if current is None:
+            return sample
+        return current + self.ewma_alpha * (sample - current)
+
+    # Admission
+
+    def allow(self, provider: str) -> bool:
+        """Whether a call to ``provider`` may go ahead (claims the half-open probe slot)
+
+        Call it only right before the upstream call; answers served from a cache or a
+        shared in-flight call would hold the probe without testing the provider.
+        """
+        now = time.time()
+        with self._lock:
+            breaker = self._get(provider)
+            if breaker.state == CLOSED:
+                return True
+            if breaker.state == OPEN:
+                if now < breaker.open_until:
+                    return False
+                breaker.state = HALF_OPEN
+                breaker.probe_started = now
+                return True
+            # Half-open: one probe at a time; a probe that never reported back is retried
+            if now - breaker.probe_started > self.probe_timeout:
+                breaker.probe_started = now
+                return True
+            return False
+
+    def available(self, provider: str) -> bool:
+        """Like ``allow`` but without claiming the probe slot (for ranking candidates)"""
+        with self._lock:
+            breaker = self._breakers.get(provider)
+            if breaker is None or breaker.state == CLOSED:
+                return True
+            if breaker.state == OPEN:
+                return time.time() >= breaker.open_until
+            return time.time() - breaker.probe_started > self.probe_timeout
+
+    def retry_after(self, provider: str) -> float:
+        with self._lock:
+            breaker = self._breakers.get(provider)
+            if breaker is None:
+                return 0.0
+            return max(0.0, breaker.open_until - time.time())
+
+    def check(self, provider: str) -> None:
+        """Raise ``ProviderUnavailable`` if the breaker rejects a call"""
+        if not self.allow(provider):
+            raise ProviderUnavailable(provider, self.retry_after(provider))
+
+    # Outcomes
+
+    def record_success(self, provider: str, latency: float, ttft: Optional[float] = None) -> None:
+        with self._lock:
+            breaker = self._get(provider)
+            breaker.successes += 1
+            breaker.consecutive_failures = 0
+            breaker.latency_ewma = self._ewma(breaker.latency_ewma, latency)
+            if ttft is not None:
+                breaker.ttft_ewma = self._ewma(breaker.ttft_ewma, ttft)
+            breaker.error_ewma = self._ewma(breaker.error_ewma, 0.0)
+            closed = breaker.state != CLOSED
+            if closed:
+                breaker.state = CLOSED
+                breaker.trips = 0
+                breaker.changed_at = time.time()
+                self._publish(provider, breaker)
+        if closed:
+            logger.info(f"Circuit for provider '{provider}' closed")
+
+    def record_failure(self, provider: str, error: Any, latency: Optional[float] = None) -> None:
+        with self._lock:
+            breaker = self._get(provider)
+            breaker.failures += 1
+            breaker.consecutive_failures += 1
+            breaker.error_ewma = self._ewma(breaker.error_ewma, 1.0)
+            breaker.last_error = str(error)[:200]
+            if latency is not None:
+                breaker.latency_ewma = self._ewma(breaker.latency_ewma, latency)
+            tripped = breaker.state == HALF_OPEN or (
+                breaker.state == CLOSED and breaker.consecutive_failures >= self.failure_threshold
+            )
+            if tripped:
+                cooldown = min(self.open_seconds * (2 ** breaker.trips), self.max_open_seconds)
+                breaker.trips += 1
+                breaker.state = OPEN
+                breaker.opened_at = breaker.changed_at = time.time()
+                breaker.open_until = breaker.opened_at + cooldown
+                self._publish(provider, breaker)
+        if tripped:
+            logger.warning(f"Circuit for provider '{provider}' opened for {cooldown:.0f}s: {error}")
+
+    def begin(self, provider: str) -> None:
+        with self._lock:
+            self._get(provider).in_flight += 1
+
+    def end(self, provider: str) -> None:
+        with self._lock:
+            self._get(provider).in_flight -= 1
+
+    async def observe(self, provider: str, call: Awaitable[Any]) -> Any:
+        """Await a provider call, recording its outcome; HTML pages count as failures"""
+        start = time.perf_counter()
+        self.begin(provider)
+        try:
+            result = await call
+        except Overloaded:
+            # Shed locally before reaching the provider; says nothing about its health
+            raise
+        except Exception as e:
+            self.record_failure(provider, e, time.perf_counter() - start)
+            raise
+        finally:
+            self.end(provider)
+        if looks_like_html(response_text(result)):
+            error = UpstreamHTMLError(f"Provider '{provider}' returned an HTML page instead of a completion")
+            self.record_failure(provider, error, time.perf_counter() - start)
+            raise error
+        self.record_success(provider, time.perf_counter() - start)
+        return result
+
+    async def observe_stream(self, provider: str, chunks: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """Relay a provider stream, recording time-to-first-token and the outcome"""
+        start = time.perf_counter()
+        ttft = None
+        self.begin(provider)
+        try:
+            async for chunk in chunks:
+                if ttft is None:
+                    ttft = time.perf_counter() - start
+                    if looks_like_html(response_text(chunk)):
+                        raise UpstreamHTMLError(
+                            f"Provider '{provider}' returned an HTML page instead of a completion"
+                        )
+                yield chunk
+        except Exception as e:
+            self.record_failure(provider, e, time.perf_counter() - start)
+            raise
+        else:
+            self.record_success(provider, time.perf_counter() - start, ttft)
+        finally:
+            self.end(provider)
+            await chunks.aclose()
+
+    # Shared state
+
+    def _publish(self, provider: str, breaker: _Breaker) -> None:
+        """Queue a state change for the next sync (caller holds the lock)"""
+        if self.store is None:
+            return
+        open_until = breaker.open_until if breaker.state == OPEN else 0.0
+        self._pending[provider] = {"open_until": open_until, "at": breaker.changed_at}
+
+    def sync(self) -> None:
+        """Write queued state changes to the store and adopt other workers' (blocking)"""
+        if self.store is None:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        def update(current):
+            breakers = dict(current or {})
+            for provider, entry in pending.items():
+                known = breakers.get(provider)
+                if not isinstance(known, dict) or known.get("at", 0.0) <= entry["at"]:
+                    breakers[provider] = entry
+            return breakers, breakers
+
+        try:
+            breakers = self.store.transact(_BREAKERS_KEY, update) if pending else self.store.get(_BREAKERS_KEY)
+        except Exception:
+            with self._lock:
+                for provider, entry in pending.items():
+                    self._pending.setdefault(provider, entry)
+            raise
+        self._adopt(breakers or {})
+
+    def _adopt(self, breakers: Dict[str, Any]) -> None:
+        """Apply state changes from the store that are newer than the local ones"""
+        now = time.time()
+        with self._lock:
+            for provider, entry in breakers.items():
+                if not isinstance(entry, dict):
+                    continue
+                breaker = self._get(provider)
+                if entry.get("at", 0.0) <= breaker.changed_at:
+                    continue
+                breaker.changed_at = entry["at"]
+                open_until = entry.get("open_until", 0.0)
+                if open_until > now:
+                    breaker.state = OPEN
+                    breaker.opened_at = entry["at"]
+                    breaker.open_until = open_until
+                elif breaker.state != CLOSED:
+                    # Another worker's probe succeeded
+                    breaker.state = CLOSED
+                    breaker.consecutive_failures = 0
+                    breaker.trips = 0
+
+    async def _sync_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await loop.run_in_executor(None, self.sync)
+            except Exception as e:
+                logger.warning(f"Failed to sync circuit state: {e}")
+
+    def start(self) -> None:
+        if self.store is not None and self._sync_task is None:
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self) -> None:
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            self._sync_task = None
+
+    def load(self, provider: str) -> Tuple[Optional[float], float, int]:
+        """(latency EWMA, error-rate EWMA, in-flight calls) for load balancing"""
+        with self._lock:
+            breaker = self._breakers.get(provider)
+            if breaker is None:
+                return None, 0.0, 0
+            return breaker.latency_ewma, breaker.error_ewma, breaker.in_flight
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-provider health for status endpoints"""
+        with self._lock:
+            return {
+                provider: {
+                    "state": breaker.state,
+                    "successes": breaker.successes,
+                    "failures": breaker.failures,
+                    "error_rate": round(breaker.error_ewma, 4),
+                    "latency_ms": round(breaker.latency_ewma * 1000) if breaker.latency_ewma is not None else None,
+                    "ttft_ms": round(breaker.ttft_ewma * 1000) if breaker.ttft_ewma is not None else None,
+                    "in_flight": breaker.in_flight,
+                    "retry_after": round(max(0.0, breaker.open_until - time.time()), 1) if breaker.state == OPEN else 0,
+                    "last_error": breaker.last_error,
+                }
+                for provider, breaker in self._breakers.items()
+            }
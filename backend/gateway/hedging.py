@@ -0,0 +1,157 @@
+"""
+Hedged Requests
+Start a backup provider when the first token is late; stream whichever answers first
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TTFTStats:
+    """Recent time-to-first-token samples per model, for percentile thresholds"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, ttft: float) -> None:
+        with self._lock:
+            samples = self._samples.get(model)
+            if samples is None:
+                samples = self._samples[model] = deque(maxlen=self.window)
+            samples.append(ttft)
+
+    def percentile(self, model: str, q: float) -> Optional[float]:
+        """The ``q``-th percentile (0-100) TTFT, or None until enough samples exist"""
+        with self._lock:
+            samples = self._samples.get(model)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class HedgeBudget:
+    """Token bucket capping hedges at ``ratio`` of requests (plus a small burst)"""
+
+    def __init__(self, ratio: float = 0.1, burst: float = 10.0):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst
+        self._lock = threading.Lock()
+        self.hedges = 0
+        self.wins = 0
+
+    def deposit(self) -> None:
+        """Credit one request"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            self.hedges += 1
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {"tokens": round(self._tokens, 2), "hedges": self.hedges, "backup_wins": self.wins}
+
+
+async def _close(chunks: Optional[AsyncIterator[Any]], first: Optional[asyncio.Future]) -> None:
+    if first is not None and not first.done():
+        first.cancel()
+        try:
+            await first
+        except BaseException:
+            pass
+    aclose = getattr(chunks, "aclose", None)
+    if aclose is not None:
+        try:
+            await aclose()
+        except Exception:
+            pass
+
+
+async def hedged_stream(
+    primary: AsyncIterator[Any],
+    open_backup: Optional[Callable[[], Awaitable[Optional[AsyncIterator[Any]]]]],
+    delay: float,
+    budget: HedgeBudget,
+    on_first_chunk: Optional[Callable[[float], None]] = None
+) -> AsyncIterator[Any]:
+    """
+    Relay ``primary``; if it has not produced a chunk after ``delay`` seconds and the
+    budget allows, open a backup stream and race the two for the first chunk. Without
+    ``open_backup`` the stream is only timed.
+
+    The loser is cancelled and closed. A stream that fails before its first chunk
+    forfeits the race instead of failing the request. ``on_first_chunk`` receives the
+    winner's time to first chunk.
+    """
+    start = time.perf_counter()
+    if open_backup is not None:
+        budget.deposit()
+    contenders = {asyncio.ensure_future(primary.__anext__()): primary}
+    backup: Optional[AsyncIterator[Any]] = None
+    winner: Optional[AsyncIterator[Any]] = None
+    first_chunk: Any = None
+
+    try:
+        done, _ = await asyncio.wait(list(contenders), timeout=delay)
+        if not done and open_backup is not None and budget.try_spend():
+            try:
+                backup = await open_backup()
+            except Exception as e:
+                logger.warning(f"Hedge could not start a backup provider: {e}")
+            if backup is not None:
+                logger.info(f"First chunk later than {delay:.2f}s; hedging with a backup provider")
+                contenders[asyncio.ensure_future(backup.__anext__())] = backup
+
+        error: Optional[BaseException] = None
+        while contenders:
+            done, _ = await asyncio.wait(list(contenders), return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                chunks = contenders.pop(future)
+                exc = future.exception()
+                if exc is None:
+                    winner, first_chunk = chunks, future.result()
+                    break
+                if not isinstance(exc, StopAsyncIteration):
+                    error = exc
+                # Finished or failed without a chunk; let the other contender answer
+                await _close(chunks, None)
+                if not contenders and not isinstance(exc, StopAsyncIteration):
+                    raise exc
+            if winner is not None:
+                break
+        if winner is None:
+            if error is not None:
+                raise error
+            return
+    finally:
+        for future, chunks in list(contenders.items()):
+            await _close(chunks, future)
+        contenders.clear()
+
+    if on_first_chunk is not None:
+        on_first_chunk(time.perf_counter() - start)
+    if winner is backup:
+        budget.wins += 1
+
+    try:
+        yield first_chunk
+        async for chunk in winner:
+            yield chunk
+    finally:
+        await _close(winner, None)
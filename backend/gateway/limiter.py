@@ -0,0 +1,189 @@
+"""
+Admission Control
+Per-provider and global concurrency limits with bounded, deadline-aware wait queues
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+
+class Overloaded(Exception):
+    """
+    Raised instead of queueing work the gateway cannot start in time.
+
+    ``status_code`` is 429 when a single provider is saturated (other models still
+    work) and 503 when the whole gateway is.
+    """
+
+    def __init__(self, scope: str, reason: str, retry_after: float):
+        status = "Gateway" if scope == "global" else f"Provider '{scope}'"
+        super().__init__(f"{status} is at capacity ({reason}); retry later")
+        self.scope = scope
+        self.reason = reason
+        self.retry_after = retry_after
+        self.status_code = 503 if scope == "global" else 429
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after)))}
+
+
+class _Gate:
+    """Counting semaphore with a FIFO queue of bounded length"""
+
+    def __init__(self, scope: str, limit: int, max_queue: int):
+        self.scope = scope
+        self.limit = limit
+        self.max_queue = max_queue
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.hold_ewma = 1.0  # seconds a slot is typically held
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> float:
+        """Rough time until a newly queued request would get a slot"""
+        return self.hold_ewma * (self.queued + 1) / max(1, self.limit)
+
+    async def acquire(self, timeout: float) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded(self.scope, "queue full", self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            self.timed_out += 1
+            raise Overloaded(self.scope, "queue deadline exceeded", self.retry_after())
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        if waiter.done() and not waiter.cancelled():
+            # The slot was handed over just as we gave up; pass it on
+            self.release()
+            return
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self, held: Optional[float] = None) -> None:
+        if held is not None:
+            self.hold_ewma += 0.1 * (held - self.hold_ewma)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot straight to the next waiter; ``active`` is unchanged
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+class AdmissionController:
+    """
+    Concurrency slots per provider and for the whole gateway.
+
+    A request waits at most ``queue_timeout`` in total, and each queue holds at most
+    ``max_queue`` waiters; beyond that it is rejected immediately with ``Overloaded``.
+    The provider slot is taken first so a request queued behind a slow provider never
+    holds one of the global slots while it waits.
+    """
+
+    def __init__(
+        self,
+        per_provider_limit: int = 64,
+        global_limit: int = 256,
+        max_queue: int = 128,
+        queue_timeout: float = 10.0
+    ):
+        self.per_provider_limit = per_provider_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._global = _Gate("global", global_limit, max_queue)
+        self._providers: Dict[str, _Gate] = {}
+        self.wait_count = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _gate(self, provider_name: str) -> _Gate:
+        gate = self._providers.get(provider_name)
+        if gate is None:
+            gate = self._providers[provider_name] = _Gate(provider_name, self.per_provider_limit, self.max_queue)
+        return gate
+
+    async def acquire(self, provider_name: str) -> float:
+        """Take a provider and a global slot; returns the time spent queueing"""
+        start = time.monotonic()
+        gate = self._gate(provider_name)
+        await gate.acquire(self.queue_timeout)
+        try:
+            remaining = self.queue_timeout - (time.monotonic() - start)
+            if remaining <= 0:
+                raise Overloaded("global", "queue deadline exceeded", self._global.retry_after())
+            await self._global.acquire(remaining)
+        except BaseException:
+            gate.release()
+            raise
+        waited = time.monotonic() - start
+        self.wait_count += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        return waited
+
+    def release(self, provider_name: str, held: Optional[float] = None) -> None:
+        self._global.release(held)
+        self._gate(provider_name).release(held)
+
+    @asynccontextmanager
+    async def slot(self, provider_name: str) -> AsyncIterator[float]:
+        waited = await self.acquire(provider_name)
+        start = time.monotonic()
+        try:
+            yield waited
+        finally:
+            self.release(provider_name, time.monotonic() - start)
+
+    def queue_depth(self) -> int:
+        return self._global.queued + sum(gate.queued for gate in self._providers.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "global": self._global.stats(),
+            "providers": {
+                name: gate.stats() for name, gate in self._providers.items() if gate.active or gate.queued
+            },
+            "queue_depth": self.queue_depth(),
+            "queue_timeout": self.queue_timeout,
+            "wait_count": self.wait_count,
+            "wait_seconds_total": round(self.wait_seconds_total, 3),
+            "wait_seconds_max": round(self.wait_seconds_max, 3),
+            "rejected": self._global.rejected + sum(g.rejected for g in self._providers.values()),
+            "timed_out": self._global.timed_out + sum(g.timed_out for g in self._providers.values()),
+        }
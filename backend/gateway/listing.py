@@ -0,0 +1,114 @@
+"""
+Model Listing
+Precomputed OpenAI-style model lists: pre-encoded bodies with ETags, filters and cursor pagination
+"""
+
+import bisect
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fastapi.responses import Response
+
+_MAX_LIMIT = 1000
+
+
+def _sort_key(model_id: str) -> Tuple[str, str]:
+    # Alphabetical by the model part of "Provider/model"; the full id breaks ties
+    return model_id.split("/", 1)[-1].lower(), model_id
+
+
+def _matches(entry: Dict[str, Any], provider: Optional[str], capability: Optional[str],
+             modality: Optional[str]) -> bool:
+    if provider and entry["owned_by"].lower() != provider:
+        return False
+    if capability and capability not in entry.get("capabilities", ()):
+        return False
+    if modality:
+        modalities = entry.get("modalities") or {}
+        if modality not in modalities.get("input", ()) and modality not in modalities.get("output", ()):
+            return False
+    return True
+
+
+class ModelListing:
+    """
+    Immutable model list built once per provider-map initialization.
+
+    Entries are deduplicated by id, sorted and stamped with one ``created`` time at build.
+    The unfiltered list is encoded up front; filtered or paginated pages are encoded on
+    first request and kept in a small LRU, so a request is a dict lookup in the common
+    case. Pages follow OpenAI list pagination: ``after`` is the last id of the previous
+    page, and ``has_more``/``first_id``/``last_id`` describe the page.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]], created: Optional[int] = None,
+                 page_cache_size: int = 256):
+        created = created or int(time.time())
+        unique: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            if entry["id"] not in unique:
+                unique[entry["id"]] = {"id": entry["id"], "object": "model", "created": created, **entry}
+        self.data = [unique[model_id] for model_id in sorted(unique, key=_sort_key)]
+        self._keys = [_sort_key(entry["id"]) for entry in self.data]
+        self.body = json.dumps({"object": "list", "data": self.data}, ensure_ascii=False).encode("utf-8")
+        self.etag = f'"{hashlib.sha1(self.body).hexdigest()[:16]}"'
+        self._pages: "OrderedDict[tuple, Tuple[bytes, str]]" = OrderedDict()
+        self._page_cache_size = page_cache_size
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def page(self, provider: Optional[str] = None, capability: Optional[str] = None,
+             modality: Optional[str] = None, after: Optional[str] = None,
+             limit: Optional[int] = None) -> Tuple[bytes, str]:
+        """Encoded body and ETag for one filtered, paginated view of the list"""
+        query = (
+            (provider or "").lower() or None, (capability or "").lower() or None,
+            (modality or "").lower() or None, after or None,
+            max(1, min(limit, _MAX_LIMIT)) if limit else None,
+        )
+        if query == (None, None, None, None, None):
+            return self.body, self.etag
+        cached = self._pages.get(query)
+        if cached is not None:
+            self._pages.move_to_end(query)
+            return cached
+
+        provider, capability, modality, after, limit = query
+        # An unknown cursor (e.g. a model removed since) resumes at its sort position
+        start = bisect.bisect_right(self._keys, _sort_key(after)) if after else 0
+        selected: List[Dict[str, Any]] = []
+        has_more = False
+        for entry in self.data[start:]:
+            if not _matches(entry, provider, capability, modality):
+                continue
+            if limit is not None and len(selected) == limit:
+                has_more = True
+                break
+            selected.append(entry)
+
+        payload: Dict[str, Any] = {"object": "list", "data": selected}
+        if after is not None or limit is not None:
+            payload.update(
+                has_more=has_more,
+                first_id=selected[0]["id"] if selected else None,
+                last_id=selected[-1]["id"] if selected else None,
+            )
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        cached = body, f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+        self._pages[query] = cached
+        if len(self._pages) > self._page_cache_size:
+            self._pages.popitem(last=False)
+        return cached
+
+    def response(self, if_none_match: Optional[str] = None, **query: Any) -> Response:
+        """Pre-encoded list response with ETag / If-None-Match revalidation"""
+        body, etag = self.page(**query)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        tags = [tag.strip().lstrip("W/") for tag in (if_none_match or "").split(",")]
+        if "*" in tags or etag in tags:
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
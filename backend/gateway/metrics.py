@@ -0,0 +1,243 @@
+"""
+Prometheus Metrics
+Per-provider and per-model latency, TTFT, throughput and error metrics with bounded labels
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set, Tuple
+
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from .sse import delta_text
+
+# Label values past these limits are reported as "other", so a flood of made-up model
+# names cannot grow the number of series without bound
+MAX_PROVIDERS = 200
+MAX_PROVIDER_MODELS = 1000
+MAX_ERROR_CLASSES = 50
+
+OTHER = "other"
+
+# Rough tokens-per-character ratio; providers do not report usage on streams
+_CHARS_PER_TOKEN = 4.0
+
+# Under gunicorn every worker writes its samples here and /metrics merges them all
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+REGISTRY = CollectorRegistry()
+
+REQUEST_LATENCY = Histogram(
+    "webscout_request_duration_seconds", "Request duration, to the last byte for streams",
+    ["endpoint", "provider", "model"], registry=REGISTRY,
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80, 160),
+)
+TTFT = Histogram(
+    "webscout_time_to_first_token_seconds", "Time from request to the first streamed chunk",
+    ["provider", "model"], registry=REGISTRY,
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32),
+)
+TOKENS_PER_SECOND = Histogram(
+    "webscout_stream_tokens_per_second", "Estimated output tokens per second after the first chunk",
+    ["provider", "model"], registry=REGISTRY,
+    buckets=(1, 5, 10, 20, 40, 80, 160, 320, 640),
+)
+CHUNKS = Histogram(
+    "webscout_stream_chunks", "Chunks per streamed response",
+    ["provider", "model"], registry=REGISTRY,
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+)
+ERRORS = Counter(
+    "webscout_errors_total", "Failed requests by error class",
+    ["endpoint", "provider", "error"], registry=REGISTRY,
+)
+IN_FLIGHT = Gauge(
+    "webscout_in_flight_requests", "Requests currently being served",
+    ["endpoint"], registry=REGISTRY, multiprocess_mode="livesum",
+)
+
+
+class _BoundedLabels:
+    """Admits the first ``limit`` distinct values of a label; later ones become ``other``"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._seen: Set[Any] = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, value: Any, default: Any) -> Any:
+        if value in self._seen:
+            return value
+        with self._lock:
+            if len(self._seen) < self.limit:
+                self._seen.add(value)
+                return value
+        return default
+
+
+_providers = _BoundedLabels(MAX_PROVIDERS)
+_provider_models = _BoundedLabels(MAX_PROVIDER_MODELS)
+_error_classes = _BoundedLabels(MAX_ERROR_CLASSES)
+
+
+def _labels(provider: Optional[str], model: Optional[str]) -> Tuple[str, str]:
+    provider = _providers(str(provider or "unknown"), OTHER)
+    return _provider_models((provider, str(model or "unknown")), (provider, OTHER))
+
+
+def error_class(error: BaseException) -> str:
+    """HTTP errors by status code, everything else by exception type"""
+    if isinstance(error, (asyncio.CancelledError, GeneratorExit)):
+        return "cancelled"
+    status = getattr(error, "status_code", None)
+    name = f"http_{status}" if isinstance(status, int) else type(error).__name__
+    return _error_classes(name, OTHER)
+
+
+class RequestMetrics:
+    """
+    Times one request. Used as a context manager; labels are read when the request
+    ends, so ``provider`` and ``model`` can be filled in once routing has picked them.
+
+    For streams, ``wrap`` hands the measurement over to the returned iterator, which
+    records TTFT, chunk count and throughput and finishes the request when it ends. The
+    stream counts as in flight only once it is iterated, so a response that is never
+    sent does not leave the gauge raised.
+    """
+
+    def __init__(self, endpoint: str, provider: Optional[str] = None, model: Optional[str] = None):
+        self.endpoint = endpoint
+        self.provider = provider
+        self.model = model
+        self.start = time.perf_counter()
+        self._streaming = False
+        self._done = False
+        self._in_flight = False
+        self._enter()
+
+    def _enter(self) -> None:
+        if not self._in_flight:
+            self._in_flight = True
+            IN_FLIGHT.labels(self.endpoint).inc()
+
+    def _leave(self) -> None:
+        if self._in_flight:
+            self._in_flight = False
+            IN_FLIGHT.labels(self.endpoint).dec()
+
+    def __enter__(self) -> "RequestMetrics":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None:
+            self.fail(exc)
+        elif not self._streaming:
+            self.finish()
+
+    def finish(self) -> None:
+        if self._done:
+            return
+        self._done = True
+        self._leave()
+        provider, model = _labels(self.provider, self.model)
+        REQUEST_LATENCY.labels(self.endpoint, provider, model).observe(time.perf_counter() - self.start)
+
+    def fail(self, error: BaseException) -> None:
+        if self._done:
+            return
+        self._done = True
+        self._leave()
+        provider, _ = _labels(self.provider, None)
+        ERRORS.labels(self.endpoint, provider, error_class(error)).inc()
+
+    def wrap(self, chunks: AsyncIterator[Any], text: Callable[[Any], Optional[str]] = delta_text) -> AsyncIterator[Any]:
+        """Relay a stream, measuring it; ``text`` extracts each chunk's text"""
+        self._streaming = True
+        self._leave()
+        return self._relay(chunks, text)
+
+    async def _relay(self, chunks: AsyncIterator[Any], text: Callable[[Any], Optional[str]]) -> AsyncIterator[Any]:
+        first = None
+        count = 0
+        chars = 0
+        self._enter()
+        try:
+            async for chunk in chunks:
+                if first is None:
+                    first = time.perf_counter()
+                count += 1
+                chars += len(text(chunk) or "")
+                yield chunk
+        except BaseException as e:
+            self.fail(e)
+            raise
+        finally:
+            self._leave()
+            aclose = getattr(chunks, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        provider, model = _labels(self.provider, self.model)
+        CHUNKS.labels(provider, model).observe(count)
+        if first is not None:
+            TTFT.labels(provider, model).observe(first - self.start)
+            generating = time.perf_counter() - first
+            if generating > 0 and chars:
+                TOKENS_PER_SECOND.labels(provider, model).observe(chars / _CHARS_PER_TOKEN / generating)
+        self.finish()
+
+
+class _GatewayCollector:
+    """Reads queue depth and cache counters from their owners at scrape time"""
+
+    def __init__(self):
+        self.queue_depth: Optional[Callable[[], int]] = None
+        self.cache_stats: Optional[Callable[[], Optional[Dict[str, Any]]]] = None
+
+    def collect(self):
+        if self.queue_depth is not None:
+            yield GaugeMetricFamily(
+                "webscout_queue_depth", "Requests waiting for a provider or global slot", value=self.queue_depth()
+            )
+        stats = self.cache_stats() if self.cache_stats is not None else None
+        if stats:
+            lookups = CounterMetricFamily(
+                "webscout_cache_lookups", "Response cache lookups by result", labels=["result"]
+            )
+            lookups.add_metric(["hit"], stats.get("hits", 0))
+            lookups.add_metric(["miss"], stats.get("misses", 0))
+            yield lookups
+            yield GaugeMetricFamily(
+                "webscout_cache_hit_ratio", "Response cache hits over lookups", value=stats.get("hit_ratio", 0.0)
+            )
+
+
+_collector = _GatewayCollector()
+REGISTRY.register(_collector)
+
+
+def bind(
+    queue_depth: Optional[Callable[[], int]] = None,
+    cache_stats: Optional[Callable[[], Optional[Dict[str, Any]]]] = None
+) -> None:
+    """Attach the sources read at scrape time (the executor queue and response cache)"""
+    _collector.queue_depth = queue_depth
+    _collector.cache_stats = cache_stats
+
+
+def metrics_response() -> Response:
+    """Prometheus text exposition of every gateway metric
+
+    In multiprocess mode the request metrics are summed over all workers; queue depth
+    and cache counters are those of the worker answering the scrape.
+    """
+    registry = REGISTRY
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(_collector)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,86 @@
+"""
+Model Set Cache
+Per-provider-class AVAILABLE_MODELS as frozensets, so model validation never constructs a provider
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from .catalog import class_level_models
+
+logger = logging.getLogger(__name__)
+
+
+class ModelSetCache:
+    """
+    Frozen model sets keyed by provider class, refreshed after ``ttl`` seconds.
+
+    Class-level ``AVAILABLE_MODELS`` are read directly. Lists exposed as a ``property``
+    need an instance; those are loaded in a background thread through ``instance_for``
+    (typically the gateway's cached provider instances), never on the caller's thread.
+    Until the first load finishes ``get`` returns ``None`` and callers skip validation,
+    as they do for providers without a model list. A stale set keeps being served while
+    its refresh runs.
+    """
+
+    def __init__(self, instance_for: Callable[[Any], Any], ttl: float = 3600.0):
+        self.instance_for = instance_for
+        self.ttl = ttl
+        self._sets: Dict[Any, Tuple[frozenset, float]] = {}
+        self._loading: set = set()
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def get(self, provider_class: Any) -> Optional[frozenset]:
+        """The class's model set, or ``None`` while a runtime list is still loading"""
+        cached = self._sets.get(provider_class)
+        if cached is not None:
+            models, expires = cached
+            if self.ttl and time.monotonic() >= expires:
+                self._schedule(provider_class)
+            return models
+
+        models = class_level_models(provider_class)
+        if models is not None:
+            self._store(provider_class, models)
+            return self._sets[provider_class][0]
+        self._schedule(provider_class)
+        return None
+
+    def invalidate(self) -> None:
+        self._sets.clear()
+
+    def _store(self, provider_class: Any, models: Iterable[Any]) -> None:
+        models = frozenset(m for m in models if isinstance(m, str) and m)
+        self._sets[provider_class] = (models, time.monotonic() + self.ttl)
+
+    def _schedule(self, provider_class: Any) -> None:
+        with self._lock:
+            if provider_class in self._loading:
+                return
+            self._loading.add(provider_class)
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="model-sets")
+        self._pool.submit(self._load, provider_class)
+
+    def _load(self, provider_class: Any) -> None:
+        try:
+            models = class_level_models(provider_class)
+            if models is None:
+                models = getattr(self.instance_for(provider_class), "AVAILABLE_MODELS", None) or ()
+                if isinstance(models, str) or not hasattr(models, "__iter__"):
+                    models = ()
+            self._store(provider_class, models)
+        except Exception as e:
+            logger.warning(f"Could not load models of {getattr(provider_class, '__name__', provider_class)}: {e}")
+            # Remember the failure as "no list" until the next refresh
+            self._store(provider_class, ())
+        finally:
+            with self._lock:
+                self._loading.discard(provider_class)
+
+    def stats(self) -> Dict[str, int]:
+        return {"classes": len(self._sets), "loading": len(self._loading)}
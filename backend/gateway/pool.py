@@ -0,0 +1,281 @@
+"""
+Provider Instance Pool
+Bounded, evicting cache of provider instances shared across requests
+"""
+
+import asyncio
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+
+# Per-request sampling parameters: passed on each call, never baked into an instance
+SAMPLING_PARAMS = frozenset({
+    "max_tokens", "temperature", "top_p", "top_k", "presence_penalty",
+    "frequency_penalty", "stop", "seed", "n", "user", "stream", "logit_bias",
+})
+
+
+@lru_cache(maxsize=1024)
+def _accepted(func: Callable) -> Optional[FrozenSet[str]]:
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters):
+        return None
+    return frozenset(
+        p.name for p in parameters
+        if p.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+    )
+
+
+def accepted_params(func: Callable) -> Optional[FrozenSet[str]]:
+    """Keyword arguments ``func`` accepts, or None when it takes ``**kwargs``"""
+    return _accepted(getattr(func, "__func__", func))
+
+
+def call_params(func: Callable, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """The subset of ``kwargs`` that ``func`` accepts"""
+    accepted = accepted_params(func)
+    if accepted is None:
+        return kwargs
+    return {k: v for k, v in kwargs.items() if k in accepted}
+
+
+def split_params(
+    kwargs: Dict[str, Any],
+    provider_class: Optional[type] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Split kwargs into (instance kwargs, per-call sampling kwargs).
+
+    Given ``provider_class``, a sampling parameter its ``chat`` does not accept is kept
+    on the instance if the constructor takes it (native providers fix ``max_tokens`` and
+    ``temperature`` at construction), and dropped otherwise.
+    """
+    instance_kwargs = {k: v for k, v in kwargs.items() if k not in SAMPLING_PARAMS}
+    call_kwargs = {k: v for k, v in kwargs.items() if k in SAMPLING_PARAMS}
+    if provider_class is not None:
+        chat = getattr(provider_class, "chat", None)
+        per_call = call_params(chat, call_kwargs) if callable(chat) else call_kwargs
+        constructor = call_params(provider_class, {
+            k: v for k, v in call_kwargs.items() if k not in per_call and k != "stream"
+        })
+        instance_kwargs.update(constructor)
+        call_kwargs = per_call
+    return instance_kwargs, call_kwargs
+
+
+def estimate_size(obj: Any, max_depth: int = 3) -> int:
+    """Rough, bounded estimate of the memory held by a provider instance"""
+    seen = set()
+
+    def walk(value: Any, depth: int) -> int:
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+        try:
+            size = sys.getsizeof(value)
+        except TypeError:
+            return 0
+        if depth >= max_depth:
+            return size
+        if isinstance(value, dict):
+            size += sum(walk(k, depth + 1) + walk(v, depth + 1) for k, v in value.items())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            size += sum(walk(item, depth + 1) for item in value)
+        elif hasattr(value, "__dict__") and not isinstance(value, type):
+            size += walk(vars(value), depth + 1)
+        return size
+
+    return walk(obj, 0)
+
+
+def close_instance(instance: Any) -> Optional[Future]:
+    """
+    Release the HTTP sessions an evicted provider holds.
+
+    The provider itself, its ``session`` and its ``client`` are each closed if they can
+    be. An async session (``close_async_session``) is closed on the event loop it is
+    bound to; the returned future, if any, resolves when that is done.
+    """
+    seen = set()
+    for target in (instance, getattr(instance, "session", None), getattr(instance, "client", None)):
+        if target is None or id(target) in seen:
+            continue
+        seen.add(id(target))
+        close = getattr(target, "close", None)
+        if callable(close) and not asyncio.iscoroutinefunction(close):
+            try:
+                close()
+            except Exception:
+                pass
+    close_async = getattr(instance, "close_async_session", None)
+    if callable(close_async):
+        try:
+            return close_async()
+        except Exception:
+            pass
+    return None
+
+
+class _Entry:
+    __slots__ = ("key", "instance", "size", "last_used", "leases", "evicted")
+
+    def __init__(self, key: tuple, instance: Any, size: int):
+        self.key = key
+        self.instance = instance
+        self.size = size
+        self.last_used = time.monotonic()
+        self.leases = 0
+        self.evicted = False
+
+
+class ProviderPool:
+    """LRU pool of provider instances capped by count, estimated memory and idle time"""
+
+    def __init__(
+        self,
+        factory: Callable[[str], Optional[type]],
+        max_instances: int = 64,
+        max_memory_mb: int = 256,
+        idle_ttl: float = 900.0
+    ):
+        self.factory = factory
+        self.max_instances = max_instances
+        self.max_memory_bytes = max_memory_mb * 1024 * 1024
+        self.idle_ttl = idle_ttl
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._by_id: Dict[int, _Entry] = {}
+        self._memory = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(provider_name: str, instance_kwargs: Dict[str, Any]) -> tuple:
+        return (provider_name.lower(), tuple(sorted((k, repr(v)) for k, v in instance_kwargs.items())))
+
+    def acquire(self, provider_name: str, **kwargs) -> Any:
+        """
+        Lease an instance for ``provider_name``, constructing it on a miss.
+
+        Sampling parameters in ``kwargs`` that the provider's ``chat`` accepts are ignored
+        for pooling purposes; callers pass them per call. The rest are part of the
+        instance (see ``split_params``). Every ``acquire`` must be paired with ``release``.
+        """
+        provider_class = self.factory(provider_name)
+        if not provider_class:
+            raise LookupError(f"Provider '{provider_name}' not found")
+        instance_kwargs, _ = split_params(kwargs, provider_class)
+        key = self.make_key(provider_name, instance_kwargs)
+
+        with self._lock:
+            self._evict_idle()
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.leases += 1
+                entry.last_used = time.monotonic()
+                self.hits += 1
+                return entry.instance
+            self.misses += 1
+
+        instance = provider_class(**instance_kwargs)
+        entry = _Entry(key, instance, estimate_size(instance))
+        entry.leases = 1
+
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                # Another thread built the same instance concurrently; keep the pooled one
+                existing.leases += 1
+                close_instance(instance)
+                return existing.instance
+            self._entries[key] = entry
+            self._by_id[id(instance)] = entry
+            self._memory += entry.size
+            self._evict_over_capacity()
+        return instance
+
+    def release(self, instance: Any) -> None:
+        """Return a leased instance; evicted instances are closed once unused"""
+        with self._lock:
+            entry = self._by_id.get(id(instance))
+            if entry is None:
+                return
+            entry.leases -= 1
+            entry.last_used = time.monotonic()
+            if not entry.evicted:
+                self._entries.move_to_end(entry.key)
+            elif entry.leases <= 0:
+                del self._by_id[id(instance)]
+                close_instance(instance)
+
+    def _evict(self, key: tuple) -> None:
+        entry = self._entries.pop(key)
+        self._memory -= entry.size
+        self.evictions += 1
+        entry.evicted = True
+        if entry.leases <= 0:
+            self._by_id.pop(id(entry.instance), None)
+            close_instance(entry.instance)
+
+    def _evict_idle(self) -> None:
+        if not self.idle_ttl:
+            return
+        cutoff = time.monotonic() - self.idle_ttl
+        # Entries are kept in LRU order, so idle ones are at the front
+        for key, entry in list(self._entries.items()):
+            if entry.last_used > cutoff:
+                break
+            if entry.leases <= 0:
+                self._evict(key)
+
+    def _evict_over_capacity(self) -> None:
+        for key in list(self._entries.keys()):
+            if len(self._entries) <= 1:
+                break
+            if len(self._entries) <= self.max_instances and self._memory <= self.max_memory_bytes:
+                break
+            self._evict(key)
+
+    def sweep(self) -> None:
+        """Evict idle instances (safe to call periodically)"""
+        with self._lock:
+            self._evict_idle()
+
+    async def aclose(self) -> None:
+        """Close every pooled instance, leased or not (app shutdown)"""
+        with self._lock:
+            instances = [entry.instance for entry in self._entries.values()]
+            instances += [entry.instance for entry in self._by_id.values() if entry.evicted]
+            self._entries.clear()
+            self._by_id.clear()
+            self._memory = 0
+        pending: List[Future] = [f for f in map(close_instance, instances) if f is not None]
+        if pending:
+            await asyncio.gather(*(asyncio.wrap_future(f) for f in pending), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool occupancy and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "instances": len(self._entries),
+                "max_instances": self.max_instances,
+                "memory_bytes": self._memory,
+                "max_memory_bytes": self.max_memory_bytes,
+                "idle_ttl": self.idle_ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
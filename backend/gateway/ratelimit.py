@@ -0,0 +1,261 @@
+"""
+Client Rate Limiting
+GCRA rate limits per API token and client IP, local or through the shared store
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .shared_state import SharedStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: float  # seconds until the key's full burst is available again
+    retry_after: float  # seconds until the next request would be allowed (0 if allowed)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+class RateLimiter:
+    """
+    Generic cell rate algorithm: each key stores only its theoretical arrival time.
+
+    ``rate`` requests per ``period`` seconds are allowed, with bursts of up to ``burst``
+    requests. A key whose arrival time has passed is back to a full burst and carries no
+    information, so idle keys are dropped by ``sweep``. With a shared store every worker
+    draws from the same budget.
+
+    With ``sync_interval`` > 0, requests are decided from the worker's local state and
+    ``sync`` merges each key's admitted requests into the store in one transaction per
+    key, adopting the combined arrival time. Between syncs, workers can jointly admit up
+    to about (workers - 1) x ``sync_interval`` worth of extra requests per key. With 0,
+    every request is a store transaction.
+    """
+
+    def __init__(
+        self,
+        rate: int,
+        period: float = 60.0,
+        burst: Optional[int] = None,
+        store: Optional[SharedStore] = None,
+        prefix: str = "ratelimit",
+        sync_interval: float = 0.0
+    ):
+        self.rate = rate
+        self.period = period
+        self.burst = burst or rate
+        self.interval = period / rate
+        self.tolerance = self.interval * (self.burst - 1)
+        self.store = store if store is not None and store.shared else None
+        self.prefix = prefix
+        self.sync_interval = sync_interval
+        self._tat: Dict[str, float] = {}
+        self._pending: Dict[str, int] = {}  # requests admitted per key since the last sync
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+
+    def _update(self, tat: Optional[float], now: float):
+        tat = max(tat or now, now)
+        if tat - now > self.tolerance:
+            return tat, (False, tat)
+        return tat + self.interval, (True, tat + self.interval)
+
+    def _result(self, allowed: bool, tat: float, now: float) -> RateLimitResult:
+        if allowed:
+            self.allowed += 1
+        else:
+            self.rejected += 1
+        # Requests still admissible right now
+        remaining = int((now + self.tolerance + self.interval - tat) / self.interval) if allowed else 0
+        return RateLimitResult(
+            allowed=allowed,
+            limit=self.burst,
+            remaining=max(0, min(self.burst, remaining)),
+            reset=max(0.0, tat - now),
+            retry_after=0.0 if allowed else tat - now - self.tolerance,
+        )
+
+    @property
+    def blocking(self) -> bool:
+        """Whether ``hit`` makes a store round trip"""
+        return self.store is not None and self.sync_interval <= 0
+
+    def hit(self, key: str) -> RateLimitResult:
+        """Count one request for ``key`` (blocking when ``blocking``)"""
+        now = time.time()
+        if self.blocking:
+            # Expire with the arrival time so idle keys disappear from the store too
+            allowed, tat = self.store.transact(
+                f"{self.prefix}:{key}",
+                lambda current: self._update(current, now),
+                ttl=self.tolerance + self.interval + 1
+            )
+            return self._result(allowed, tat, now)
+        with self._lock:
+            new_tat, (allowed, tat) = self._update(self._tat.get(key), now)
+            self._tat[key] = new_tat
+            if allowed and self.store is not None:
+                self._pending[key] = self._pending.get(key, 0) + 1
+        return self._result(allowed, tat, now)
+
+    def sync(self) -> int:
+        """Merge locally admitted requests into the store (blocking); returns keys synced"""
+        if self.store is None:
+            return 0
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        items = list(pending.items())
+        for index, (key, count) in enumerate(items):
+            now = time.time()
+
+            def merge(current, count=count, now=now):
+                tat = max(current or now, now) + count * self.interval
+                return tat, tat
+
+            try:
+                tat = self.store.transact(
+                    f"{self.prefix}:{key}", merge,
+                    ttl=self.tolerance + self.interval * (count + 1) + 1
+                )
+            except Exception:
+                # Keep the unsynced counts for the next attempt
+                with self._lock:
+                    for unsynced, n in items[index:]:
+                        self._pending[unsynced] = self._pending.get(unsynced, 0) + n
+                raise
+            with self._lock:
+                # Requests admitted while syncing are still pending on top of the shared time
+                self._tat[key] = max(tat, time.time()) + self._pending.get(key, 0) * self.interval
+        return len(pending)
+
+    def sweep(self) -> int:
+        """Drop keys that are back to a full burst; returns how many were dropped"""
+        now = time.time()
+        with self._lock:
+            idle = [key for key, tat in self._tat.items() if tat <= now and key not in self._pending]
+            for key in idle:
+                del self._tat[key]
+        sweep_store = getattr(self.store, "sweep", None)
+        if sweep_store is not None:
+            sweep_store()
+        return len(idle)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "rate": self.rate,
+            "period": self.period,
+            "burst": self.burst,
+            "tracked_keys": len(self._tat),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+        }
+
+
+class ClientRateLimits:
+    """
+    A per-token and a per-IP limiter applied together.
+
+    Authenticated requests are charged to both their token and their IP, so a client
+    cycling tokens is still held to the IP limit. The headers describe whichever limit
+    has the least room left.
+    """
+
+    def __init__(
+        self,
+        token_rate: int,
+        ip_rate: int,
+        period: float = 60.0,
+        token_burst: Optional[int] = None,
+        ip_burst: Optional[int] = None,
+        store: Optional[SharedStore] = None,
+        sweep_interval: float = 60.0,
+        sync_interval: float = 1.0
+    ):
+        self.tokens = RateLimiter(
+            token_rate, period, token_burst, store, prefix="ratelimit:token", sync_interval=sync_interval
+        )
+        self.ips = RateLimiter(ip_rate, period, ip_burst, store, prefix="ratelimit:ip", sync_interval=sync_interval)
+        self.sweep_interval = sweep_interval
+        self.sync_interval = sync_interval
+        self._sweep_task: Optional[asyncio.Task] = None
+        self._sync_task: Optional[asyncio.Task] = None
+
+    def check(self, token: Optional[str], ip: str) -> RateLimitResult:
+        results: List[RateLimitResult] = [self.ips.hit(ip)]
+        if token and results[0].allowed:
+            results.append(self.tokens.hit(token))
+        rejected = [r for r in results if not r.allowed]
+        if rejected:
+            return max(rejected, key=lambda r: r.retry_after)
+        return min(results, key=lambda r: r.remaining)
+
+    async def acheck(self, token: Optional[str], ip: str) -> RateLimitResult:
+        """``check`` that keeps shared-store round trips off the event loop"""
+        if not self.ips.blocking:
+            return self.check(token, ip)
+        return await asyncio.get_running_loop().run_in_executor(None, self.check, token, ip)
+
+    async def _sweep_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await loop.run_in_executor(None, self.sweep)
+            except Exception as e:
+                logger.warning(f"Rate limit sweep failed: {e}")
+
+    async def _sync_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await loop.run_in_executor(None, self.sync)
+            except Exception as e:
+                logger.warning(f"Rate limit sync failed: {e}")
+
+    def sync(self) -> None:
+        self.tokens.sync()
+        self.ips.sync()
+
+    def sweep(self) -> None:
+        dropped = self.tokens.sweep() + self.ips.sweep()
+        if dropped:
+            logger.debug(f"Dropped {dropped} idle rate limit keys")
+
+    def start(self) -> None:
+        if self._sweep_task is None:
+            self._sweep_task = asyncio.create_task(self._sweep_loop())
+        if self._sync_task is None and self.ips.store is not None and not self.ips.blocking:
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self) -> None:
+        if self._sweep_task is not None:
+            self._sweep_task.cancel()
+            self._sweep_task = None
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            self._sync_task = None
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {"token": self.tokens.stats(), "ip": self.ips.stats()}
@@ -0,0 +1,122 @@
+"""
+Model Routing Index
+Constant-time model id -> provider resolution built from every provider's model list
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+# Deployment tags that do not change which model is served
+_TAG_SUFFIX = re.compile(r":(free|latest|beta|extended|online|nitro)$")
+
+# Shortest hyphen-prefix registered in the prefix table ("llama-3.3", "gpt-4o", ...)
+_MIN_PREFIX_SEGMENTS = 2
+
+EXACT, ALIAS, PREFIX = 0, 1, 2
+
+# Response header naming the provider and model a chat request was actually served by
+RESOLVED_MODEL_HEADER = "X-Resolved-Model"
+
+
+class Route(NamedTuple):
+    """A provider able to serve a request, and the model id that provider expects"""
+    provider: str
+    model: str
+    match: int = EXACT
+
+
+def normalize_model(model_id: str) -> str:
+    """Canonical alias of a model id: lowercase, no vendor path, no deployment tag"""
+    name = model_id.strip().lower()
+    name = name.rsplit("/", 1)[-1]
+    return _TAG_SUFFIX.sub("", name)
+
+
+def _prefixes(alias: str) -> Iterable[str]:
+    """Hyphen-boundary prefixes of an alias, longest first"""
+    parts = alias.split("-")
+    for end in range(len(parts) - 1, _MIN_PREFIX_SEGMENTS - 1, -1):
+        yield "-".join(parts[:end])
+
+
+class ModelRouter:
+    """
+    Routing index over ``AVAILABLE_MODELS`` of all providers.
+
+    Hash tables are consulted in order: exact model id, then normalized alias
+    (``meta-llama/Llama-3.3-70B-Instruct`` == ``@cf/meta/llama-3.3-70b-instruct``). With
+    ``prefix_matching``, hyphen prefixes come last (``llama-3.3-70b`` ->
+    ``llama-3.3-70b-versatile``); those resolve to a different variant of the model, so
+    they are off unless a deployment opts in. Every lookup is a bounded number of dict
+    probes, independent of how many models are registered.
+    """
+
+    def __init__(self, prefix_matching: bool = False):
+        self.prefix_matching = prefix_matching
+        self._exact: Dict[str, List[Route]] = {}
+        self._alias: Dict[str, List[Route]] = {}
+        self._prefix: Dict[str, List[Route]] = {}
+        self.providers: Dict[str, Tuple[str, ...]] = {}
+
+    @staticmethod
+    def _add(table: Dict[str, List[Route]], key: str, route: Route) -> None:
+        routes = table.setdefault(key, [])
+        if not any(r.provider == route.provider for r in routes):
+            routes.append(route)
+
+    def add(self, provider_name: str, models: Iterable[str]) -> None:
+        """Register every model a provider serves"""
+        models = tuple(m for m in models if m and isinstance(m, str))
+        self.providers[provider_name] = models
+        for model in models:
+            self._add(self._exact, model, Route(provider_name, model, EXACT))
+            alias = normalize_model(model)
+            self._add(self._alias, alias, Route(provider_name, model, ALIAS))
+            if not self.prefix_matching:
+                continue
+            for prefix in _prefixes(alias):
+                self._add(self._prefix, prefix, Route(provider_name, model, PREFIX))
+
+    @classmethod
+    def from_mapping(cls, provider_models: Dict[str, Iterable[str]], prefix_matching: bool = False) -> "ModelRouter":
+        router = cls(prefix_matching)
+        for provider_name, models in provider_models.items():
+            router.add(provider_name, models)
+        return router
+
+    def resolve(self, model_id: str) -> List[Route]:
+        """
+        All providers that can serve ``model_id``, best match first.
+
+        Exact matches rank above alias matches, which rank above prefix matches (when
+        enabled); within a tier providers keep registration order. An empty list means
+        no provider advertises the model.
+        """
+        routes: List[Route] = []
+        seen = set()
+
+        def extend(candidates: Optional[List[Route]]) -> None:
+            for route in candidates or ():
+                if route.provider not in seen:
+                    seen.add(route.provider)
+                    routes.append(route)
+
+        extend(self._exact.get(model_id))
+        alias = normalize_model(model_id)
+        extend(self._alias.get(alias))
+        if not self.prefix_matching:
+            return routes
+        # Variants published under a longer id ("llama-3.3-70b" -> "llama-3.3-70b-versatile")
+        extend(self._prefix.get(alias))
+        if not routes:
+            # Longer request id than any registered model ("gpt-4o-2024-08-06")
+            for prefix in _prefixes(alias):
+                extend(self._alias.get(prefix))
+                if routes:
+                    break
+        return routes
+
+    def providers_for(self, model_id: str) -> List[str]:
+        """Ranked provider names for ``model_id``"""
+        return [route.provider for route in self.resolve(model_id)]
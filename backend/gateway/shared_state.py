@@ -0,0 +1,244 @@
+"""
+Shared Gateway State
+Key-value store for state that every worker process must see (catalog, health, limits, cache)
+"""
+
+import abc
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SharedStore(abc.ABC):
+    """
+    Minimal JSON key-value interface with TTLs.
+
+    ``transact`` is the one primitive that must be atomic across workers: it applies
+    ``fn(current) -> (new_value, result)`` as a single read-modify-write.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Any:
+        """Value of ``key``, or None if it is missing or expired"""
+
+    @abc.abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``, expiring after ``ttl`` seconds if given"""
+
+    @abc.abstractmethod
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Set ``key`` only if it does not exist; True if this call set it"""
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove ``key`` if present"""
+
+    @abc.abstractmethod
+    def transact(self, key: str, fn: Callable[[Any], Tuple[Any, Any]], ttl: Optional[float] = None) -> Any:
+        """Atomically replace ``key`` with ``fn(current)[0]`` and return ``fn(current)[1]``"""
+
+    def incr(self, key: str, amount: float = 1, ttl: Optional[float] = None) -> float:
+        return self.transact(key, lambda current: ((current or 0) + amount,) * 2, ttl)
+
+    @property
+    def shared(self) -> bool:
+        """Whether other processes see writes made through this store"""
+        return True
+
+
+class MemoryStore(SharedStore):
+    """Process-local store for single-worker deployments"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key: str) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires = item
+        if expires is not None and expires <= time.time():
+            del self._data[key]
+            return None
+        return value
+
+    @staticmethod
+    def _expiry(ttl: Optional[float]) -> Optional[float]:
+        return time.time() + ttl if ttl else None
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            return self._live(key)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._data[key] = (value, self._expiry(ttl))
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        with self._lock:
+            if self._live(key) is not None:
+                return False
+            self._data[key] = (value, self._expiry(ttl))
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def transact(self, key: str, fn: Callable[[Any], Tuple[Any, Any]], ttl: Optional[float] = None) -> Any:
+        with self._lock:
+            new_value, result = fn(self._live(key))
+            self._data[key] = (new_value, self._expiry(ttl))
+            return result
+
+    @property
+    def shared(self) -> bool:
+        return False
+
+
+class SQLiteStore(SharedStore):
+    """Store backed by a WAL-mode SQLite file shared by all workers on one host"""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _expiry(ttl: Optional[float]) -> Optional[float]:
+        return time.time() + ttl if ttl else None
+
+    def _read(self, conn: sqlite3.Connection, key: str) -> Any:
+        row = conn.execute("SELECT value, expires FROM kv WHERE key = ?", (key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return json.loads(row[0])
+
+    def get(self, key: str) -> Any:
+        return self._read(self._connect(), key)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._connect().execute(
+            "INSERT OR REPLACE INTO kv (key, value, expires) VALUES (?, ?, ?)",
+            (key, json.dumps(value), self._expiry(ttl))
+        )
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        return self.transact(
+            key, lambda current: (value, True) if current is None else (current, False), ttl
+        )
+
+    def delete(self, key: str) -> None:
+        self._connect().execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    def transact(self, key: str, fn: Callable[[Any], Tuple[Any, Any]], ttl: Optional[float] = None) -> Any:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT value, expires FROM kv WHERE key = ?", (key,)).fetchone()
+            live = row is not None and (row[1] is None or row[1] > time.time())
+            current = json.loads(row[0]) if live else None
+            new_value, result = fn(current)
+            # A refused add() keeps the existing expiry
+            expires = row[1] if live and new_value is current else self._expiry(ttl)
+            conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires) VALUES (?, ?, ?)",
+                (key, json.dumps(new_value), expires)
+            )
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def sweep(self) -> None:
+        """Drop expired keys"""
+        self._connect().execute("DELETE FROM kv WHERE expires IS NOT NULL AND expires <= ?", (time.time(),))
+
+
+class RedisStore(SharedStore):
+    """Store backed by Redis, for workers spread over several hosts"""
+
+    def __init__(self, url: str, prefix: str = "webscout:"):
+        import redis  # optional dependency
+
+        self._redis = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}{key}"
+
+    @staticmethod
+    def _px(ttl: Optional[float]) -> Optional[int]:
+        return int(ttl * 1000) if ttl else None
+
+    def get(self, key: str) -> Any:
+        raw = self._redis.get(self._key(key))
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._redis.set(self._key(key), json.dumps(value), px=self._px(ttl))
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        return bool(self._redis.set(self._key(key), json.dumps(value), px=self._px(ttl), nx=True))
+
+    def delete(self, key: str) -> None:
+        self._redis.delete(self._key(key))
+
+    def transact(self, key: str, fn: Callable[[Any], Tuple[Any, Any]], ttl: Optional[float] = None) -> Any:
+        import redis
+
+        name = self._key(key)
+        with self._redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(name)
+                    raw = pipe.get(name)
+                    new_value, result = fn(json.loads(raw) if raw is not None else None)
+                    pipe.multi()
+                    pipe.set(name, json.dumps(new_value), px=self._px(ttl))
+                    pipe.execute()
+                    return result
+                except redis.WatchError:
+                    continue
+
+
+def create_store(url: Optional[str], data_dir: str, workers: int = 1) -> SharedStore:
+    """
+    Pick the shared-state backend for this deployment.
+
+    ``redis://`` / ``rediss://`` URLs use Redis; ``sqlite:///path`` uses that file. With
+    no URL, multi-worker deployments share a SQLite file under ``data_dir`` and a single
+    worker keeps everything in memory.
+    """
+    if url:
+        if url.startswith(("redis://", "rediss://", "unix://")):
+            return RedisStore(url)
+        if url.startswith("sqlite:///"):
+            return SQLiteStore(url[len("sqlite:///"):])
+        if url == "memory://":
+            return MemoryStore()
+        raise ValueError(f"Unsupported shared state URL: {url}")
+    if workers > 1:
+        return SQLiteStore(os.path.join(data_dir, "gateway_state.db"))
+    return MemoryStore()
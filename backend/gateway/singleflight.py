@@ -0,0 +1,216 @@
+"""
+Request Coalescing
+Identical in-flight requests share one upstream call (single-flight)
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Mapping, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Requests with a non-zero temperature only share an upstream call when the client sends
+# ``X-Request-Coalesce: on``; otherwise each gets its own sample
+OPT_IN_HEADER = "x-request-coalesce"
+_ON = frozenset(("on", "true", "1", "yes"))
+
+
+def coalescing_allowed(params: Dict[str, Any], headers: Optional[Mapping[str, str]] = None) -> bool:
+    """Whether a request may share an upstream call: greedy sampling or an explicit opt-in"""
+    if params.get("temperature") == 0:
+        return True
+    value = (headers or {}).get(OPT_IN_HEADER)
+    return value is not None and value.strip().lower() in _ON
+
+
+class _Cursor:
+    __slots__ = ("index",)
+
+    def __init__(self, index: int = 0):
+        self.index = index
+
+
+class _Broadcast:
+    """
+    One upstream stream fanned out to any number of subscribers.
+
+    The whole stream is kept from its first item, for late subscribers, until
+    ``max_buffer`` items are held. Only then are items every subscriber has read
+    dropped (and the stream stops taking subscribers); while the slowest subscriber is
+    still ``max_buffer`` items behind, the pump waits, so the upstream is read no faster
+    than that subscriber reads.
+    """
+
+    def __init__(self, max_buffer: int):
+        self.max_buffer = max(1, max_buffer)
+        self.items: Deque[Any] = deque()
+        self.base = 0  # index of items[0] in the stream
+        self.cursors: Set[_Cursor] = set()
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.opened = asyncio.Event()
+        self.open_error: Optional[BaseException] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def joinable(self) -> bool:
+        """A new subscriber can still receive the stream from its first item"""
+        return self.base == 0 and not self.done
+
+    async def push(self, item: Any) -> None:
+        while len(self.items) >= self.max_buffer and self.cursors:
+            self.trim()
+            if len(self.items) < self.max_buffer:
+                break
+            await self.wait()
+        self.items.append(item)
+        self._notify()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.error = error
+        self.done = True
+        self._notify()
+
+    def trim(self) -> None:
+        """Drop the items every subscriber has read"""
+        low = min((c.index for c in self.cursors), default=self.base + len(self.items))
+        if low > self.base:
+            for _ in range(low - self.base):
+                self.items.popleft()
+            self.base = low
+            self._notify()
+
+    def advanced(self) -> None:
+        """A subscriber read an item or left; wake the pump if it waits for room"""
+        if len(self.items) >= self.max_buffer:
+            self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self) -> None:
+        await self._changed.wait()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical requests.
+
+    ``run`` shares one awaited result; ``stream`` shares one upstream stream. A
+    subscriber that joins late first receives everything from the first item, so a stream
+    takes new subscribers until its bounded buffer overflows and drops that item;
+    after that an identical request opens its own flight. Flights are forgotten as soon
+    as they finish, so this never serves stale results; repeated requests over time are
+    the response cache's job. Callers decide which requests may share with
+    ``coalescing_allowed``.
+    """
+
+    def __init__(self, max_buffer: int = 64):
+        self.max_buffer = max_buffer
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._streams: Dict[str, _Broadcast] = {}
+        self.coalesced = 0
+
+    async def run(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``func()``, or the identical call already in flight"""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._forget(self._calls, key, task))
+        else:
+            self.coalesced += 1
+        # A disconnecting caller must not cancel the call other callers are waiting on
+        return await asyncio.shield(task)
+
+    async def stream(self, key: str, open_stream: Callable[[], Awaitable[AsyncIterator[Any]]]) -> AsyncIterator[Any]:
+        """
+        Subscribe to the upstream stream for ``key``, opening it if needed.
+
+        Errors raised while opening (unknown provider, construction failure) are raised
+        here, before any event is sent, exactly as without coalescing.
+        """
+        flight = self._streams.get(key)
+        if flight is None or not flight.joinable:
+            flight = _Broadcast(self.max_buffer)
+            self._streams[key] = flight
+            flight.task = asyncio.ensure_future(self._pump(key, flight, open_stream))
+        else:
+            self.coalesced += 1
+        cursor = _Cursor(flight.base)
+        flight.cursors.add(cursor)
+        try:
+            await flight.opened.wait()
+        except BaseException:
+            self._leave(flight, cursor)
+            raise
+        if flight.open_error is not None:
+            flight.cursors.discard(cursor)
+            raise flight.open_error
+        return self._subscribe(flight, cursor)
+
+    async def _pump(self, key: str, flight: _Broadcast, open_stream: Callable[[], Awaitable[AsyncIterator[Any]]]) -> None:
+        error: Optional[BaseException] = None
+        source = None
+        try:
+            try:
+                source = await open_stream()
+            except Exception as e:
+                flight.open_error = e
+                raise
+            finally:
+                flight.opened.set()
+            async for item in source:
+                await flight.push(item)
+        except asyncio.CancelledError:
+            error = asyncio.CancelledError()
+            raise
+        except Exception as e:
+            error = e
+        finally:
+            # Whatever ends the pump, subscribers see the stream end
+            flight.finish(error)
+            self._forget(self._streams, key, flight)
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    async def _subscribe(self, flight: _Broadcast, cursor: _Cursor) -> AsyncIterator[Any]:
+        try:
+            while True:
+                if cursor.index < flight.base + len(flight.items):
+                    item = flight.items[cursor.index - flight.base]
+                    cursor.index += 1
+                    flight.advanced()
+                    yield item
+                elif flight.done:
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+                else:
+                    await flight.wait()
+        finally:
+            self._leave(flight, cursor)
+
+    @staticmethod
+    def _leave(flight: _Broadcast, cursor: _Cursor) -> None:
+        flight.cursors.discard(cursor)
+        flight.advanced()
+        if not flight.cursors and not flight.done and flight.task is not None:
+            # Every client went away; stop pulling from the upstream
+            flight.task.cancel()
+
+    @staticmethod
+    def _forget(table: Dict[str, Any], key: str, value: Any) -> None:
+        if table.get(key) is value:
+            del table[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight_calls": len(self._calls),
+            "in_flight_streams": len(self._streams),
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,270 @@
+"""
+Server-Sent Events helpers
+Turns provider chunk streams into OpenAI-style text/event-stream responses
+"""
+
+import json
+import re
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi.responses import StreamingResponse
+
+from gateway.coalesce import coalesce_deltas
+
+try:
+    import orjson
+except ImportError:  # listed in requirements.txt; json keeps the helpers usable without it
+    orjson = None
+
+# Types orjson would render differently from ``json.dumps(default=str)`` go to the fallback
+_ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS) if orjson else 0
+
+
+# Headers that stop proxies (nginx, Render's edge) from buffering the stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+DONE_EVENT = b"data: [DONE]\n\n"
+
+# Control characters except \t, \n and \r
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+
+_FINISH = {
+    None: b',"finish_reason":null}]}\n\n',
+    "stop": b',"finish_reason":"stop"}]}\n\n',
+}
+
+_CHUNK_KEYS = frozenset(("id", "object", "created", "model", "choices", "system_fingerprint", "usage"))
+_CHOICE_KEYS = frozenset(("index", "delta", "finish_reason", "logprobs"))
+_DELTA_KEYS = frozenset(("role", "content"))
+
+
+def dumps(data: Any) -> bytes:
+    """Compact UTF-8 JSON; orjson when installed, ``json`` for types orjson rejects
+
+    Both produce the same bytes, except that orjson writes very small floats without an
+    exponent (``0.00001``) and NaN/Infinity as ``null``.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def clean_text(text: Any) -> Any:
+    """Remove null bytes and control characters except newlines and tabs"""
+    if not isinstance(text, str):
+        return text
+    return _CONTROL_CHARS.sub("", text)
+
+
+def format_event(data: Any) -> bytes:
+    """Encode one SSE data event"""
+    return b"data: " + dumps(data) + b"\n\n"
+
+
+def error_event(message: str) -> bytes:
+    """Encode the event that ends a stream which failed after it started"""
+    return format_event({
+        "error": {
+            "message": clean_text(message),
+            "type": "server_error",
+            "code": "streaming_error"
+        }
+    })
+
+
+def _dump(chunk: Any) -> Any:
+    if hasattr(chunk, "model_dump"):  # Pydantic v2
+        return chunk.model_dump(exclude_none=True)
+    if hasattr(chunk, "dict"):  # Pydantic v1
+        return chunk.dict(exclude_none=True)
+    return chunk
+
+
+class ChunkEncoder:
+    """
+    Per-stream ``chat.completion.chunk`` encoder.
+
+    The envelope (``id``, ``created``, ``model``) is rendered once, from the constructor
+    arguments or else the first chunk, and every event after that only serializes its
+    delta. Chunks of the common shape (a single choice at index 0 whose delta holds only
+    ``role``/``content``) are read attribute by attribute instead of being dumped through
+    pydantic; tool calls, usage and multi-choice chunks take the full dump, with the
+    envelope fields made consistent with the rest of the stream.
+    """
+
+    def __init__(self, request_id: Optional[str] = None, model: Optional[str] = None,
+                 created: Optional[int] = None):
+        self.request_id = request_id
+        self.model = model
+        self.created = created
+        self._prefix: Optional[bytes] = None
+
+    def _bind(self, chunk_id: Any = None, created: Any = None, model: Any = None) -> bytes:
+        if self._prefix is None:
+            self.request_id = self.request_id or chunk_id or f"chatcmpl-{uuid.uuid4()}"
+            self.created = self.created or created or int(time.time())
+            self.model = self.model or model or "unknown"
+            envelope = dumps({
+                "id": self.request_id,
+                "object": "chat.completion.chunk",
+                "created": self.created,
+                "model": self.model,
+            })
+            self._prefix = b"data: " + envelope[:-1] + b',"choices":[{"index":0,"delta":'
+        return self._prefix
+
+    def delta(self, delta: Dict[str, Any], finish_reason: Optional[str] = None) -> bytes:
+        """Encode one event carrying ``delta``"""
+        finish = _FINISH.get(finish_reason) or b',"finish_reason":' + dumps(finish_reason) + b"}]}\n\n"
+        return self._bind() + dumps(delta) + finish
+
+    def text(self, content: str) -> bytes:
+        """Encode a plain text delta"""
+        return self._bind() + b'{"content":' + dumps(content) + b"}" + _FINISH[None]
+
+    def encode(self, chunk: Any) -> Tuple[bytes, Optional[str]]:
+        """Encode a provider chunk; returns the event and its cleaned text content"""
+        fields = self._simple(chunk)
+        if fields is not None:
+            chunk_id, created, model, role, content, finish_reason = fields
+            delta: Dict[str, Any] = {}
+            if role is not None:
+                delta["role"] = role
+            if content is not None:
+                content = delta["content"] = clean_text(content)
+            self._bind(chunk_id, created, model)
+            return self.delta(delta, finish_reason), content
+        return self._encode_full(_dump(chunk))
+
+    def content_of(self, chunk: Any) -> Optional[str]:
+        """Text of a content-only delta chunk (no role or finish reason), else ``None``"""
+        fields = self._simple(chunk)
+        if fields is None or fields[3] is not None or fields[5] is not None:
+            return None
+        return fields[4]
+
+    def merge(self, chunks: List[Any]) -> Dict[str, Any]:
+        """One content-only chunk carrying the text of ``chunks``, for coalescing"""
+        text = "".join(self.content_of(chunk) or "" for chunk in chunks)
+        return {"choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}]}
+
+    def _simple(self, chunk: Any) -> Optional[tuple]:
+        """Envelope, role, content and finish reason of a common-shape chunk, else ``None``"""
+        if isinstance(chunk, dict):
+            if not _CHUNK_KEYS.issuperset(chunk) or chunk.get("usage") or chunk.get("system_fingerprint"):
+                return None
+            choices = chunk.get("choices")
+            if not isinstance(choices, list) or len(choices) != 1:
+                return None
+            choice = choices[0]
+            if (not isinstance(choice, dict) or not _CHOICE_KEYS.issuperset(choice)
+                    or choice.get("index", 0) != 0 or choice.get("logprobs") is not None):
+                return None
+            delta = choice.get("delta")
+            if not isinstance(delta, dict) or not _DELTA_KEYS.issuperset(delta):
+                return None
+            if not isinstance(delta.get("content", ""), (str, type(None))):
+                return None
+            return (chunk.get("id"), chunk.get("created"), chunk.get("model"),
+                    delta.get("role"), delta.get("content"), choice.get("finish_reason"))
+
+        choices = getattr(chunk, "choices", None)
+        if (not isinstance(choices, list) or len(choices) != 1
+                or getattr(chunk, "usage", None) is not None
+                or getattr(chunk, "system_fingerprint", None) is not None):
+            return None
+        choice = choices[0]
+        delta = getattr(choice, "delta", None)
+        if (delta is None or getattr(choice, "index", 0) != 0
+                or getattr(choice, "logprobs", None) is not None
+                or getattr(delta, "tool_calls", None) is not None
+                or getattr(delta, "function_call", None) is not None):
+            return None
+        content = getattr(delta, "content", None)
+        if content is not None and not isinstance(content, str):
+            return None
+        return (getattr(chunk, "id", None), getattr(chunk, "created", None), getattr(chunk, "model", None),
+                getattr(delta, "role", None), content, getattr(choice, "finish_reason", None))
+
+    def _encode_full(self, data: Any) -> Tuple[bytes, Optional[str]]:
+        content = None
+        if isinstance(data, dict) and "choices" in data:
+            self._bind(data.get("id"), data.get("created"), data.get("model"))
+            data["id"], data["created"], data["model"] = self.request_id, self.created, self.model
+            for choice in data.get("choices") or []:
+                if not isinstance(choice, dict):
+                    continue
+                body = choice.get("delta") if isinstance(choice.get("delta"), dict) else choice.get("message")
+                if isinstance(body, dict) and "content" in body:
+                    body["content"] = clean_text(body["content"])
+                    content = body["content"]
+        return format_event(data), content
+
+
+def delta_text(chunk: Any) -> Optional[str]:
+    """Extract the text delta from a provider chunk (plain text or raw ``ask`` dict)"""
+    if chunk is None:
+        return None
+    if isinstance(chunk, str):
+        return chunk
+    if isinstance(chunk, bytes):
+        return chunk.decode("utf-8", errors="ignore")
+    if isinstance(chunk, dict):
+        for key in ("text", "content", "message"):
+            value = chunk.get(key)
+            if isinstance(value, str):
+                return value
+        return None
+    return str(chunk)
+
+
+def join_text(chunks: List[Any]) -> str:
+    """Concatenated text deltas of ``chunks``"""
+    return "".join(delta_text(chunk) or "" for chunk in chunks)
+
+
+async def chat_completion_events(
+    chunks: AsyncIterator[Any],
+    model: str,
+    request_id: Optional[str] = None,
+    coalesce_window: float = 0.0,
+    coalesce_max_chars: int = 0
+) -> AsyncIterator[bytes]:
+    """
+    Wrap a provider text stream as OpenAI ``chat.completion.chunk`` events.
+
+    Chunks are pulled one at a time only when the client is ready for the next event,
+    so a slow reader applies backpressure all the way to the provider generator. With a
+    ``coalesce_window`` (seconds), deltas arriving within it are sent as one event.
+    """
+    encoder = ChunkEncoder(request_id, model)
+    chunks = coalesce_deltas(chunks, delta_text, join_text, coalesce_window, coalesce_max_chars)
+
+    try:
+        yield encoder.delta({"role": "assistant", "content": ""})
+        async for chunk in chunks:
+            text = delta_text(chunk)
+            if text:
+                yield encoder.text(text)
+        yield encoder.delta({}, finish_reason="stop")
+    except Exception as e:
+        yield error_event(str(e))
+    finally:
+        aclose = getattr(chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    yield DONE_EVENT
+
+
+def event_stream_response(events: AsyncIterator[bytes]) -> StreamingResponse:
+    """Build an unbuffered text/event-stream response"""
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
@@ -0,0 +1,71 @@
+"""
+Request Phase Timing
+Named per-request phase durations for Server-Timing headers and structured logs
+"""
+
+import random
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator
+
+
+class PhaseTimer:
+    """Accumulates wall-clock time per named phase of one request"""
+
+    enabled = True
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add time to a phase; repeated phases (e.g. per-chunk serialization) accumulate"""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` header value (milliseconds) covering the phases so far"""
+        entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.phases.items()]
+        entries.append(f"total;dur={(time.perf_counter() - self.start) * 1000:.1f}")
+        return ", ".join(entries)
+
+    def record(self, **fields: Any) -> Dict[str, Any]:
+        """Structured log payload: phase and total durations in milliseconds plus ``fields``"""
+        return {
+            **fields,
+            "total_ms": round((time.perf_counter() - self.start) * 1000, 1),
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+        }
+
+
+class _UnsampledTimer(PhaseTimer):
+    """Stand-in for requests outside the sample: records nothing"""
+
+    enabled = False
+
+    def __init__(self):
+        self.start = 0.0
+        self.phases = {}
+
+    def phase(self, name: str):
+        return nullcontext()
+
+    def add(self, name: str, seconds: float) -> None:
+        pass
+
+
+_UNSAMPLED = _UnsampledTimer()
+
+
+def sample_timer(rate: float) -> PhaseTimer:
+    """A live timer for a ``rate`` fraction of requests, a no-op one otherwise"""
+    if rate >= 1.0 or (rate > 0.0 and random.random() < rate):
+        return PhaseTimer()
+    return _UNSAMPLED
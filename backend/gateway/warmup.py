@@ -0,0 +1,163 @@
+"""
+Provider Warm-up
+Pre-imports, pre-constructs and pre-connects the busiest providers after boot
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Instance attributes providers use for their upstream endpoint
+_ENDPOINT_ATTRS = ("chat_endpoint", "api_endpoint", "url", "base_url", "BASE_URL")
+
+
+class TrafficStats:
+    """Decaying per-provider request counts, persisted so rankings survive restarts"""
+
+    def __init__(self, path: Optional[str] = None, half_life: float = 86400.0):
+        self.path = path
+        self.half_life = half_life
+        self._counts: Dict[str, float] = {}
+        self._models: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider_name: str, model: Optional[str] = None) -> None:
+        with self._lock:
+            self._counts[provider_name] = self._counts.get(provider_name, 0.0) + 1.0
+            if model:
+                self._models[provider_name] = model
+
+    def top(self, n: int) -> List[Tuple[str, Optional[str]]]:
+        """The ``n`` busiest providers with the model they were last used with"""
+        with self._lock:
+            ranked = sorted(self._counts.items(), key=lambda item: item[1], reverse=True)
+            return [(name, self._models.get(name)) for name, _ in ranked[:n]]
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable traffic stats {self.path}: {e}")
+            return
+        age = max(0.0, time.time() - data.get("saved_at", time.time()))
+        decay = 0.5 ** (age / self.half_life) if self.half_life else 1.0
+        with self._lock:
+            for name, entry in data.get("providers", {}).items():
+                self._counts[name] = self._counts.get(name, 0.0) + entry.get("count", 0.0) * decay
+                if entry.get("model"):
+                    self._models.setdefault(name, entry["model"])
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                "saved_at": time.time(),
+                "providers": {
+                    name: {"count": round(count, 3), "model": self._models.get(name)}
+                    for name, count in self._counts.items()
+                },
+            }
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to persist traffic stats to {self.path}: {e}")
+
+
+def preconnect(instance: Any, timeout: float = 5.0) -> bool:
+    """Open the provider session's connection (DNS, TCP, TLS) with a cheap HEAD request"""
+    session = getattr(instance, "session", None)
+    head = getattr(session, "head", None)
+    if not callable(head):
+        return False
+    for attr in _ENDPOINT_ATTRS:
+        endpoint = getattr(instance, attr, None)
+        if isinstance(endpoint, str) and endpoint.startswith("http"):
+            parts = urlsplit(endpoint)
+            try:
+                head(f"{parts.scheme}://{parts.netloc}/", timeout=timeout)
+            except Exception:
+                # Any response (or even an HTTP error) still leaves a warm connection
+                pass
+            return True
+    return False
+
+
+class Warmup:
+    """Startup stage that warms the top-N providers in the background"""
+
+    PENDING, WARMING, READY = "pending", "warming", "ready"
+
+    def __init__(
+        self,
+        traffic: TrafficStats,
+        warm_provider: Callable[[str, Optional[str]], None],
+        top_n: int = 5,
+        timeout: float = 30.0,
+        save_interval: float = 300.0
+    ):
+        self.traffic = traffic
+        self.warm_provider = warm_provider
+        self.top_n = top_n
+        self.timeout = timeout
+        self.save_interval = save_interval
+        self.state = self.PENDING
+        self.results: Dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == self.READY
+
+    def _warm_one(self, provider_name: str, model: Optional[str]) -> None:
+        start = time.perf_counter()
+        try:
+            self.warm_provider(provider_name, model)
+            self.results[provider_name] = f"ok in {time.perf_counter() - start:.2f}s"
+        except Exception as e:
+            self.results[provider_name] = f"failed: {getattr(e, 'detail', None) or e}"
+
+    async def _run(self) -> None:
+        targets = self.traffic.top(self.top_n) if self.top_n else []
+        if targets:
+            logger.info(f"Warming providers: {[name for name, _ in targets]}")
+            loop = asyncio.get_running_loop()
+            jobs = [loop.run_in_executor(None, self._warm_one, name, model) for name, model in targets]
+            try:
+                await asyncio.wait_for(asyncio.gather(*jobs), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Provider warm-up exceeded {self.timeout}s; serving anyway")
+        self.state = self.READY
+
+        # Keep the traffic ranking on disk so the next boot warms the right providers
+        while self.save_interval:
+            await asyncio.sleep(self.save_interval)
+            await asyncio.get_running_loop().run_in_executor(None, self.traffic.save)
+
+    def start(self) -> None:
+        """Kick off warm-up without delaying server startup"""
+        self.traffic.load()
+        self.state = self.WARMING
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self.traffic.save()
+
+    def status(self) -> Dict[str, Any]:
+        return {"state": self.state, "providers": dict(self.results)}
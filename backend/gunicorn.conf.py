@@ -0,0 +1,46 @@
+"""
+Gunicorn configuration for multi-worker deployments
+Run with: gunicorn -c gunicorn.conf.py main:app
+"""
+
+import multiprocessing
+import os
+
+# Every worker reads WEB_CONCURRENCY through config.Settings too, which is how the app
+# knows to keep catalog, health, rate-limit and cache state in the shared store.
+os.environ.setdefault("WEB_CONCURRENCY", str(min(multiprocessing.cpu_count() * 2, 8)))
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+workers = int(os.environ["WEB_CONCURRENCY"])
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Streaming completions can legitimately run for minutes
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 300))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then to cap slow leaks in provider libraries
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+loglevel = os.environ.get("LOG_LEVEL", "info")
+
+# With PROMETHEUS_MULTIPROC_DIR set, /metrics merges the samples every worker writes there
+_metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+
+def on_starting(server):
+    """Start from an empty metrics directory; files left by an earlier run would be summed in"""
+    if _metrics_dir:
+        os.makedirs(_metrics_dir, exist_ok=True)
+        for name in os.listdir(_metrics_dir):
+            if name.endswith(".db"):
+                os.remove(os.path.join(_metrics_dir, name))
+
+
+def child_exit(server, worker):
+    """Drop a dead worker's live gauges (in-flight requests) from the merged metrics"""
+    if _metrics_dir:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -3,6 +3,7 @@ Neko-Webscout Full-Stack Backend
 FastAPI server with integrated Webscout AI providers and search capabilities
 """
 
+import hashlib
 import os
 import sys
 from pathlib import Path
@@ -11,17 +12,22 @@ from pathlib import Path
 backend_dir = Path(__file__).parent
 sys.path.insert(0, str(backend_dir))
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 import uvicorn
 
 # Import webscout modules (we'll copy them here)
 from webscout_core import WebscoutAPI
-from providers import get_all_providers
+from providers import get_all_providers, get_import_report
 from auth import AuthManager
 from config import settings
+from gateway import metrics
+from gateway.coalesce import coalescing_requested
+from gateway.ratelimit import ClientRateLimits
+from gateway.routing import RESOLVED_MODEL_HEADER
+from gateway.sse import chat_completion_events, event_stream_response
 
 # Create FastAPI app
 app = FastAPI(
@@ -45,27 +51,163 @@ app.add_middleware(
 # Initialize components
 webscout_api = WebscoutAPI()
 auth_manager = AuthManager()
+metrics.bind(
+    queue_depth=webscout_api.executor.queue_depth,
+    cache_stats=lambda: webscout_api.response_cache.stats() if webscout_api.response_cache is not None else None
+)
+rate_limits = None if settings.NO_RATE_LIMIT else ClientRateLimits(
+    token_rate=settings.RATE_LIMIT_PER_MINUTE,
+    ip_rate=settings.RATE_LIMIT_IP_PER_MINUTE,
+    token_burst=settings.RATE_LIMIT_BURST,
+    store=webscout_api.shared_state,
+    sync_interval=settings.RATE_LIMIT_SYNC_SECONDS
+)
+
+# Never rate limited: liveness probes and API docs
+RATE_LIMIT_EXEMPT = ("/api/health", "/api/docs", "/api/redoc", "/api/openapi.json")
+
+def client_identity(request: Request) -> tuple:
+    """(hashed API token or None, client IP) used as rate limit keys"""
+    token = None
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        # Keys may end up in the shared store; never persist raw tokens there
+        token = hashlib.sha256(authorization[7:].strip().encode()).hexdigest()[:32]
+    ip = request.client.host if request.client else "unknown"
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            ip = forwarded.split(",")[0].strip()
+    return token, ip
+
+@app.middleware("http")
+async def enforce_rate_limits(request: Request, call_next):
+    """Reject clients over their rate limit before they reach a provider"""
+    if rate_limits is None or not request.url.path.startswith("/api/") or request.url.path.startswith(RATE_LIMIT_EXEMPT):
+        return await call_next(request)
+    result = await rate_limits.acheck(*client_identity(request))
+    if not result.allowed:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Rate limit exceeded; retry later"},
+            headers=result.headers
+        )
+    response = await call_next(request)
+    response.headers.update(result.headers)
+    return response
+
+@app.on_event("startup")
+async def start_background_tasks():
+    """Serve the persisted model catalog and warm the busiest providers in the background"""
+    await webscout_api.catalog.start()
+    webscout_api.warmup.start()
+    webscout_api.health.start()
+    if rate_limits is not None:
+        rate_limits.start()
+
+@app.on_event("shutdown")
+async def shutdown_executor():
+    """Stop background work and release the provider thread pool"""
+    await webscout_api.warmup.stop()
+    await webscout_api.catalog.stop()
+    await webscout_api.health.stop()
+    if rate_limits is not None:
+        await rate_limits.stop()
+    await webscout_api.providers.aclose()
+    webscout_api.executor.shutdown()
 
 # API Routes
 @app.get("/api/health")
 async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "service": "neko-webscout-fullstack"}
+    """Health check endpoint
+
+    Answers 503 with ``status: warming`` until provider warm-up finishes, so the load
+    balancer holds traffic until the busiest providers are ready.
+    """
+    if not webscout_api.warmup.ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "warming", "service": "neko-webscout-fullstack", "warmup": webscout_api.warmup.status()}
+        )
+    return {"status": "healthy", "service": "neko-webscout-fullstack", "warmup": webscout_api.warmup.status()}
 
 @app.get("/api/providers")
 async def get_providers():
     """Get all available AI providers"""
     return get_all_providers()
 
+@app.get("/api/providers/imports")
+async def get_provider_import_report():
+    """Which provider modules have been imported so far and what lazy loading deferred"""
+    return get_import_report()
+
+@app.get("/api/providers/pool")
+async def get_provider_pool_stats():
+    """Provider instance pool occupancy and hit/miss/eviction counters"""
+    return webscout_api.providers.stats()
+
+@app.get("/api/providers/load")
+async def get_provider_load():
+    """In-flight calls, queue depth and queue wait times per provider and overall"""
+    return webscout_api.executor.stats()
+
+@app.get("/api/providers/health")
+async def get_provider_health():
+    """Per-provider success/error counts, latency, TTFT and circuit breaker state"""
+    return webscout_api.health.snapshot()
+
+@app.get("/api/ratelimit")
+async def get_rate_limit_stats():
+    """Rate limit settings, tracked keys and allowed/rejected counts"""
+    if rate_limits is None:
+        return {"enabled": False}
+    return {"enabled": True, **rate_limits.stats()}
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus metrics"""
+    return metrics.metrics_response()
+
+@app.get("/api/cache")
+async def get_response_cache_stats():
+    """Response cache occupancy and hit ratio"""
+    if webscout_api.response_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **webscout_api.response_cache.stats()}
+
 @app.get("/api/models")
-async def get_models():
-    """Get all available models from all providers"""
-    return webscout_api.get_available_models()
+async def get_models(request: Request):
+    """Get all available models from all providers
+
+    Served from the precomputed catalog; clients revalidate with ``If-None-Match``.
+    """
+    return await webscout_api.catalog.response(request.headers.get("if-none-match"))
 
 @app.post("/api/chat/completions")
-async def chat_completions(request: dict):
-    """OpenAI-compatible chat completions endpoint"""
-    return await webscout_api.chat_completions(request)
+async def chat_completions(request: dict, http_request: Request, http_response: Response):
+    """OpenAI-compatible chat completions endpoint
+
+    With ``stream=True`` the provider's deltas are relayed as ``text/event-stream``
+    events as the upstream produces them; deltas closer together than
+    ``STREAM_COALESCE_WINDOW_MS`` share an event unless the client sends
+    ``X-Stream-Coalesce: off``. ``X-Resolved-Model`` names the provider and model that
+    served the request.
+    """
+    response = await webscout_api.chat_completions(
+        request, cache_control=http_request.headers.get("cache-control"), headers=http_request.headers,
+        response_headers=http_response.headers
+    )
+    if request.get("stream", False):
+        model = request.get("model", webscout_api.default_provider)
+        window = settings.STREAM_COALESCE_WINDOW_MS / 1000 if coalescing_requested(http_request.headers) else 0.0
+        stream_response = event_stream_response(chat_completion_events(
+            response, model=model,
+            coalesce_window=window, coalesce_max_chars=settings.STREAM_COALESCE_MAX_CHARS
+        ))
+        if RESOLVED_MODEL_HEADER in http_response.headers:
+            stream_response.headers[RESOLVED_MODEL_HEADER] = http_response.headers[RESOLVED_MODEL_HEADER]
+        return stream_response
+    return response
 
 @app.get("/api/search")
 async def web_search(q: str, engine: str = "google", max_results: int = 10):
@@ -137,5 +279,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=port,
         reload=False,
+        workers=settings.WEB_CONCURRENCY,
         log_level="info"
     )
@@ -2,7 +2,7 @@ import json
 import time
 import uuid
 import re
-from typing import List, Dict, Optional, Union, Generator, Any
+from typing import List, Dict, Optional, Union, Generator, Any, AsyncIterator
 
 from curl_cffi import CurlError
 from curl_cffi.requests import Session
@@ -19,6 +19,8 @@ from webscout.AIutel import sanitize_stream
 from webscout.litagent import LitAgent
 
 class Completions(BaseCompletions):
+    native_async = True
+
     def __init__(self, client: 'Cloudflare'):
         self._client = client
     
@@ -51,14 +53,7 @@ class Completions(BaseCompletions):
             If stream=False, returns a ChatCompletion object
             If stream=True, returns a Generator yielding ChatCompletionChunk objects
         """
-        # Prepare the payload
-        payload = {
-            "messages": messages,
-            "lora": None,
-            "model": model,
-            "max_tokens": max_tokens or 600,
-            "stream": True  # Always use streaming API
-        }
+        payload = self._payload(model, messages, max_tokens)
         
         # Generate request ID and timestamp
         request_id = str(uuid.uuid4())
@@ -84,6 +79,56 @@ class Completions(BaseCompletions):
             timeout=timeout,
             proxies=proxies
         )
+
+    async def acreate(
+        self,
+        *,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None,
+        stream: bool = False,
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        timeout: Optional[int] = None,
+        proxies: Optional[dict] = None,
+        **kwargs: Any
+    ) -> Union[ChatCompletion, AsyncIterator[ChatCompletionChunk]]:
+        """
+        Async version of create, served on the client's shared AsyncSession.
+        
+        Takes the same arguments; with stream=True returns an async iterator
+        of ChatCompletionChunk objects.
+        """
+        payload = self._payload(model, messages, max_tokens)
+        request_id = str(uuid.uuid4())
+        created_time = int(time.time())
+        
+        chunks = self._acreate_streaming(
+            request_id=request_id,
+            created_time=created_time,
+            model=model,
+            payload=payload,
+            timeout=timeout,
+            proxies=proxies
+        )
+        if stream:
+            return chunks
+        
+        # Non-streaming also uses the streaming API; collect the content
+        full_content = ""
+        async for chunk in chunks:
+            full_content += chunk.choices[0].delta.content or ""
+        return self._completion(request_id, created_time, model, payload, full_content)
+    
+    @staticmethod
+    def _payload(model: str, messages: List[Dict[str, str]], max_tokens: Optional[int]) -> Dict[str, Any]:
+        return {
+            "messages": messages,
+            "lora": None,
+            "model": model,
+            "max_tokens": max_tokens or 600,
+            "stream": True  # Always use streaming API
+        }
     
     def _create_streaming(
         self,
@@ -167,6 +212,59 @@ class Completions(BaseCompletions):
             if proxies is not None:
                 self._client.session.proxies = original_proxies
     
+    async def _acreate_streaming(
+        self,
+        *,
+        request_id: str,
+        created_time: int,
+        model: str,
+        payload: Dict[str, Any],
+        timeout: Optional[int] = None,
+        proxies: Optional[dict] = None
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        """Async implementation for streaming chat completions."""
+        try:
+            async with self._client.async_session().stream(
+                "POST",
+                self._client.chat_endpoint,
+                headers=self._client.headers,
+                cookies=self._client.cookies,
+                data=json.dumps(payload),
+                timeout=timeout if timeout is not None else self._client.timeout,
+                proxies=proxies,
+                impersonate="chrome120"
+            ) as response:
+                response.raise_for_status()
+                
+                async for line in response.aiter_lines():
+                    if isinstance(line, bytes):
+                        line = line.decode("utf-8", errors="replace")
+                    content_chunk = self._cloudflare_extractor(line)
+                    if content_chunk:
+                        delta = ChoiceDelta(content=content_chunk)
+                        choice = Choice(index=0, delta=delta, finish_reason=None)
+                        yield ChatCompletionChunk(
+                            id=request_id,
+                            choices=[choice],
+                            created=created_time,
+                            model=model
+                        )
+            
+            # Final chunk with finish_reason
+            delta = ChoiceDelta(content=None)
+            choice = Choice(index=0, delta=delta, finish_reason="stop")
+            yield ChatCompletionChunk(
+                id=request_id,
+                choices=[choice],
+                created=created_time,
+                model=model
+            )
+            
+        except CurlError as e:
+            raise IOError(f"Cloudflare streaming request failed (CurlError): {e}") from e
+        except Exception as e:
+            raise IOError(f"Cloudflare streaming request failed: {e}") from e
+    
     def _create_non_streaming(
         self,
         *,
@@ -208,38 +306,7 @@ class Completions(BaseCompletions):
                 if content_chunk and isinstance(content_chunk, str):
                     full_content += content_chunk
             
-            # Create the completion message
-            message = ChatCompletionMessage(
-                role="assistant",
-                content=full_content
-            )
-            
-            # Create the choice
-            choice = Choice(
-                index=0,
-                message=message,
-                finish_reason="stop"
-            )
-            
-            # Estimate token usage using count_tokens
-            prompt_tokens = count_tokens([msg.get("content", "") for msg in payload["messages"]])
-            completion_tokens = count_tokens(full_content)
-            usage = CompletionUsage(
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                total_tokens=prompt_tokens + completion_tokens
-            )
-            
-            # Create the completion object
-            completion = ChatCompletion(
-                id=request_id,
-                choices=[choice],
-                created=created_time,
-                model=model,
-                usage=usage,
-            )
-            
-            return completion
+            return self._completion(request_id, created_time, model, payload, full_content)
             
         except CurlError as e:
             raise IOError(f"Cloudflare request failed (CurlError): {e}") from e
@@ -249,6 +316,44 @@ class Completions(BaseCompletions):
             if proxies is not None:
                 self._client.session.proxies = original_proxies
     
+    @staticmethod
+    def _completion(
+        request_id: str, created_time: int, model: str, payload: Dict[str, Any], full_content: str
+    ) -> ChatCompletion:
+        """Build the ChatCompletion for the collected content."""
+        # Create the completion message
+        message = ChatCompletionMessage(
+            role="assistant",
+            content=full_content
+        )
+        
+        # Create the choice
+        choice = Choice(
+            index=0,
+            message=message,
+            finish_reason="stop"
+        )
+        
+        # Estimate token usage using count_tokens
+        prompt_tokens = count_tokens([msg.get("content", "") for msg in payload["messages"]])
+        completion_tokens = count_tokens(full_content)
+        usage = CompletionUsage(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens
+        )
+        
+        # Create the completion object
+        completion = ChatCompletion(
+            id=request_id,
+            choices=[choice],
+            created=created_time,
+            model=model,
+            usage=usage,
+        )
+        
+        return completion
+    
     @staticmethod
     def _cloudflare_extractor(chunk: Union[str, Dict[str, Any]]) -> Optional[str]:
         """
@@ -1,7 +1,7 @@
-from typing import List, Dict, Optional, Union, Generator, Any
+from typing import List, Dict, Optional, Union, Generator, Any, AsyncIterator
 
-from webscout.Provider.OPENAI.base import OpenAICompatibleProvider, BaseChat, BaseCompletions
-from webscout.Provider.OPENAI.utils import (
+from .base import OpenAICompatibleProvider, BaseChat, BaseCompletions, aiter_sse_data
+from .utils import (
     ChatCompletionChunk, ChatCompletion, Choice, ChoiceDelta,
     ChatCompletionMessage, CompletionUsage, count_tokens
 )
@@ -13,6 +13,8 @@ import json
 from webscout.litagent import LitAgent
 
 class Completions(BaseCompletions):
+    native_async = True
+
     def __init__(self, client: 'TogetherAI'):
         self._client = client
 
@@ -41,8 +43,55 @@ class Completions(BaseCompletions):
             self._client.session.headers.update(self._client.headers)
 
         model_name = self._client.convert_model_name(model)
+        payload = self._payload(model_name, messages, max_tokens, stream, temperature, top_p, stop, kwargs)
+
+        request_id = f"chatcmpl-{uuid.uuid4()}"
+        created_time = int(time.time())
+
+        if stream:
+            return self._create_stream(request_id, created_time, model_name, payload, timeout, proxies)
+        else:
+            return self._create_non_stream(request_id, created_time, model_name, payload, timeout, proxies)
+
+    async def acreate(
+        self,
+        *,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None,
+        stream: bool = False,
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        timeout: Optional[int] = None,
+        proxies: Optional[Dict[str, str]] = None,
+        stop: Optional[Union[str, List[str]]] = None,
+        **kwargs: Any
+    ) -> Union[ChatCompletion, AsyncIterator[ChatCompletionChunk]]:
+        """
+        Async version of create, served on the client's shared AsyncSession
+        """
+        if not self._client.headers.get("Authorization"):
+            api_key = await self._client.aget_activation_key()
+            self._client.headers["Authorization"] = f"Bearer {api_key}"
+            self._client.session.headers.update(self._client.headers)
+
+        model_name = self._client.convert_model_name(model)
+        payload = self._payload(model_name, messages, max_tokens, stream, temperature, top_p, stop, kwargs)
+
+        request_id = f"chatcmpl-{uuid.uuid4()}"
+        created_time = int(time.time())
+
+        if stream:
+            return self._acreate_stream(request_id, created_time, model_name, payload, timeout, proxies)
+        return await self._acreate_non_stream(request_id, created_time, model_name, payload, timeout, proxies)
+
+    def _payload(
+        self, model: str, messages: List[Dict[str, str]], max_tokens: Optional[int], stream: bool,
+        temperature: Optional[float], top_p: Optional[float], stop: Optional[Union[str, List[str]]],
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
         payload = {
-            "model": model_name,
+            "model": model,
             "messages": messages,
             "stream": stream,
         }
@@ -55,14 +104,7 @@ class Completions(BaseCompletions):
         if stop is not None:
             payload["stop"] = stop
         payload.update(kwargs)
-
-        request_id = f"chatcmpl-{uuid.uuid4()}"
-        created_time = int(time.time())
-
-        if stream:
-            return self._create_stream(request_id, created_time, model_name, payload, timeout, proxies)
-        else:
-            return self._create_non_stream(request_id, created_time, model_name, payload, timeout, proxies)
+        return payload
 
     def _create_stream(
         self, request_id: str, created_time: int, model: str, payload: Dict[str, Any], timeout: Optional[int] = None, proxies: Optional[Dict[str, str]] = None
@@ -77,9 +119,7 @@ class Completions(BaseCompletions):
                 proxies=proxies
             )
             response.raise_for_status()
-            prompt_tokens = count_tokens([msg.get("content", "") for msg in payload.get("messages", [])])
-            completion_tokens = 0
-            total_tokens = prompt_tokens
+            usage = self._usage(payload)
             
             for line in response.iter_lines():
                 if line:
@@ -89,59 +129,97 @@ class Completions(BaseCompletions):
                         if line.strip() == '[DONE]':
                             break
                         try:
-                            chunk_data = json.loads(line)
-                            if 'choices' in chunk_data and chunk_data['choices']:
-                                delta = chunk_data['choices'][0].get('delta', {})
-                                content = delta.get('content')
-                                if content:
-                                    completion_tokens += count_tokens(content)
-                                    total_tokens = prompt_tokens + completion_tokens
-                                    choice_delta = ChoiceDelta(
-                                        content=content,
-                                        role=delta.get('role', 'assistant'),
-                                        tool_calls=delta.get('tool_calls')
-                                    )
-                                    choice = Choice(
-                                        index=0,
-                                        delta=choice_delta,
-                                        finish_reason=None,
-                                        logprobs=None
-                                    )
-                                    chunk = ChatCompletionChunk(
-                                        id=request_id,
-                                        choices=[choice],
-                                        created=created_time,
-                                        model=model
-                                    )
-                                    chunk.usage = {
-                                        "prompt_tokens": prompt_tokens,
-                                        "completion_tokens": completion_tokens,
-                                        "total_tokens": total_tokens,
-                                        "estimated_cost": None
-                                    }
-                                    yield chunk
+                            chunk = self._chunk(json.loads(line), request_id, created_time, model, usage)
                         except Exception:
                             continue
+                        if chunk is not None:
+                            yield chunk
             
-            # Final chunk with finish_reason="stop"
-            delta = ChoiceDelta(content=None, role=None, tool_calls=None)
-            choice = Choice(index=0, delta=delta, finish_reason="stop", logprobs=None)
-            chunk = ChatCompletionChunk(
-                id=request_id,
-                choices=[choice],
-                created=created_time,
-                model=model
-            )
-            chunk.usage = {
-                "prompt_tokens": prompt_tokens,
-                "completion_tokens": completion_tokens,
-                "total_tokens": total_tokens,
-                "estimated_cost": None
-            }
-            yield chunk
+            yield self._final_chunk(request_id, created_time, model, usage)
+        except Exception as e:
+            raise IOError(f"TogetherAI stream request failed: {e}") from e
+
+    async def _acreate_stream(
+        self, request_id: str, created_time: int, model: str, payload: Dict[str, Any], timeout: Optional[int] = None, proxies: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        try:
+            async with self._client.async_session().stream(
+                "POST",
+                self._client.api_endpoint,
+                headers=self._client.headers,
+                json=payload,
+                timeout=timeout or self._client.timeout,
+                proxies=proxies
+            ) as response:
+                response.raise_for_status()
+                usage = self._usage(payload)
+
+                async for data in aiter_sse_data(response):
+                    try:
+                        chunk = self._chunk(data, request_id, created_time, model, usage)
+                    except Exception:
+                        continue
+                    if chunk is not None:
+                        yield chunk
+
+            yield self._final_chunk(request_id, created_time, model, usage)
         except Exception as e:
             raise IOError(f"TogetherAI stream request failed: {e}") from e
 
+    def _usage(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        prompt_tokens = count_tokens([msg.get("content", "") for msg in payload.get("messages", [])])
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": 0,
+            "total_tokens": prompt_tokens,
+            "estimated_cost": None
+        }
+
+    def _chunk(
+        self, chunk_data: Dict[str, Any], request_id: str, created_time: int, model: str, usage: Dict[str, Any]
+    ) -> Optional[ChatCompletionChunk]:
+        """Content chunk for one upstream event, updating the running ``usage``"""
+        if 'choices' not in chunk_data or not chunk_data['choices']:
+            return None
+        delta = chunk_data['choices'][0].get('delta', {})
+        content = delta.get('content')
+        if not content:
+            return None
+        usage["completion_tokens"] += count_tokens(content)
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        choice_delta = ChoiceDelta(
+            content=content,
+            role=delta.get('role', 'assistant'),
+            tool_calls=delta.get('tool_calls')
+        )
+        choice = Choice(
+            index=0,
+            delta=choice_delta,
+            finish_reason=None,
+            logprobs=None
+        )
+        chunk = ChatCompletionChunk(
+            id=request_id,
+            choices=[choice],
+            created=created_time,
+            model=model
+        )
+        chunk.usage = dict(usage)
+        return chunk
+
+    def _final_chunk(self, request_id: str, created_time: int, model: str, usage: Dict[str, Any]) -> ChatCompletionChunk:
+        # Final chunk with finish_reason="stop"
+        delta = ChoiceDelta(content=None, role=None, tool_calls=None)
+        choice = Choice(index=0, delta=delta, finish_reason="stop", logprobs=None)
+        chunk = ChatCompletionChunk(
+            id=request_id,
+            choices=[choice],
+            created=created_time,
+            model=model
+        )
+        chunk.usage = dict(usage)
+        return chunk
+
     def _create_non_stream(
         self, request_id: str, created_time: int, model: str, payload: Dict[str, Any], timeout: Optional[int] = None, proxies: Optional[Dict[str, str]] = None
     ) -> ChatCompletion:
@@ -156,43 +234,61 @@ class Completions(BaseCompletions):
                 proxies=proxies
             )
             response.raise_for_status()
-            data = response.json()
-            
-            full_text = ""
-            finish_reason = "stop"
-            if 'choices' in data and data['choices']:
-                full_text = data['choices'][0]['message']['content']
-                finish_reason = data['choices'][0].get('finish_reason', 'stop')
-            
-            message = ChatCompletionMessage(
-                role="assistant",
-                content=full_text
-            )
-            choice = Choice(
-                index=0,
-                message=message,
-                finish_reason=finish_reason
-            )
-            
-            prompt_tokens = count_tokens([msg.get("content", "") for msg in payload.get("messages", [])])
-            completion_tokens = count_tokens(full_text)
-            usage = CompletionUsage(
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                total_tokens=prompt_tokens + completion_tokens
-            )
-            
-            completion = ChatCompletion(
-                id=request_id,
-                choices=[choice],
-                created=created_time,
-                model=model,
-                usage=usage,
+            return self._completion(response.json(), request_id, created_time, model, payload)
+        except Exception as e:
+            raise IOError(f"TogetherAI non-stream request failed: {e}") from e
+
+    async def _acreate_non_stream(
+        self, request_id: str, created_time: int, model: str, payload: Dict[str, Any], timeout: Optional[int] = None, proxies: Optional[Dict[str, str]] = None
+    ) -> ChatCompletion:
+        try:
+            response = await self._client.async_session().post(
+                self._client.api_endpoint,
+                headers=self._client.headers,
+                json=dict(payload, stream=False),
+                timeout=timeout or self._client.timeout,
+                proxies=proxies
             )
-            return completion
+            response.raise_for_status()
+            return self._completion(response.json(), request_id, created_time, model, payload)
         except Exception as e:
             raise IOError(f"TogetherAI non-stream request failed: {e}") from e
 
+    def _completion(
+        self, data: Dict[str, Any], request_id: str, created_time: int, model: str, payload: Dict[str, Any]
+    ) -> ChatCompletion:
+        full_text = ""
+        finish_reason = "stop"
+        if 'choices' in data and data['choices']:
+            full_text = data['choices'][0]['message']['content']
+            finish_reason = data['choices'][0].get('finish_reason', 'stop')
+        
+        message = ChatCompletionMessage(
+            role="assistant",
+            content=full_text
+        )
+        choice = Choice(
+            index=0,
+            message=message,
+            finish_reason=finish_reason
+        )
+        
+        prompt_tokens = count_tokens([msg.get("content", "") for msg in payload.get("messages", [])])
+        completion_tokens = count_tokens(full_text)
+        usage = CompletionUsage(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens
+        )
+        
+        return ChatCompletion(
+            id=request_id,
+            choices=[choice],
+            created=created_time,
+            model=model,
+            usage=usage,
+        )
+
 
 class Chat(BaseChat):
     def __init__(self, client: 'TogetherAI'):
@@ -311,6 +407,24 @@ class TogetherAI(OpenAICompatibleProvider):
         except Exception as e:
             raise Exception(f"Failed to get activation key: {e}")
 
+    async def aget_activation_key(self) -> str:
+        """Async version of get_activation_key"""
+        if self._api_key_cache:
+            return self._api_key_cache
+
+        try:
+            response = await self.async_session().get(
+                self.activation_endpoint,
+                headers={"Accept": "application/json"},
+                timeout=30
+            )
+            response.raise_for_status()
+            activation_data = response.json()
+            self._api_key_cache = activation_data["openAIParams"]["apiKey"]
+            return self._api_key_cache
+        except Exception as e:
+            raise Exception(f"Failed to get activation key: {e}")
+
     def convert_model_name(self, model: str) -> str:
         """Convert model name - returns model if valid, otherwise default"""
         if model in self.AVAILABLE_MODELS:
@@ -1,43 +1,75 @@
 # This file marks the directory as a Python package.
-from .deepinfra import *
-from .glider import *
-from .chatgptclone import *
-from .x0gpt import *
-from .wisecat import *
-from .venice import *
-from .exaai import *
-from .typegpt import *
-from .scirachat import *
-from .freeaichat import *
-from .llmchatco import *
-from .yep import * # Add YEPCHAT
-from .heckai import *
-from .sonus import *
-from .exachat import *
-from .netwrck import *
-from .standardinput import *
-from .writecream import *
-from .toolbaz import *
-from .uncovrAI import *
-from .opkfc import *
-from .chatgpt import *
-from .textpollinations import *
-from .typefully import * # Add TypefullyAI
-from .e2b import *
-from .multichat import * # Add MultiChatAI
-from .ai4chat import * # Add AI4Chat
-from .mcpcore import *
-from .flowith import *
-from .chatsandbox import *
-from .c4ai import *
-from .flowith import *
-from .Cloudflare import *
-from .NEMOTRON import *
-from .BLACKBOXAI import *
-from .copilot import * # Add Microsoft Copilot
-from .TwoAI import *
-from .oivscode import * # Add OnRender provider
-from .Qwen3 import *
-from .FalconH1 import *
-from .PI import *  # Add PI.ai provider
-from .TogetherAI import *  # Add TogetherAI provider
\ No newline at end of file
+# Provider modules are imported lazily: ``from providers.OPENAI import ChatGPT`` loads only
+# chatgpt.py (and its dependencies), while ``import *`` / ``dir()`` still expose every provider.
+import importlib
+from typing import Any, Dict
+
+# Exported name -> submodule defining it
+_LAZY_EXPORTS: Dict[str, str] = {
+    "OpenAICompatibleProvider": "base",
+    "BaseChat": "base",
+    "BaseCompletions": "base",
+    "Tool": "base",
+    "ChatCompletion": "utils",
+    "ChatCompletionChunk": "utils",
+    "ChatCompletionMessage": "utils",
+    "Choice": "utils",
+    "ChoiceDelta": "utils",
+    "CompletionUsage": "utils",
+    "DeepInfra": "deepinfra",
+    "Glider": "glider",
+    "ChatGPTClone": "chatgptclone",
+    "X0GPT": "x0gpt",
+    "WiseCat": "wisecat",
+    "Venice": "venice",
+    "ExaAI": "exaai",
+    "TypeGPT": "typegpt",
+    "SciraChat": "scirachat",
+    "FreeAIChat": "freeaichat",
+    "LLMChatCo": "llmchatco",
+    "YEPCHAT": "yep",
+    "HeckAI": "heckai",
+    "SonusAI": "sonus",
+    "ExaChat": "exachat",
+    "Netwrck": "netwrck",
+    "StandardInput": "standardinput",
+    "Writecream": "writecream",
+    "Toolbaz": "toolbaz",
+    "UncovrAI": "uncovrAI",
+    "OPKFC": "opkfc",
+    "ChatGPT": "chatgpt",
+    "TextPollinations": "textpollinations",
+    "TypefullyAI": "typefully",
+    "E2B": "e2b",
+    "MultiChatAI": "multichat",
+    "AI4Chat": "ai4chat",
+    "MCPCore": "mcpcore",
+    "Flowith": "flowith",
+    "ChatSandbox": "chatsandbox",
+    "C4AI": "c4ai",
+    "Cloudflare": "Cloudflare",
+    "NEMOTRON": "NEMOTRON",
+    "BLACKBOXAI": "BLACKBOXAI",
+    "Copilot": "copilot",
+    "TwoAI": "TwoAI",
+    "oivscode": "oivscode",
+    "Qwen3": "Qwen3",
+    "FalconH1": "FalconH1",
+    "PiAI": "PI",
+    "TogetherAI": "TogetherAI",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
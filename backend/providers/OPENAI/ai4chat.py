@@ -244,6 +244,8 @@ class AI4Chat(OpenAICompatibleProvider):
         print(response.choices[0].message.content)
     """
 
+    simulated_streaming = True  # the full answer is sliced into 48-char chunks
+
     AVAILABLE_MODELS = ["default"]
 
     def __init__(
@@ -8,6 +8,7 @@ authentication, and provider management.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import secrets
@@ -15,14 +16,14 @@ import sys
 import time
 import uuid
 import inspect
-import re
 import codecs
+import math
 from typing import List, Dict, Optional, Union, Any, Generator, Callable
 import types
 
 from webscout.Litlogger import Logger, LogLevel, LogFormat, ConsoleHandler
 import uvicorn
-from fastapi import FastAPI, Response, Request, Body
+from fastapi import FastAPI, Response, Request, Body, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse, RedirectResponse, JSONResponse
 from fastapi.openapi.utils import get_openapi
@@ -31,23 +32,14 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.security import APIKeyHeader
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-def clean_text(text):
-    """Clean text by removing null bytes and control characters except newlines and tabs."""
-    if not isinstance(text, str):
-        return text
-    
-    # Remove null bytes
-    text = text.replace('\x00', '')
-    
-    # Keep newlines, tabs, and other printable characters, remove other control chars
-    # This regex matches control characters except \n, \r, \t
-    return re.sub(r'[\x01-\x08\x0b\x0c\x0e-\x1f\x7f]', '', text)
 from starlette.status import (
     HTTP_422_UNPROCESSABLE_ENTITY,
     HTTP_404_NOT_FOUND,
     HTTP_401_UNAUTHORIZED,
     HTTP_403_FORBIDDEN,
     HTTP_500_INTERNAL_SERVER_ERROR,
+    HTTP_502_BAD_GATEWAY,
+    HTTP_503_SERVICE_UNAVAILABLE,
 )
 
 from webscout.Provider.OPENAI.pydantic_imports import BaseModel, Field
@@ -61,6 +53,21 @@ from webscout.Provider.OPENAI.utils import (
 from webscout.Provider.TTI import *
 from webscout.Provider.TTI.utils import ImageData, ImageResponse
 from webscout.Provider.TTI.base import TTICompatibleProvider
+from gateway import ModelRouter, ProviderExecutor
+from gateway.coalesce import coalesce_deltas, coalescing_requested
+from gateway.cache import ResponseCache, cache_key, cache_policy, completion_text, replay_pieces
+from gateway.balancer import LoadBalancer
+from gateway.health import HealthRegistry, ProviderUnavailable, UpstreamHTMLError
+from gateway.hedging import HedgeBudget, TTFTStats, hedged_stream
+from gateway.limiter import Overloaded
+from gateway.listing import ModelListing
+from gateway import metrics as gateway_metrics
+from gateway.metrics import RequestMetrics
+from gateway.model_sets import ModelSetCache
+from gateway.routing import RESOLVED_MODEL_HEADER, Route, normalize_model
+from gateway.singleflight import SingleFlight, coalescing_allowed
+from gateway.sse import DONE_EVENT, ChunkEncoder, clean_text, error_event
+from gateway.timing import PhaseTimer, sample_timer
 
 
 # Configuration constants
@@ -91,6 +98,37 @@ class ServerConfig:
         self.cors_origins: List[str] = ["*"]
         self.max_request_size: int = 10 * 1024 * 1024  # 10MB
         self.request_timeout: int = 300  # 5 minutes
+        self.executor_workers: int = int(os.getenv("WEBSCOUT_EXECUTOR_WORKERS", "256"))
+        self.provider_concurrency: int = int(os.getenv("WEBSCOUT_PROVIDER_CONCURRENCY", "64"))
+        self.global_concurrency: Optional[int] = int(os.getenv("WEBSCOUT_GLOBAL_CONCURRENCY", "0")) or None
+        self.queue_size: int = int(os.getenv("WEBSCOUT_QUEUE_SIZE", "128"))
+        self.queue_timeout: float = float(os.getenv("WEBSCOUT_QUEUE_TIMEOUT", "10"))
+        # Providers with a native acreate() stream on the event loop under these limits instead
+        self.async_provider_concurrency: int = int(os.getenv("WEBSCOUT_ASYNC_PROVIDER_CONCURRENCY", "1024"))
+        self.async_global_concurrency: int = int(os.getenv("WEBSCOUT_ASYNC_GLOBAL_CONCURRENCY", "4096"))
+        # Fraction of chat requests that get Server-Timing headers and a timing log record
+        self.timing_sample_rate: float = float(os.getenv("WEBSCOUT_TIMING_SAMPLE_RATE", "1.0"))
+        # Seconds before a provider class's cached AVAILABLE_MODELS set is reloaded
+        self.model_set_ttl: float = float(os.getenv("WEBSCOUT_MODEL_SET_TTL", "3600"))
+        # Streamed deltas closer together than this share one SSE event (0 disables)
+        self.stream_coalesce_window_ms: int = int(os.getenv("WEBSCOUT_STREAM_COALESCE_WINDOW_MS", "20"))
+        self.stream_coalesce_max_chars: int = int(os.getenv("WEBSCOUT_STREAM_COALESCE_MAX_CHARS", "512"))
+        # Providers with simulated streaming: slice size for their complete answer (0 = one chunk)
+        self.simulated_stream_chunk_chars: int = int(os.getenv("WEBSCOUT_SIMULATED_STREAM_CHUNK_CHARS", "0"))
+        self.data_dir: str = os.getenv("WEBSCOUT_DATA_DIR", "./data")
+        self.response_cache: bool = os.getenv("WEBSCOUT_RESPONSE_CACHE", "false").lower() in ("1", "true", "yes")
+        self.response_cache_ttl: int = int(os.getenv("WEBSCOUT_RESPONSE_CACHE_TTL", "3600"))
+        self.request_coalescing: bool = os.getenv("WEBSCOUT_REQUEST_COALESCING", "false").lower() in ("1", "true", "yes")
+        self.circuit_failure_threshold: int = int(os.getenv("WEBSCOUT_CIRCUIT_FAILURE_THRESHOLD", "5"))
+        self.circuit_open_seconds: int = int(os.getenv("WEBSCOUT_CIRCUIT_OPEN_SECONDS", "30"))
+        self.load_balancing: bool = os.getenv("WEBSCOUT_LOAD_BALANCING", "true").lower() in ("1", "true", "yes")
+        # Route "llama-3.3-70b" to variants such as "llama-3.3-70b-versatile" (see X-Resolved-Model)
+        self.model_prefix_matching: bool = os.getenv("WEBSCOUT_MODEL_PREFIX_MATCHING", "false").lower() in ("1", "true", "yes")
+        self.hedging: bool = os.getenv("WEBSCOUT_HEDGING", "false").lower() in ("1", "true", "yes")
+        self.hedge_percentile: float = float(os.getenv("WEBSCOUT_HEDGE_PERCENTILE", "95"))
+        self.hedge_budget: float = float(os.getenv("WEBSCOUT_HEDGE_BUDGET", "0.1"))  # share of requests
+        self.hedge_default_delay: float = float(os.getenv("WEBSCOUT_HEDGE_DEFAULT_DELAY", "3.0"))
+        self.hedge_min_delay: float = float(os.getenv("WEBSCOUT_HEDGE_MIN_DELAY", "0.25"))
 
     def update(self, **kwargs) -> None:
         """Update configuration with provided values."""
@@ -116,6 +154,58 @@ config = ServerConfig()
 provider_instances: Dict[str, Any] = {}
 tti_provider_instances: Dict[str, Any] = {}
 
+# Model id -> provider routing index, rebuilt by initialize_provider_map()
+model_router = ModelRouter(config.model_prefix_matching)
+
+# Per-class model sets for validation; runtime (property) lists load from the cached
+# provider instances in the background instead of constructing a provider per request
+model_sets = ModelSetCache(lambda cls: get_provider_instance(cls), ttl=config.model_set_ttl)
+tti_model_sets = ModelSetCache(lambda cls: get_tti_provider_instance(cls), ttl=config.model_set_ttl)
+
+# Precomputed /v1/models and /v1/TTI/models, rebuilt with the provider maps
+model_listing = ModelListing([])
+tti_model_listing = ModelListing([])
+
+# Thread pool for blocking provider calls so they never run on the event loop;
+# native async providers are admitted separately and need no thread
+executor = ProviderExecutor(
+    max_workers=config.executor_workers,
+    per_provider_limit=config.provider_concurrency,
+    global_limit=config.global_concurrency,
+    max_queue=config.queue_size,
+    queue_timeout=config.queue_timeout,
+    async_per_provider_limit=config.async_provider_concurrency,
+    async_global_limit=config.async_global_concurrency
+)
+
+# Opt-in exact-match cache for deterministic chat completions (temperature=0 or seeded)
+response_cache = ResponseCache(
+    directory=os.path.join(config.data_dir, "response_cache"),
+    ttl=config.response_cache_ttl
+) if config.response_cache else None
+
+# Identical concurrent chat requests share one upstream call
+inflight = SingleFlight() if config.request_coalescing else None
+
+# Passive per-provider health and circuit breakers, fed by every chat call
+health = HealthRegistry(
+    failure_threshold=config.circuit_failure_threshold,
+    open_seconds=config.circuit_open_seconds
+)
+
+# Spreads routed (unpinned) models over every provider serving them
+balancer = LoadBalancer(health) if config.load_balancing else None
+
+# Optional hedging of slow streams: learned per-model TTFT and a cap on extra upstream load
+ttft_stats = TTFTStats()
+hedge_budget = HedgeBudget(ratio=config.hedge_budget)
+
+# Queue depth and cache hit ratio are read from their owners when /metrics is scraped
+gateway_metrics.bind(
+    queue_depth=executor.queue_depth,
+    cache_stats=response_cache.stats if response_cache is not None else None
+)
+
 
 # Define Pydantic models for multimodal content parts, aligning with OpenAI's API
 class TextPart(BaseModel):
@@ -216,12 +306,17 @@ class ModelInfo(BaseModel):
     object: str = "model"
     created: int
     owned_by: str
+    capabilities: List[str] = []
+    modalities: Dict[str, List[str]] = {}
 
 
 class ModelListResponse(BaseModel):
     """Response model for the models list endpoint."""
     object: str = "list"
     data: List[ModelInfo]
+    has_more: Optional[bool] = None
+    first_id: Optional[str] = None
+    last_id: Optional[str] = None
 
 
 class ErrorDetail(BaseModel):
@@ -242,12 +337,13 @@ class APIError(Exception):
 
     def __init__(self, message: str, status_code: int = HTTP_500_INTERNAL_SERVER_ERROR,
                  error_type: str = "server_error", param: Optional[str] = None,
-                 code: Optional[str] = None):
+                 code: Optional[str] = None, headers: Optional[Dict[str, str]] = None):
         self.message = message
         self.status_code = status_code
         self.error_type = error_type
         self.param = param
         self.code = code
+        self.headers = headers
         super().__init__(message)
 
     def to_response(self) -> JSONResponse:
@@ -261,7 +357,8 @@ class APIError(Exception):
         error_response = ErrorResponse(error=error_detail)
         return JSONResponse(
             status_code=self.status_code,
-            content=error_response.model_dump(exclude_none=True)
+            content=error_response.model_dump(exclude_none=True),
+            headers=self.headers
         )
 
 
@@ -318,6 +415,8 @@ def create_app():
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_event_handler("shutdown", close_provider_instances)
+    app.add_event_handler("shutdown", executor.shutdown)
     api = Api(app)
     api.register_authorization()
     api.register_validation_exception_handler()
@@ -374,8 +473,46 @@ def create_app():
 def create_app_debug():
     return create_app()
 
+# Providers ported into this package with a native ``acreate``, by class name -> module.
+NATIVE_ASYNC_PROVIDERS = {
+    "DeepInfra": "deepinfra",
+    "Groq": "groq",
+    "TogetherAI": "TogetherAI",
+    "Cloudflare": "Cloudflare",
+    "TextPollinations": "textpollinations",
+}
+
+
+# Providers whose stream=True only slices up an answer they already have. The classes
+# served from the installed webscout package do not carry the local
+# ``simulated_streaming`` flag, so the gateway keys this off the provider name.
+SIMULATED_STREAMING_PROVIDERS = frozenset({"ChatGPT", "E2B", "AI4Chat", "MultiChatAI"})
+
+
+def simulated_streaming(provider: Any) -> bool:
+    """Whether ``provider`` (a class or an instance) only simulates streaming."""
+    provider_class = provider if inspect.isclass(provider) else type(provider)
+    return (provider_class.__name__ in SIMULATED_STREAMING_PROVIDERS
+            or bool(getattr(provider_class, "simulated_streaming", False)))
+
+
+def native_async_providers() -> Dict[str, Any]:
+    """Load the local native async provider classes, skipping any that fail to import."""
+    import importlib
+
+    classes = {}
+    for provider_name, module_name in NATIVE_ASYNC_PROVIDERS.items():
+        try:
+            module = importlib.import_module(f".{module_name}", __package__)
+            classes[provider_name] = getattr(module, provider_name)
+        except Exception as e:
+            logger.warning(f"Native async provider {provider_name} unavailable: {e}")
+    return classes
+
+
 def initialize_provider_map() -> None:
     """Initialize the provider map by discovering available providers."""
+    global model_router
     logger.info("Initializing provider map...")
 
     try:
@@ -384,6 +521,7 @@ def initialize_provider_map() -> None:
 
         provider_count = 0
         model_count = 0
+        router = ModelRouter(config.model_prefix_matching)
 
         for name, obj in inspect.getmembers(module):
             if (
@@ -400,6 +538,7 @@ def initialize_provider_map() -> None:
                 if hasattr(obj, "AVAILABLE_MODELS") and isinstance(
                     obj.AVAILABLE_MODELS, (list, tuple, set)
                 ):
+                    router.add(provider_name, obj.AVAILABLE_MODELS)
                     for model in obj.AVAILABLE_MODELS:
                         if model and isinstance(model, str):
                             model_key = f"{provider_name}/{model}"
@@ -407,6 +546,26 @@ def initialize_provider_map() -> None:
                             config.provider_map[model_key] = obj
                             model_count += 1
 
+        # Serve the local ports that implement acreate natively in place of the
+        # upstream classes of the same name.
+        for provider_name, obj in native_async_providers().items():
+            if provider_name not in AppConfig.provider_map:
+                provider_count += 1
+            for stale in [k for k in AppConfig.provider_map if k.startswith(f"{provider_name}/")]:
+                del AppConfig.provider_map[stale]
+                config.provider_map.pop(stale, None)
+                model_count -= 1
+            AppConfig.provider_map[provider_name] = obj
+            config.provider_map[provider_name] = obj
+            models = [m for m in getattr(obj, "AVAILABLE_MODELS", None) or () if m and isinstance(m, str)]
+            router.add(provider_name, models)
+            for model in models:
+                model_key = f"{provider_name}/{model}"
+                if model_key not in AppConfig.provider_map:
+                    model_count += 1
+                AppConfig.provider_map[model_key] = obj
+                config.provider_map[model_key] = obj
+
         # Fallback to ChatGPT if no providers found
         if not AppConfig.provider_map:
             logger.warning("No providers found, using ChatGPT fallback")
@@ -417,6 +576,7 @@ def initialize_provider_map() -> None:
                 AppConfig.provider_map["ChatGPT"] = ChatGPT
                 config.provider_map["ChatGPT"] = ChatGPT
 
+                router.add("ChatGPT", fallback_models)
                 for model in fallback_models:
                     model_key = f"ChatGPT/{model}"
                     AppConfig.provider_map[model_key] = ChatGPT
@@ -430,6 +590,8 @@ def initialize_provider_map() -> None:
                 logger.error(f"Failed to import ChatGPT fallback: {e}")
                 raise APIError("No providers available", HTTP_500_INTERNAL_SERVER_ERROR)
 
+        model_router = router
+        refresh_model_listings()
         logger.info(f"Initialized {provider_count} providers with {model_count} models")
 
     except Exception as e:
@@ -487,12 +649,50 @@ def initialize_tti_provider_map() -> None:
                 logger.error(f"Failed to import PollinationsAI fallback: {e}")
                 raise APIError("No TTI providers available", HTTP_500_INTERNAL_SERVER_ERROR)
 
+        refresh_model_listings()
         logger.info(f"Initialized {provider_count} TTI providers with {model_count} models")
 
     except Exception as e:
         logger.error(f"Failed to initialize TTI provider map: {e}")
         raise APIError(f"TTI Provider initialization failed: {e}", HTTP_500_INTERNAL_SERVER_ERROR)
 
+def listing_entries(provider_map: Dict[str, Any], output: str) -> List[Dict[str, Any]]:
+    """``/v1/models`` entries for the ``Provider/model`` keys of a provider map."""
+    entries = []
+    for model_key, provider_class in provider_map.items():
+        if "/" not in model_key:
+            continue  # Skip provider names
+        model = model_key.split("/", 1)[1]
+        if output == "image":
+            capabilities, inputs = ["image_generation"], ["text"]
+        else:
+            capabilities = ["chat"]
+            if not simulated_streaming(provider_class):
+                capabilities.append("streaming")
+            if getattr(provider_class, "supports_tools", False):
+                capabilities.append("tools")
+            if getattr(provider_class, "supports_tool_choice", False):
+                capabilities.append("tool_choice")
+            vision_models = getattr(provider_class, "vision_models", None) or ()
+            inputs = ["text", "image"] if model in vision_models else ["text"]
+        entries.append({
+            "id": model_key,
+            "owned_by": provider_class.__name__,
+            "capabilities": capabilities,
+            "modalities": {"input": inputs, "output": [output]},
+        })
+    return entries
+
+
+def refresh_model_listings() -> None:
+    """Rebuild the precomputed model lists from the current provider maps."""
+    global model_listing, tti_model_listing
+    model_listing = ModelListing(listing_entries(AppConfig.provider_map, "text"))
+    tti_model_listing = ModelListing(listing_entries(AppConfig.tti_provider_map, "image"))
+    model_sets.invalidate()
+    tti_model_sets.invalidate()
+
+
 class Api:
     def __init__(self, app: FastAPI) -> None:
         self.app = app
@@ -629,47 +829,42 @@ class Api:
             # This api.py file is intended for Uvicorn.
             return RedirectResponse(url="/docs")
 
+        @self.app.get("/metrics", include_in_schema=False)
+        async def prometheus_metrics():
+            return gateway_metrics.metrics_response()
+
         @self.app.get("/v1/models", response_model=ModelListResponse)
-        async def list_models():
-            models = []
-            for model_name, provider_class in AppConfig.provider_map.items():
-                if "/" not in model_name:
-                    continue  # Skip provider names
-                if any(m["id"] == model_name for m in models):
-                    continue
-                models.append({
-                    "id": model_name,
-                    "object": "model",
-                    "created": int(time.time()),
-                    "owned_by": provider_class.__name__
-                })
-            # Sort models alphabetically by the part after the first '/'
-            models = sorted(models, key=lambda m: m["id"].split("/", 1)[1].lower())
-            return {
-                "object": "list",
-                "data": models
-            }
+        async def list_models(
+            request: Request,
+            provider: Optional[str] = None,
+            capability: Optional[str] = None,
+            modality: Optional[str] = None,
+            after: Optional[str] = None,
+            limit: Optional[int] = Query(None, ge=1, le=1000)
+        ):
+            """List chat models, optionally filtered by provider, capability or modality.
+
+            Pages follow OpenAI list pagination: pass the previous page's ``last_id`` as ``after``.
+            """
+            return model_listing.response(
+                request.headers.get("if-none-match"), provider=provider, capability=capability,
+                modality=modality, after=after, limit=limit
+            )
 
         @self.app.get("/v1/TTI/models", response_model=ModelListResponse)
-        async def list_tti_models():
-            models = []
-            for model_name, provider_class in AppConfig.tti_provider_map.items():
-                if "/" not in model_name:
-                    continue  # Skip provider names
-                if any(m["id"] == model_name for m in models):
-                    continue
-                models.append({
-                    "id": model_name,
-                    "object": "model",
-                    "created": int(time.time()),
-                    "owned_by": provider_class.__name__
-                })
-            # Sort models alphabetically by the part after the first '/'
-            models = sorted(models, key=lambda m: m["id"].split("/", 1)[1].lower())
-            return {
-                "object": "list",
-                "data": models
-            }
+        async def list_tti_models(
+            request: Request,
+            provider: Optional[str] = None,
+            capability: Optional[str] = None,
+            modality: Optional[str] = None,
+            after: Optional[str] = None,
+            limit: Optional[int] = Query(None, ge=1, le=1000)
+        ):
+            """List image generation models, with the same filters and pagination as ``/v1/models``."""
+            return tti_model_listing.response(
+                request.headers.get("if-none-match"), provider=provider, capability=capability,
+                modality=modality, after=after, limit=limit
+            )
 
         @self.app.post(
             "/v1/chat/completions",
@@ -689,52 +884,122 @@ class Api:
             }
         )
         async def chat_completions(
+            request: Request,
+            response: Response,
             chat_request: ChatCompletionRequest = Body(...)
         ):
             """Handle chat completion requests with comprehensive error handling."""
             start_time = time.time()
             request_id = f"chatcmpl-{uuid.uuid4()}"
+            timer = sample_timer(config.timing_sample_rate)
+            streamed = False
 
-            try:
-                logger.info(f"Processing chat completion request {request_id} for model: {chat_request.model}")
-
-                # Resolve provider and model
-                provider_class, model_name = resolve_provider_and_model(chat_request.model)
-
-                # Initialize provider with caching and error handling
+            with RequestMetrics("chat", model=chat_request.model) as metrics:
                 try:
-                    provider = get_provider_instance(provider_class)
-                    logger.debug(f"Using provider instance: {provider_class.__name__}")
+                    logger.info(f"Processing chat completion request {request_id} for model: {chat_request.model}")
+
+                    # Resolve provider and model
+                    with timer.phase("resolve"):
+                        provider_class, model_name = resolve_provider_and_model(chat_request.model)
+                    metrics.provider, metrics.model = provider_class.__name__, model_name
+                    resolved = f"{provider_class.__name__}/{model_name}"
+                    response.headers[RESOLVED_MODEL_HEADER] = resolved
+
+                    # Process and validate messages
+                    with timer.phase("process_messages"):
+                        processed_messages = process_messages(chat_request.messages)
+
+                    # Prepare parameters for provider
+                    params = prepare_provider_params(chat_request, model_name, processed_messages)
+
+                    # Serve repeated deterministic requests from the response cache
+                    lookup, store = cache_policy(request.headers.get("cache-control"))
+                    request_key = cache_key(provider_class.__name__, model_name, processed_messages, params)
+                    key = None
+                    if response_cache is not None and response_cache.cacheable(params):
+                        if lookup:
+                            with timer.phase("cache"):
+                                entry = await response_cache.get(request_key)
+                            if entry is not None:
+                                logger.info(f"Serving chat completion request {request_id} from cache")
+                                if chat_request.stream:
+                                    cached = cached_streaming_response(entry, model_name, request_id)
+                                    cached.headers[RESOLVED_MODEL_HEADER] = resolved
+                                    response = cached
+                                else:
+                                    cached = dict(entry["value"], id=request_id, created=int(time.time()))
+                                if timer.enabled:
+                                    response.headers["Server-Timing"] = timer.server_timing()
+                                return cached
+                        if store:
+                            key = request_key
+
+                    # Identical greedy or opted-in requests already in flight share their
+                    # upstream call; streams opted out of delta coalescing only share with each other
+                    coalesce = coalescing_requested(request.headers)
+                    flight_key = None
+                    if inflight is not None and lookup and coalescing_allowed(params, request.headers):
+                        flight_key = f"{'stream' if chat_request.stream else 'call'}:{request_key}"
+                        if chat_request.stream and not coalesce:
+                            flight_key += ":raw"
+
+                    # Initialize provider with caching and error handling
+                    try:
+                        with timer.phase("get_provider_instance"):
+                            provider = await executor.run(provider_class.__name__, get_provider_instance, provider_class)
+                        logger.debug(f"Using provider instance: {provider_class.__name__}")
+                    except Overloaded:
+                        raise
+                    except Exception as e:
+                        logger.error(f"Failed to initialize provider {provider_class.__name__}: {e}")
+                        health.record_failure(provider_class.__name__, e)
+                        raise APIError(
+                            f"Failed to initialize provider {provider_class.__name__}: {e}",
+                            HTTP_500_INTERNAL_SERVER_ERROR,
+                            "provider_error"
+                        )
+
+                    # Handle streaming vs non-streaming
+                    if chat_request.stream:
+                        stream_response = await handle_streaming_response(
+                            provider, params, request_id, cache_entry=key, flight_key=flight_key,
+                            hedge_key=normalize_model(chat_request.model) if config.hedging else None,
+                            backups=hedge_candidates(chat_request.model, provider_class),
+                            metrics=metrics, timer=timer, coalesce=coalesce
+                        )
+                        stream_response.headers[RESOLVED_MODEL_HEADER] = resolved
+                        streamed = True
+                        return stream_response
+                    elif flight_key:
+                        result = await inflight.run(flight_key, lambda: handle_non_streaming_response(
+                            provider, params, request_id, start_time, cache_entry=key, timer=timer
+                        ))
+                    else:
+                        result = await handle_non_streaming_response(
+                            provider, params, request_id, start_time, cache_entry=key, timer=timer
+                        )
+                    if timer.enabled:
+                        response.headers["Server-Timing"] = timer.server_timing()
+                    return result
+
+                except APIError:
+                    # Re-raise API errors as-is
+                    raise
+                except Overloaded as e:
+                    raise APIError(str(e), e.status_code, "overloaded", code="overloaded", headers=e.headers)
+                except ProviderUnavailable as e:
+                    raise provider_unavailable_error(e.provider)
                 except Exception as e:
-                    logger.error(f"Failed to initialize provider {provider_class.__name__}: {e}")
+                    logger.error(f"Unexpected error in chat completion {request_id}: {e}")
                     raise APIError(
-                        f"Failed to initialize provider {provider_class.__name__}: {e}",
+                        f"Internal server error: {str(e)}",
                         HTTP_500_INTERNAL_SERVER_ERROR,
-                        "provider_error"
+                        "internal_error"
                     )
-
-                # Process and validate messages
-                processed_messages = process_messages(chat_request.messages)
-
-                # Prepare parameters for provider
-                params = prepare_provider_params(chat_request, model_name, processed_messages)
-
-                # Handle streaming vs non-streaming
-                if chat_request.stream:
-                    return await handle_streaming_response(provider, params, request_id)
-                else:
-                    return await handle_non_streaming_response(provider, params, request_id, start_time)
-
-            except APIError:
-                # Re-raise API errors as-is
-                raise
-            except Exception as e:
-                logger.error(f"Unexpected error in chat completion {request_id}: {e}")
-                raise APIError(
-                    f"Internal server error: {str(e)}",
-                    HTTP_500_INTERNAL_SERVER_ERROR,
-                    "internal_error"
-                )
+                finally:
+                    # Streams log once the last chunk is sent
+                    if not streamed:
+                        log_timing(timer, request_id, model=chat_request.model, stream=chat_request.stream)
 
         @self.app.post(
             "/v1/images/generations",
@@ -757,74 +1022,88 @@ class Api:
         ):
             """Handle image generation requests (OpenAI-compatible)."""
             request_id = f"imggen-{uuid.uuid4()}"
-            try:
-                logger.info(f"Processing image generation request {request_id} for model: {image_request.model}")
-                # Provider/model resolution using TTI providers
-                provider_class, model_name = resolve_tti_provider_and_model(image_request.model)
-                # Initialize provider with caching
-                try:
-                    provider = get_tti_provider_instance(provider_class)
-                    logger.debug(f"Using TTI provider instance: {provider_class.__name__}")
-                except Exception as e:
-                    logger.error(f"Failed to initialize provider {provider_class.__name__}: {e}")
-                    raise APIError(
-                        f"Failed to initialize provider {provider_class.__name__}: {e}",
-                        HTTP_500_INTERNAL_SERVER_ERROR,
-                        "provider_error"
-                    )
-                # Prepare parameters for provider
-                params = {
-                    "model": model_name,
-                    "prompt": image_request.prompt,
-                    "n": image_request.n,
-                    "size": image_request.size,
-                    "response_format": image_request.response_format,
-                    "user": image_request.user,
-                    "style": image_request.style,
-                    "aspect_ratio": image_request.aspect_ratio,
-                    "timeout": image_request.timeout,
-                    "image_format": image_request.image_format,
-                    "seed": image_request.seed,
-                }
-                # Remove None values
-                params = {k: v for k, v in params.items() if v is not None}
-                # Call provider
+            with RequestMetrics("image", model=image_request.model) as metrics:
                 try:
-                    result = provider.images.create(**params)
+                    logger.info(f"Processing image generation request {request_id} for model: {image_request.model}")
+                    # Provider/model resolution using TTI providers
+                    provider_class, model_name = resolve_tti_provider_and_model(image_request.model)
+                    metrics.provider, metrics.model = provider_class.__name__, model_name
+                    # Initialize provider with caching
+                    try:
+                        provider = await executor.run(provider_class.__name__, get_tti_provider_instance, provider_class)
+                        logger.debug(f"Using TTI provider instance: {provider_class.__name__}")
+                    except Overloaded:
+                        raise
+                    except Exception as e:
+                        logger.error(f"Failed to initialize provider {provider_class.__name__}: {e}")
+                        health.record_failure(provider_class.__name__, e)
+                        raise APIError(
+                            f"Failed to initialize provider {provider_class.__name__}: {e}",
+                            HTTP_500_INTERNAL_SERVER_ERROR,
+                            "provider_error"
+                        )
+                    # Prepare parameters for provider
+                    params = {
+                        "model": model_name,
+                        "prompt": image_request.prompt,
+                        "n": image_request.n,
+                        "size": image_request.size,
+                        "response_format": image_request.response_format,
+                        "user": image_request.user,
+                        "style": image_request.style,
+                        "aspect_ratio": image_request.aspect_ratio,
+                        "timeout": image_request.timeout,
+                        "image_format": image_request.image_format,
+                        "seed": image_request.seed,
+                    }
+                    # Remove None values
+                    params = {k: v for k, v in params.items() if v is not None}
+                    # Call provider
+                    try:
+                        result = await executor.run(provider_class.__name__, provider.images.create, **params)
+                    except Overloaded:
+                        raise
+                    except Exception as e:
+                        logger.error(f"Error in image generation for request {request_id}: {e}")
+                        raise APIError(
+                            f"Provider error: {str(e)}",
+                            HTTP_500_INTERNAL_SERVER_ERROR,
+                            "provider_error"
+                        )
+                    # Standardize response
+                    if hasattr(result, "model_dump"):
+                        response_data = result.model_dump(exclude_none=True)
+                    elif hasattr(result, "dict"):
+                        response_data = result.dict(exclude_none=True)
+                    elif isinstance(result, dict):
+                        response_data = result
+                    else:
+                        raise APIError(
+                            "Invalid response format from provider",
+                            HTTP_500_INTERNAL_SERVER_ERROR,
+                            "provider_error"
+                        )
+                    return response_data
+                except APIError:
+                    raise
+                except Overloaded as e:
+                    raise APIError(str(e), e.status_code, "overloaded", code="overloaded", headers=e.headers)
                 except Exception as e:
-                    logger.error(f"Error in image generation for request {request_id}: {e}")
-                    raise APIError(
-                        f"Provider error: {str(e)}",
-                        HTTP_500_INTERNAL_SERVER_ERROR,
-                        "provider_error"
-                    )
-                # Standardize response
-                if hasattr(result, "model_dump"):
-                    response_data = result.model_dump(exclude_none=True)
-                elif hasattr(result, "dict"):
-                    response_data = result.dict(exclude_none=True)
-                elif isinstance(result, dict):
-                    response_data = result
-                else:
+                    logger.error(f"Unexpected error in image generation {request_id}: {e}")
                     raise APIError(
-                        "Invalid response format from provider",
+                        f"Internal server error: {str(e)}",
                         HTTP_500_INTERNAL_SERVER_ERROR,
-                        "provider_error"
+                        "internal_error"
                     )
-                return response_data
-            except APIError:
-                raise
-            except Exception as e:
-                logger.error(f"Unexpected error in image generation {request_id}: {e}")
-                raise APIError(
-                    f"Internal server error: {str(e)}",
-                    HTTP_500_INTERNAL_SERVER_ERROR,
-                    "internal_error"
-                )
 
 
 def resolve_provider_and_model(model_identifier: str) -> tuple[Any, str]:
-    """Resolve provider class and model name from model identifier."""
+    """Resolve provider class and model name from model identifier.
+
+    ``Provider/model`` pins a provider. Any other id is looked up in the routing index and
+    balanced across the providers serving it, falling back to the default provider when
+    no provider advertises it.
+    """
     provider_class = None
     model_name = None
 
@@ -832,12 +1111,26 @@ def resolve_provider_and_model(model_identifier: str) -> tuple[Any, str]:
     if model_identifier in AppConfig.provider_map and "/" in model_identifier:
         provider_class = AppConfig.provider_map[model_identifier]
         _, model_name = model_identifier.split("/", 1)
-    elif "/" in model_identifier:
+    elif "/" in model_identifier and model_identifier.split("/", 1)[0] in AppConfig.provider_map:
         provider_name, model_name = model_identifier.split("/", 1)
         provider_class = AppConfig.provider_map.get(provider_name)
     else:
-        provider_class = AppConfig.provider_map.get(AppConfig.default_provider)
-        model_name = model_identifier
+        routes = model_router.resolve(model_identifier)
+        if balancer is not None:
+            routes = balancer.order(routes)
+        if routes:
+            # Best provider under current load whose circuit breaker would let a call through
+            # (the probe slot is claimed right before the upstream call). Routed models come
+            # from AVAILABLE_MODELS, so they need no further validation.
+            route = next((r for r in routes if health.available(r.provider)), None)
+            if route is None:
+                raise provider_unavailable_error(routes[0].provider)
+            return AppConfig.provider_map[route.provider], route.model
+        if "/" in model_identifier:
+            provider_name, model_name = model_identifier.split("/", 1)
+        else:
+            provider_class = AppConfig.provider_map.get(AppConfig.default_provider)
+            model_name = model_identifier
 
     if not provider_class:
         available_providers = list(set(v.__name__ for v in AppConfig.provider_map.values()))
@@ -848,28 +1141,49 @@ def resolve_provider_and_model(model_identifier: str) -> tuple[Any, str]:
             param="model"
         )
 
-    # Validate model availability
-    if hasattr(provider_class, "AVAILABLE_MODELS") and model_name is not None:
-        available = getattr(provider_class, "AVAILABLE_MODELS", None)
-        # If it's a property, get from instance
-        if isinstance(available, property):
-            try:
-                available = getattr(provider_class(), "AVAILABLE_MODELS", [])
-            except Exception:
-                available = []
-        # If still not iterable, fallback to empty list
-        if not isinstance(available, (list, tuple, set)):
-            available = list(available) if hasattr(available, "__iter__") and not isinstance(available, str) else []
-        if available and model_name not in available:
-            raise APIError(
-                f"Model '{model_name}' not supported by provider '{provider_class.__name__}'. Available models: {available}",
-                HTTP_404_NOT_FOUND,
-                "model_not_found",
-                param="model"
-            )
+    # Validate model availability against the class's cached model set (no instantiation)
+    available = model_sets.get(provider_class) if model_name is not None else None
+    if available and model_name not in available:
+        raise APIError(
+            f"Model '{model_name}' not supported by provider '{provider_class.__name__}'. Available models: {sorted(available)}",
+            HTTP_404_NOT_FOUND,
+            "model_not_found",
+            param="model"
+        )
+
+    # Fail fast instead of waiting out a timeout on a provider known to be down
+    if not health.available(provider_class.__name__):
+        raise provider_unavailable_error(provider_class.__name__)
 
     return provider_class, model_name
 
+def hedge_candidates(model_identifier: str, primary_class: Any) -> List[Route]:
+    """Other providers serving a routed model, best first (none for pinned models)."""
+    if not config.hedging:
+        return []
+    if "/" in model_identifier and (
+        model_identifier in AppConfig.provider_map
+        or model_identifier.split("/", 1)[0] in AppConfig.provider_map
+    ):
+        return []
+    return [r for r in model_router.resolve(model_identifier) if r.provider != primary_class.__name__]
+
+def hedge_delay(hedge_key: str) -> float:
+    """How long to wait for the first chunk before hedging."""
+    threshold = ttft_stats.percentile(hedge_key, config.hedge_percentile)
+    return max(config.hedge_min_delay, threshold if threshold is not None else config.hedge_default_delay)
+
+def provider_unavailable_error(provider_name: str) -> APIError:
+    """503 for a provider whose circuit breaker is open."""
+    retry_after = max(1, math.ceil(health.retry_after(provider_name)))
+    return APIError(
+        f"Provider '{provider_name}' is temporarily unavailable after repeated failures",
+        HTTP_503_SERVICE_UNAVAILABLE,
+        "provider_unavailable",
+        param="model",
+        headers={"Retry-After": str(retry_after)}
+    )
+
 def resolve_tti_provider_and_model(model_identifier: str) -> tuple[Any, str]:
     """Resolve TTI provider class and model name from model identifier."""
     provider_class = None
@@ -895,25 +1209,15 @@ def resolve_tti_provider_and_model(model_identifier: str) -> tuple[Any, str]:
             param="model"
         )
 
-    # Validate model availability
-    if hasattr(provider_class, "AVAILABLE_MODELS") and model_name is not None:
-        available = getattr(provider_class, "AVAILABLE_MODELS", None)
-        # If it's a property, get from instance
-        if isinstance(available, property):
-            try:
-                available = getattr(provider_class(), "AVAILABLE_MODELS", [])
-            except Exception:
-                available = []
-        # If still not iterable, fallback to empty list
-        if not isinstance(available, (list, tuple, set)):
-            available = list(available) if hasattr(available, "__iter__") and not isinstance(available, str) else []
-        if available and model_name not in available:
-            raise APIError(
-                f"Model '{model_name}' not supported by TTI provider '{provider_class.__name__}'. Available models: {available}",
-                HTTP_404_NOT_FOUND,
-                "model_not_found",
-                param="model"
-            )
+    # Validate model availability against the class's cached model set (no instantiation)
+    available = tti_model_sets.get(provider_class) if model_name is not None else None
+    if available and model_name not in available:
+        raise APIError(
+            f"Model '{model_name}' not supported by TTI provider '{provider_class.__name__}'. Available models: {sorted(available)}",
+            HTTP_404_NOT_FOUND,
+            "model_not_found",
+            param="model"
+        )
 
     return provider_class, model_name
 
@@ -928,6 +1232,17 @@ def get_provider_instance(provider_class: Any):
     return instance
 
 
+async def close_provider_instances() -> None:
+    """Close the cached providers' async HTTP sessions (app shutdown)."""
+    for instance in list(provider_instances.values()):
+        aclose = getattr(instance, "aclose", None)
+        if asyncio.iscoroutinefunction(aclose):
+            try:
+                await aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close {type(instance).__name__}: {e}")
+
+
 def get_tti_provider_instance(provider_class: Any):
     """Return a cached instance of the TTI provider, creating it if needed."""
     key = provider_class.__name__
@@ -994,100 +1309,216 @@ def prepare_provider_params(chat_request: ChatCompletionRequest, model_name: str
     return params
 
 
-async def handle_streaming_response(provider: Any, params: Dict[str, Any], request_id: str) -> StreamingResponse:
-    """Handle streaming chat completion response."""
-    async def streaming():
+def native_async(provider: Any) -> bool:
+    """Whether ``provider`` implements ``acreate`` itself rather than adapting ``create``.
+
+    Simulated streams keep their one-call path through ``provider_stream``.
+    """
+    completions = getattr(getattr(provider, "chat", None), "completions", None)
+    return (getattr(completions, "native_async", False)
+            and not simulated_streaming(provider))
+
+
+async def open_provider_stream(provider_name: str, provider: Any, **params: Any) -> Any:
+    """Admit a streaming call on ``provider`` and return its chunks.
+
+    Native async providers stream on the event loop; everything else goes through the
+    executor's thread pool, with each chunk pulled on a worker thread.
+    """
+    if native_async(provider):
+        return await executor.open_async_stream(provider_name, provider.chat.completions.acreate, **params)
+    return await executor.open_stream(provider_name, provider_stream, provider, **params)
+
+
+async def provider_completion(provider_name: str, provider: Any, **params: Any) -> Any:
+    """Run a non-streaming call on ``provider``, on the event loop when it is native async."""
+    if native_async(provider):
+        return await executor.run_async(provider_name, provider.chat.completions.acreate, **params)
+    return await executor.run(provider_name, provider.chat.completions.create, **params)
+
+
+def provider_stream(provider: Any, **params: Any) -> Any:
+    """Start a streaming call on ``provider``.
+
+    Providers that only simulate streaming pace out an answer they already have,
+    so they get one non-streaming call instead, and its text is streamed without delay:
+    whole, or in ``simulated_stream_chunk_chars`` slices.
+    """
+    if not simulated_streaming(provider):
+        return provider.chat.completions.create(**params)
+    return simulated_stream_chunks(provider, params)
+
+
+def simulated_stream_chunks(provider: Any, params: Dict[str, Any]) -> Generator[Dict[str, Any], None, None]:
+    completion = provider.chat.completions.create(**dict(params, stream=False))
+    if hasattr(completion, "model_dump"):  # Pydantic v2
+        completion = completion.model_dump(exclude_none=True)
+    elif hasattr(completion, "dict"):  # Pydantic v1
+        completion = completion.dict(exclude_none=True)
+    text = completion_text(completion)
+    size = config.simulated_stream_chunk_chars
+    for piece in (replay_pieces(text, size) if size > 0 else [text] if text else []):
+        yield {"choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+    yield {"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+
+
+def log_timing(timer: PhaseTimer, request_id: str, **fields: Any) -> None:
+    """Emit a sampled request's phase timings as one JSON log record."""
+    if timer.enabled:
+        logger.info(f"Request timing: {json.dumps(timer.record(request_id=request_id, **fields))}")
+
+
+def stream_text(item: Any) -> Optional[str]:
+    """Text delta of an ``(event, text or error)`` pair from a streaming response."""
+    detail = item[1]
+    return detail if isinstance(detail, str) else None
+
+
+def cached_streaming_response(entry: Dict[str, Any], model: str, request_id: str) -> StreamingResponse:
+    """Replay a cached completion as an SSE stream."""
+    encoder = ChunkEncoder(request_id, model)
+
+    def streaming():
+        yield encoder.delta({"role": "assistant"})
+        for piece in replay_pieces(entry.get("text", "")):
+            yield encoder.text(piece)
+        yield encoder.delta({}, finish_reason="stop")
+        yield DONE_EVENT
+    return StreamingResponse(streaming(), media_type="text/event-stream")
+
+
+def completion_from_text(text: str, model: str, request_id: str) -> Dict[str, Any]:
+    """Non-streaming response body for text collected from a stream."""
+    return ChatCompletion(
+        id=request_id,
+        created=int(time.time()),
+        model=model,
+        choices=[Choice(
+            index=0,
+            message=ChatCompletionMessage(role="assistant", content=text),
+            finish_reason="stop"
+        )],
+        usage=CompletionUsage(prompt_tokens=0, completion_tokens=0, total_tokens=0)
+    ).model_dump(exclude_none=True)
+
+
+async def handle_streaming_response(provider: Any, params: Dict[str, Any], request_id: str,
+                                    cache_entry: Optional[str] = None,
+                                    flight_key: Optional[str] = None,
+                                    hedge_key: Optional[str] = None,
+                                    backups: Optional[List[Route]] = None,
+                                    metrics: Optional[RequestMetrics] = None,
+                                    timer: Optional[PhaseTimer] = None,
+                                    coalesce: bool = True) -> StreamingResponse:
+    """Handle streaming chat completion response.
+
+    With a ``flight_key``, identical concurrent requests subscribe to one upstream
+    stream; late subscribers first receive the events sent so far. With a ``hedge_key``
+    the model's TTFT is recorded, and if the first chunk is later than its percentile
+    threshold the request is also started on the first healthy provider in ``backups``.
+    Events travel with their text delta (or the error that ended the stream) so each
+    subscriber's ``metrics`` can measure its own stream. The ``timer``'s phases up to the
+    upstream call go out as ``Server-Timing``; upstream and serialization time are only
+    known at the end of the stream and are logged. With ``coalesce``, text deltas closer
+    together than the configured window are merged into one event.
+    """
+    provider_name = type(provider).__name__
+    timer = timer or sample_timer(0.0)
+
+    async def open_backup():
+        for route in backups or ():
+            if not health.allow(route.provider):
+                continue
+            backup_class = AppConfig.provider_map[route.provider]
+            backup = await executor.run(route.provider, get_provider_instance, backup_class)
+            backup_params = dict(params, model=route.model)
+            return health.observe_stream(
+                route.provider, await open_provider_stream(route.provider, backup, **backup_params)
+            )
+        return None
+
+    async def events(chunks):
+        parts: List[str] = []
+        # One envelope per stream; single-choice text deltas skip the pydantic dump
+        encoder = ChunkEncoder(request_id)
         try:
             logger.debug(f"Starting streaming response for request {request_id}")
-            completion_stream = provider.chat.completions.create(**params)
-
-            # Check if it's iterable (generator, iterator, or other iterable types)
-            if hasattr(completion_stream, '__iter__') and not isinstance(completion_stream, (str, bytes, dict)):
-                try:
-                    for chunk in completion_stream:
-                        # Standardize chunk format before sending
-                        if hasattr(chunk, 'model_dump'):  # Pydantic v2
-                            chunk_data = chunk.model_dump(exclude_none=True)
-                        elif hasattr(chunk, 'dict'):  # Pydantic v1
-                            chunk_data = chunk.dict(exclude_none=True)
-                        elif isinstance(chunk, dict):
-                            chunk_data = chunk
-                        else:  # Fallback for unknown chunk types
-                            chunk_data = chunk
-                        
-                        # Clean text content in the chunk to remove control characters
-                        if isinstance(chunk_data, dict) and 'choices' in chunk_data:
-                            for choice in chunk_data.get('choices', []):
-                                if isinstance(choice, dict):
-                                    # Handle delta for streaming
-                                    if 'delta' in choice and isinstance(choice['delta'], dict) and 'content' in choice['delta']:
-                                        choice['delta']['content'] = clean_text(choice['delta']['content'])
-                                    # Handle message for non-streaming
-                                    elif 'message' in choice and isinstance(choice['message'], dict) and 'content' in choice['message']:
-                                        choice['message']['content'] = clean_text(choice['message']['content'])
-                        
-                        yield f"data: {json.dumps(chunk_data, ensure_ascii=False)}\n\n"
-                except TypeError as te:
-                    logger.error(f"Error iterating over completion_stream: {te}")
-                    # Fall back to treating as non-generator response
-                    if hasattr(completion_stream, 'model_dump'):
-                        response_data = completion_stream.model_dump(exclude_none=True)
-                    elif hasattr(completion_stream, 'dict'):
-                        response_data = completion_stream.dict(exclude_none=True)
-                    else:
-                        response_data = completion_stream
-                    
-                    # Clean text content in the response
-                    if isinstance(response_data, dict) and 'choices' in response_data:
-                        for choice in response_data.get('choices', []):
-                            if isinstance(choice, dict):
-                                if 'delta' in choice and isinstance(choice['delta'], dict) and 'content' in choice['delta']:
-                                    choice['delta']['content'] = clean_text(choice['delta']['content'])
-                                elif 'message' in choice and isinstance(choice['message'], dict) and 'content' in choice['message']:
-                                    choice['message']['content'] = clean_text(choice['message']['content'])
-                    
-                    yield f"data: {json.dumps(response_data, ensure_ascii=False)}\n\n"
-            else:  # Non-generator response
-                if hasattr(completion_stream, 'model_dump'):
-                    response_data = completion_stream.model_dump(exclude_none=True)
-                elif hasattr(completion_stream, 'dict'):
-                    response_data = completion_stream.dict(exclude_none=True)
-                else:
-                    response_data = completion_stream
-                
-                # Clean text content in the response
-                if isinstance(response_data, dict) and 'choices' in response_data:
-                    for choice in response_data.get('choices', []):
-                        if isinstance(choice, dict):
-                            if 'delta' in choice and isinstance(choice['delta'], dict) and 'content' in choice['delta']:
-                                choice['delta']['content'] = clean_text(choice['delta']['content'])
-                            elif 'message' in choice and isinstance(choice['message'], dict) and 'content' in choice['message']:
-                                choice['message']['content'] = clean_text(choice['message']['content'])
-                
-                yield f"data: {json.dumps(response_data, ensure_ascii=False)}\n\n"
+            chunks = health.observe_stream(provider_name, chunks)
+            if hedge_key:
+                chunks = hedged_stream(
+                    chunks, open_backup if backups else None, hedge_delay(hedge_key), hedge_budget,
+                    on_first_chunk=lambda ttft: ttft_stats.record(hedge_key, ttft)
+                )
+            if coalesce:
+                chunks = coalesce_deltas(
+                    chunks, encoder.content_of, encoder.merge,
+                    config.stream_coalesce_window_ms / 1000, config.stream_coalesce_max_chars
+                )
+            async for chunk in chunks:
+                serialize_start = time.perf_counter()
+                event, content = encoder.encode(chunk)
+                if cache_entry:
+                    parts.append(content or "")
+                timer.add("serialization", time.perf_counter() - serialize_start)
+                yield event, content
+
+            if cache_entry:
+                text = "".join(parts)
+                await response_cache.put(cache_entry, completion_from_text(text, params["model"], request_id), text=text)
 
         except Exception as e:
             logger.error(f"Error in streaming response for request {request_id}: {e}")
-            error_message = clean_text(str(e))
-            error_data = {
-                "error": {
-                    "message": error_message,
-                    "type": "server_error",
-                    "code": "streaming_error"
-                }
-            }
-            yield f"data: {json.dumps(error_data, ensure_ascii=False)}\n\n"
+            yield error_event(str(e)), e
+
+    async def open_events():
+        # The provider call and every chunk pull run on the executor (on the event loop
+        # for native async providers); a provider that returns a complete
+        # (non-generator) response is yielded as a single chunk. Admission happens
+        # here, so a saturated provider is refused before the response starts instead
+        # of with a mid-stream error event.
+        with timer.phase("admission"):
+            health.check(provider_name)
+            chunks = await open_provider_stream(provider_name, provider, **params)
+        return events(chunks)
+
+    shared = await inflight.stream(flight_key, open_events) if flight_key else await open_events()
+
+    relayed = metrics.wrap(shared, text=stream_text) if metrics is not None else shared
+
+    async def streaming():
+        upstream_start = time.perf_counter()
+        try:
+            async for event, detail in relayed:
+                if isinstance(detail, Exception) and metrics is not None:
+                    metrics.fail(detail)
+                if "ttft" not in timer.phases:
+                    timer.add("ttft", time.perf_counter() - upstream_start)
+                yield event
         finally:
-            yield "data: [DONE]\n\n"
-    return StreamingResponse(streaming(), media_type="text/event-stream")
+            await relayed.aclose()
+            timer.add("upstream", time.perf_counter() - upstream_start)
+            log_timing(timer, request_id, model=params.get("model"), stream=True)
+        yield DONE_EVENT
+
+    response = StreamingResponse(streaming(), media_type="text/event-stream")
+    if timer.enabled:
+        response.headers["Server-Timing"] = timer.server_timing()
+    return response
 
 
 async def handle_non_streaming_response(provider: Any, params: Dict[str, Any],
-                                      request_id: str, start_time: float) -> Dict[str, Any]:
+                                      request_id: str, start_time: float,
+                                      cache_entry: Optional[str] = None,
+                                      timer: Optional[PhaseTimer] = None) -> Dict[str, Any]:
     """Handle non-streaming chat completion response."""
+    timer = timer or sample_timer(0.0)
     try:
         logger.debug(f"Starting non-streaming response for request {request_id}")
-        completion = provider.chat.completions.create(**params)
+        provider_name = type(provider).__name__
+        health.check(provider_name)
+        with timer.phase("upstream"):
+            completion = await health.observe(provider_name, provider_completion(provider_name, provider, **params))
+        serialize_start = time.perf_counter()
 
         if completion is None:
             # Return a valid OpenAI-compatible error response
@@ -1124,11 +1555,25 @@ async def handle_non_streaming_response(provider: Any, params: Dict[str, Any],
                     if isinstance(choice['message'], dict) and 'content' in choice['message']:
                         choice['message']['content'] = clean_text(choice['message']['content'])
 
+        timer.add("serialization", time.perf_counter() - serialize_start)
+
+        if cache_entry:
+            await response_cache.put(cache_entry, response_data, text=completion_text(response_data))
+
         elapsed = time.time() - start_time
         logger.info(f"Completed non-streaming request {request_id} in {elapsed:.2f}s")
 
         return response_data
 
+    except APIError:
+        raise
+    except UpstreamHTMLError as e:
+        logger.error(f"Error in non-streaming response for request {request_id}: {e}")
+        raise APIError(str(e), HTTP_502_BAD_GATEWAY, "provider_error")
+    except Overloaded:
+        raise
+    except ProviderUnavailable as e:
+        raise provider_unavailable_error(e.provider)
     except Exception as e:
         logger.error(f"Error in non-streaming response for request {request_id}: {e}")
         error_message = clean_text(str(e))
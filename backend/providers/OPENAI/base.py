@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Union, Generator, Any, TypedDict, Callable
+from typing import List, Dict, Optional, Union, Generator, Any, TypedDict, Callable, AsyncIterator, Iterator
+import asyncio
 import json
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 logger = logging.getLogger(__name__)
 
 
@@ -64,7 +67,66 @@ class Tool:
             logger.error(f"Error executing tool '{self.name}': {str(e)}")
             return f"Error executing tool '{self.name}': {str(e)}"
 
+# Returned by next() when an adapted generator is exhausted
+_EXHAUSTED = object()
+_adapter_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _adapter_executor() -> ThreadPoolExecutor:
+    """Worker threads behind the default, sync-backed ``acreate``"""
+    global _adapter_pool
+    if _adapter_pool is None:
+        _adapter_pool = ThreadPoolExecutor(thread_name_prefix="acreate")
+    return _adapter_pool
+
+
+async def iterate_in_thread(iterator: Iterator[Any]) -> AsyncIterator[Any]:
+    """Async iterator over a blocking iterator; each ``next()`` runs on a worker thread"""
+    pool = _adapter_executor()
+    pending = None
+    try:
+        while True:
+            pending = pool.submit(next, iterator, _EXHAUSTED)
+            chunk = await asyncio.wrap_future(pending)
+            if chunk is _EXHAUSTED:
+                return
+            yield chunk
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            def _close(_=None):
+                try:
+                    close()
+                except Exception:
+                    pass
+            # Never close a generator while a next() is still running in its thread
+            if pending is not None and not pending.done():
+                pending.add_done_callback(_close)
+            else:
+                pool.submit(_close)
+
+
+async def aiter_sse_data(response: Any) -> AsyncIterator[Dict[str, Any]]:
+    """JSON payloads of an OpenAI-style ``data:`` event stream, up to ``[DONE]``"""
+    async for line in response.aiter_lines():
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        line = line.strip()
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        try:
+            yield json.loads(data)
+        except json.JSONDecodeError:
+            continue
+
+
 class BaseCompletions(ABC):
+    # True when acreate() talks to the upstream itself instead of adapting create()
+    native_async: bool = False
+
     @abstractmethod
     def create(
         self,
@@ -99,6 +161,20 @@ class BaseCompletions(ABC):
             Either a completion object or a generator of completion chunks if streaming
         """
         raise NotImplementedError
+
+    async def acreate(self, **kwargs: Any) -> Union[ChatCompletion, AsyncIterator[ChatCompletionChunk]]:
+        """
+        Async counterpart of ``create``, taking the same arguments.
+
+        Returns the completion, or an async iterator of chunks if streaming. This
+        default runs ``create`` and every chunk pull on a worker thread, so providers
+        without a native implementation keep working from async callers. Providers
+        that override it set ``native_async``.
+        """
+        result = await asyncio.wrap_future(_adapter_executor().submit(partial(self.create, **kwargs)))
+        if isinstance(result, Iterator):
+            return iterate_in_thread(result)
+        return result
     
     def format_tool_calls(self, tools: List[Union[Tool, Dict[str, Any]]]) -> List[Dict[str, Any]]:
         """Convert tools to the format expected by the provider"""
@@ -265,6 +341,9 @@ class OpenAICompatibleProvider(ABC):
     available_tools: Dict[str, Tool] = {}  # Dictionary of available tools
     supports_tools: bool = False  # Whether the provider supports tools
     supports_tool_choice: bool = False  # Whether the provider supports tool_choice
+    simulated_streaming: bool = False  # Whether stream=True only slices up an already complete response
+    async_max_clients: int = 1024  # Concurrent requests on the shared AsyncSession
+    async_loop: Optional[asyncio.AbstractEventLoop] = None  # Loop the shared AsyncSession is bound to
 
     @abstractmethod
     def __init__(self, api_key: Optional[str] = None, tools: Optional[List[Tool]] = None, proxies: Optional[dict] = None, **kwargs: Any):
@@ -285,6 +364,51 @@ class OpenAICompatibleProvider(ABC):
         """
         pass
     
+    def async_session(self) -> Any:
+        """
+        curl_cffi ``AsyncSession`` shared by this provider's native ``acreate`` calls.
+
+        Created on first use with the provider's headers and proxies. Its requests are
+        multiplexed on the event loop, so concurrent streams do not need a thread each.
+        The session is bound to the event loop that created it (``async_loop``); called
+        from another loop, a new session replaces it and the old one is closed on its own
+        loop. Release it with ``aclose``.
+        """
+        loop = asyncio.get_running_loop()
+        session = getattr(self, "_async_session", None)
+        if session is not None and self.async_loop is not loop:
+            self.close_async_session()
+            session = None
+        if session is None:
+            from curl_cffi.requests import AsyncSession
+            session = self._async_session = AsyncSession(
+                headers=dict(getattr(self, "headers", None) or {}),
+                proxies=getattr(self, "proxies", None) or None,
+                max_clients=self.async_max_clients,
+            )
+            self.async_loop = loop
+        return session
+
+    async def aclose(self) -> None:
+        """Close the shared ``AsyncSession``; await it on the loop the session is bound to"""
+        session, self._async_session = getattr(self, "_async_session", None), None
+        if session is not None:
+            await session.close()
+
+    def close_async_session(self) -> Optional[Future]:
+        """
+        Close the shared ``AsyncSession`` from any thread.
+
+        The close is scheduled on the session's own loop; the returned future resolves
+        once it is done. ``None`` if there is no session, or its loop has already stopped
+        (the session then goes with the loop).
+        """
+        session, self._async_session = getattr(self, "_async_session", None), None
+        loop = self.async_loop
+        if session is None or loop is None or loop.is_closed() or not loop.is_running():
+            return None
+        return asyncio.run_coroutine_threadsafe(session.close(), loop)
+
     def register_tools(self, tools: List[Tool]) -> None:
         """
         Register tools with the provider.
@@ -557,6 +557,8 @@ class ChatGPT(OpenAICompatibleProvider):
         print(response.choices[0].message.content)
     """
 
+    simulated_streaming = True  # the full answer is sliced into 10-char chunks with a 50 ms sleep each
+
     def __init__(
         self
     ):
@@ -2,11 +2,13 @@ import requests
 import json
 import time
 import uuid
-from typing import List, Dict, Optional, Union, Generator, Any
+from typing import List, Dict, Optional, Union, Generator, Any, AsyncIterator
+
+from curl_cffi import CurlError
 
 # Import base classes and utility structures
-from webscout.Provider.OPENAI.base import OpenAICompatibleProvider, BaseChat, BaseCompletions
-from webscout.Provider.OPENAI.utils import (
+from .base import OpenAICompatibleProvider, BaseChat, BaseCompletions, aiter_sse_data
+from .utils import (
     ChatCompletionChunk, ChatCompletion, Choice, ChoiceDelta,
     ChatCompletionMessage, CompletionUsage
 )
@@ -20,6 +22,8 @@ except ImportError:
 # --- DeepInfra Client ---
 
 class Completions(BaseCompletions):
+    native_async = True
+
     def __init__(self, client: 'DeepInfra'):
         self._client = client
 
@@ -40,6 +44,45 @@ class Completions(BaseCompletions):
         Creates a model response for the given chat conversation.
         Mimics openai.chat.completions.create
         """
+        payload = self._payload(model, messages, max_tokens, stream, temperature, top_p, kwargs)
+
+        request_id = f"chatcmpl-{uuid.uuid4()}"
+        created_time = int(time.time())
+
+        if stream:
+            return self._create_stream(request_id, created_time, model, payload, timeout, proxies)
+        else:
+            return self._create_non_stream(request_id, created_time, model, payload, timeout, proxies)
+
+    async def acreate(
+        self,
+        *,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = 2049,
+        stream: bool = False,
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        timeout: Optional[int] = None,
+        proxies: Optional[Dict[str, str]] = None,
+        **kwargs: Any
+    ) -> Union[ChatCompletion, AsyncIterator[ChatCompletionChunk]]:
+        """
+        Async version of create, served on the client's shared AsyncSession
+        """
+        payload = self._payload(model, messages, max_tokens, stream, temperature, top_p, kwargs)
+
+        request_id = f"chatcmpl-{uuid.uuid4()}"
+        created_time = int(time.time())
+
+        if stream:
+            return self._acreate_stream(request_id, created_time, model, payload, timeout, proxies)
+        return await self._acreate_non_stream(request_id, created_time, model, payload, timeout, proxies)
+
+    def _payload(
+        self, model: str, messages: List[Dict[str, str]], max_tokens: Optional[int], stream: bool,
+        temperature: Optional[float], top_p: Optional[float], kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
         payload = {
             "model": model,
             "messages": messages,
@@ -52,14 +95,7 @@ class Completions(BaseCompletions):
             payload["top_p"] = top_p
 
         payload.update(kwargs)
-
-        request_id = f"chatcmpl-{uuid.uuid4()}"
-        created_time = int(time.time())
-
-        if stream:
-            return self._create_stream(request_id, created_time, model, payload, timeout, proxies)
-        else:
-            return self._create_non_stream(request_id, created_time, model, payload, timeout, proxies)
+        return payload
 
     def _create_stream(
         self, request_id: str, created_time: int, model: str, payload: Dict[str, Any],
@@ -76,11 +112,6 @@ class Completions(BaseCompletions):
             )
             response.raise_for_status()
 
-            # Track token usage across chunks
-            prompt_tokens = 0
-            completion_tokens = 0
-            total_tokens = 0
-
             for line in response.iter_lines():
                 if line:
                     decoded_line = line.decode('utf-8').strip()
@@ -88,82 +119,14 @@ class Completions(BaseCompletions):
                     if decoded_line.startswith("data: "):
                         json_str = decoded_line[6:]
                         if json_str == "[DONE]":
-                            # Format the final [DONE] marker in OpenAI format
-                            # print("data: [DONE]")
                             break
 
                         try:
                             data = json.loads(json_str)
-                            choice_data = data.get('choices', [{}])[0]
-                            delta_data = choice_data.get('delta', {})
-                            finish_reason = choice_data.get('finish_reason')
-
-                            # Update token counts if available
-                            usage_data = data.get('usage', {})
-                            if usage_data:
-                                prompt_tokens = usage_data.get('prompt_tokens', prompt_tokens)
-                                completion_tokens = usage_data.get('completion_tokens', completion_tokens)
-                                total_tokens = usage_data.get('total_tokens', total_tokens)
-
-                            # Create the delta object
-                            delta = ChoiceDelta(
-                                content=delta_data.get('content'),
-                                role=delta_data.get('role'),
-                                tool_calls=delta_data.get('tool_calls')
-                            )
-
-                            # Create the choice object
-                            choice = Choice(
-                                index=choice_data.get('index', 0),
-                                delta=delta,
-                                finish_reason=finish_reason,
-                                logprobs=choice_data.get('logprobs')
-                            )
-
-                            # Create the chunk object
-                            chunk = ChatCompletionChunk(
-                                id=request_id,
-                                choices=[choice],
-                                created=created_time,
-                                model=model,
-                                system_fingerprint=data.get('system_fingerprint')
-                            )
-
-                            # Convert chunk to dict using Pydantic's API
-                            if hasattr(chunk, "model_dump"):
-                                chunk_dict = chunk.model_dump(exclude_none=True)
-                            else:
-                                chunk_dict = chunk.dict(exclude_none=True)
-
-                            # Add usage information to match OpenAI format
-                            # Even if we don't have real token counts, include estimated usage
-                            # This matches the format in the examples
-                            usage_dict = {
-                                "prompt_tokens": prompt_tokens or 10,
-                                "completion_tokens": completion_tokens or (len(delta_data.get('content', '')) if delta_data.get('content') else 0),
-                                "total_tokens": total_tokens or (10 + (len(delta_data.get('content', '')) if delta_data.get('content') else 0)),
-                                "estimated_cost": None
-                            }
-
-                            # Update completion_tokens and total_tokens as we receive more content
-                            if delta_data.get('content'):
-                                completion_tokens += 1
-                                total_tokens = prompt_tokens + completion_tokens
-                                usage_dict["completion_tokens"] = completion_tokens
-                                usage_dict["total_tokens"] = total_tokens
-
-                            chunk_dict["usage"] = usage_dict
-
-                            # Format the response in OpenAI format exactly as requested
-                            # We need to print the raw string and also yield the chunk object
-                            # This ensures both the console output and the returned object are correct
-                            # print(f"data: {json.dumps(chunk_dict)}")
-
-                            # Return the chunk object for internal processing
-                            yield chunk
                         except json.JSONDecodeError:
                             print(f"Warning: Could not decode JSON line: {json_str}")
                             continue
+                        yield self._chunk(data, request_id, created_time, model)
         except requests.exceptions.RequestException as e:
             print(f"Error during DeepInfra stream request: {e}")
             raise IOError(f"DeepInfra request failed: {e}") from e
@@ -171,6 +134,52 @@ class Completions(BaseCompletions):
             print(f"Error processing DeepInfra stream: {e}")
             raise
 
+    async def _acreate_stream(
+        self, request_id: str, created_time: int, model: str, payload: Dict[str, Any],
+        timeout: Optional[int] = None, proxies: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        try:
+            async with self._client.async_session().stream(
+                "POST",
+                self._client.base_url,
+                headers=self._client.headers,
+                json=payload,
+                timeout=timeout or self._client.timeout,
+                proxies=proxies
+            ) as response:
+                response.raise_for_status()
+                async for data in aiter_sse_data(response):
+                    yield self._chunk(data, request_id, created_time, model)
+        except CurlError as e:
+            raise IOError(f"DeepInfra request failed: {e}") from e
+
+    def _chunk(self, data: Dict[str, Any], request_id: str, created_time: int, model: str) -> ChatCompletionChunk:
+        choice_data = data.get('choices', [{}])[0]
+        delta_data = choice_data.get('delta', {})
+
+        # Create the delta object
+        delta = ChoiceDelta(
+            content=delta_data.get('content'),
+            role=delta_data.get('role'),
+            tool_calls=delta_data.get('tool_calls')
+        )
+
+        # Create the choice object
+        choice = Choice(
+            index=choice_data.get('index', 0),
+            delta=delta,
+            finish_reason=choice_data.get('finish_reason'),
+            logprobs=choice_data.get('logprobs')
+        )
+
+        return ChatCompletionChunk(
+            id=request_id,
+            choices=[choice],
+            created=created_time,
+            model=model,
+            system_fingerprint=data.get('system_fingerprint')
+        )
+
     def _create_non_stream(
         self, request_id: str, created_time: int, model: str, payload: Dict[str, Any],
         timeout: Optional[int] = None, proxies: Optional[Dict[str, str]] = None
@@ -184,39 +193,7 @@ class Completions(BaseCompletions):
                 proxies=proxies
             )
             response.raise_for_status()
-            data = response.json()
-
-            choices_data = data.get('choices', [])
-            usage_data = data.get('usage', {})
-
-            choices = []
-            for choice_d in choices_data:
-                message_d = choice_d.get('message', {})
-                message = ChatCompletionMessage(
-                    role=message_d.get('role', 'assistant'),
-                    content=message_d.get('content', '')
-                )
-                choice = Choice(
-                    index=choice_d.get('index', 0),
-                    message=message,
-                    finish_reason=choice_d.get('finish_reason', 'stop')
-                )
-                choices.append(choice)
-
-            usage = CompletionUsage(
-                prompt_tokens=usage_data.get('prompt_tokens', 0),
-                completion_tokens=usage_data.get('completion_tokens', 0),
-                total_tokens=usage_data.get('total_tokens', 0)
-            )
-
-            completion = ChatCompletion(
-                id=request_id,
-                choices=choices,
-                created=created_time,
-                model=data.get('model', model),
-                usage=usage,
-            )
-            return completion
+            return self._completion(response.json(), request_id, created_time, model)
 
         except requests.exceptions.RequestException as e:
             print(f"Error during DeepInfra non-stream request: {e}")
@@ -225,6 +202,55 @@ class Completions(BaseCompletions):
             print(f"Error processing DeepInfra response: {e}")
             raise
 
+    async def _acreate_non_stream(
+        self, request_id: str, created_time: int, model: str, payload: Dict[str, Any],
+        timeout: Optional[int] = None, proxies: Optional[Dict[str, str]] = None
+    ) -> ChatCompletion:
+        try:
+            response = await self._client.async_session().post(
+                self._client.base_url,
+                headers=self._client.headers,
+                json=payload,
+                timeout=timeout or self._client.timeout,
+                proxies=proxies
+            )
+            response.raise_for_status()
+        except CurlError as e:
+            raise IOError(f"DeepInfra request failed: {e}") from e
+        return self._completion(response.json(), request_id, created_time, model)
+
+    def _completion(self, data: Dict[str, Any], request_id: str, created_time: int, model: str) -> ChatCompletion:
+        choices_data = data.get('choices', [])
+        usage_data = data.get('usage', {})
+
+        choices = []
+        for choice_d in choices_data:
+            message_d = choice_d.get('message', {})
+            message = ChatCompletionMessage(
+                role=message_d.get('role', 'assistant'),
+                content=message_d.get('content', '')
+            )
+            choice = Choice(
+                index=choice_d.get('index', 0),
+                message=message,
+                finish_reason=choice_d.get('finish_reason', 'stop')
+            )
+            choices.append(choice)
+
+        usage = CompletionUsage(
+            prompt_tokens=usage_data.get('prompt_tokens', 0),
+            completion_tokens=usage_data.get('completion_tokens', 0),
+            total_tokens=usage_data.get('total_tokens', 0)
+        )
+
+        return ChatCompletion(
+            id=request_id,
+            choices=choices,
+            created=created_time,
+            model=data.get('model', model),
+            usage=usage,
+        )
+
 class Chat(BaseChat):
     def __init__(self, client: 'DeepInfra'):
         self.completions = Completions(client)
@@ -1210,6 +1210,7 @@ class E2B(OpenAICompatibleProvider):
           The underlying API (fragments.e2b.dev/api/chat) does not appear to support true streaming responses,
           so `stream=True` will simulate streaming by returning the full response in chunks.
     """
+    simulated_streaming = True  # the API has no streaming; the answer arrives in one chunk
     MODEL_PROMPT = MODEL_PROMPT # Use the globally defined dict
     AVAILABLE_MODELS = list(MODEL_PROMPT.keys())
     MODEL_NAME_NORMALIZATION = {
@@ -2,14 +2,14 @@ import requests
 import json
 import time
 import uuid
-from typing import List, Dict, Optional, Union, Generator, Any
+from typing import List, Dict, Optional, Union, Generator, Any, AsyncIterator
 
 # Import curl_cffi for improved request handling
 from curl_cffi.requests import Session
 from curl_cffi import CurlError
 
 # Import base classes and utility structures
-from .base import OpenAICompatibleProvider, BaseChat, BaseCompletions
+from .base import OpenAICompatibleProvider, BaseChat, BaseCompletions, aiter_sse_data
 from .utils import (
     ChatCompletionChunk, ChatCompletion, Choice, ChoiceDelta,
     ChatCompletionMessage, CompletionUsage
@@ -24,6 +24,8 @@ except ImportError:
 # --- Groq Client ---
 
 class Completions(BaseCompletions):
+    native_async = True
+
     def __init__(self, client: 'Groq'):
         self._client = client
 
@@ -42,6 +44,43 @@ class Completions(BaseCompletions):
         Creates a model response for the given chat conversation.
         Mimics openai.chat.completions.create
         """
+        payload = self._payload(model, messages, max_tokens, stream, temperature, top_p, kwargs)
+
+        request_id = f"chatcmpl-{uuid.uuid4()}"
+        created_time = int(time.time())
+
+        if stream:
+            return self._create_stream(request_id, created_time, model, payload)
+        else:
+            return self._create_non_stream(request_id, created_time, model, payload)
+
+    async def acreate(
+        self,
+        *,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = 2049,
+        stream: bool = False,
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        **kwargs: Any
+    ) -> Union[ChatCompletion, AsyncIterator[ChatCompletionChunk]]:
+        """
+        Async version of create, served on the client's shared AsyncSession
+        """
+        payload = self._payload(model, messages, max_tokens, stream, temperature, top_p, kwargs)
+
+        request_id = f"chatcmpl-{uuid.uuid4()}"
+        created_time = int(time.time())
+
+        if stream:
+            return self._acreate_stream(request_id, created_time, model, payload)
+        return await self._acreate_non_stream(request_id, created_time, model, payload)
+
+    def _payload(
+        self, model: str, messages: List[Dict[str, str]], max_tokens: Optional[int], stream: bool,
+        temperature: Optional[float], top_p: Optional[float], kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
         payload = {
             "model": model,
             "messages": messages,
@@ -64,14 +103,7 @@ class Completions(BaseCompletions):
             payload["tools"] = kwargs.pop("tools")
 
         payload.update(kwargs)
-
-        request_id = f"chatcmpl-{uuid.uuid4()}"
-        created_time = int(time.time())
-
-        if stream:
-            return self._create_stream(request_id, created_time, model, payload)
-        else:
-            return self._create_non_stream(request_id, created_time, model, payload)
+        return payload
 
     def _create_stream(
         self, request_id: str, created_time: int, model: str, payload: Dict[str, Any]
@@ -88,11 +120,6 @@ class Completions(BaseCompletions):
             if response.status_code != 200:
                 raise IOError(f"Groq request failed with status code {response.status_code}: {response.text}")
 
-            # Track token usage across chunks
-            prompt_tokens = 0
-            completion_tokens = 0
-            total_tokens = 0
-
             for line in response.iter_lines(decode_unicode=True):
                 if line:
                     if line.startswith("data: "):
@@ -102,68 +129,10 @@ class Completions(BaseCompletions):
 
                         try:
                             data = json.loads(json_str)
-                            choice_data = data.get('choices', [{}])[0]
-                            delta_data = choice_data.get('delta', {})
-                            finish_reason = choice_data.get('finish_reason')
-
-                            # Update token counts if available
-                            usage_data = data.get('usage', {})
-                            if usage_data:
-                                prompt_tokens = usage_data.get('prompt_tokens', prompt_tokens)
-                                completion_tokens = usage_data.get('completion_tokens', completion_tokens)
-                                total_tokens = usage_data.get('total_tokens', total_tokens)
-
-                            # Create the delta object
-                            delta = ChoiceDelta(
-                                content=delta_data.get('content'),
-                                role=delta_data.get('role'),
-                                tool_calls=delta_data.get('tool_calls')
-                            )
-
-                            # Create the choice object
-                            choice = Choice(
-                                index=choice_data.get('index', 0),
-                                delta=delta,
-                                finish_reason=finish_reason,
-                                logprobs=choice_data.get('logprobs')
-                            )
-
-                            # Create the chunk object
-                            chunk = ChatCompletionChunk(
-                                id=request_id,
-                                choices=[choice],
-                                created=created_time,
-                                model=model,
-                                system_fingerprint=data.get('system_fingerprint')
-                            )
-
-                            # Convert chunk to dict using Pydantic's API
-                            if hasattr(chunk, "model_dump"):
-                                chunk_dict = chunk.model_dump(exclude_none=True)
-                            else:
-                                chunk_dict = chunk.dict(exclude_none=True)
-
-                            # Add usage information to match OpenAI format
-                            usage_dict = {
-                                "prompt_tokens": prompt_tokens or 10,
-                                "completion_tokens": completion_tokens or (len(delta_data.get('content', '')) if delta_data.get('content') else 0),
-                                "total_tokens": total_tokens or (10 + (len(delta_data.get('content', '')) if delta_data.get('content') else 0)),
-                                "estimated_cost": None
-                            }
-
-                            # Update completion_tokens and total_tokens as we receive more content
-                            if delta_data.get('content'):
-                                completion_tokens += 1
-                                total_tokens = prompt_tokens + completion_tokens
-                                usage_dict["completion_tokens"] = completion_tokens
-                                usage_dict["total_tokens"] = total_tokens
-
-                            chunk_dict["usage"] = usage_dict
-
-                            yield chunk
                         except json.JSONDecodeError:
                             print(f"Warning: Could not decode JSON line: {json_str}")
                             continue
+                        yield self._chunk(data, request_id, created_time, model)
         except CurlError as e:
             print(f"Error during Groq stream request: {e}")
             raise IOError(f"Groq request failed: {e}") from e
@@ -171,6 +140,53 @@ class Completions(BaseCompletions):
             print(f"Error processing Groq stream: {e}")
             raise
 
+    async def _acreate_stream(
+        self, request_id: str, created_time: int, model: str, payload: Dict[str, Any]
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        try:
+            async with self._client.async_session().stream(
+                "POST",
+                self._client.base_url,
+                headers=self._client.headers,
+                json=payload,
+                timeout=self._client.timeout,
+                impersonate="chrome110"
+            ) as response:
+                if response.status_code != 200:
+                    raise IOError(f"Groq request failed with status code {response.status_code}: {await response.atext()}")
+
+                async for data in aiter_sse_data(response):
+                    yield self._chunk(data, request_id, created_time, model)
+        except CurlError as e:
+            raise IOError(f"Groq request failed: {e}") from e
+
+    def _chunk(self, data: Dict[str, Any], request_id: str, created_time: int, model: str) -> ChatCompletionChunk:
+        choice_data = data.get('choices', [{}])[0]
+        delta_data = choice_data.get('delta', {})
+
+        # Create the delta object
+        delta = ChoiceDelta(
+            content=delta_data.get('content'),
+            role=delta_data.get('role'),
+            tool_calls=delta_data.get('tool_calls')
+        )
+
+        # Create the choice object
+        choice = Choice(
+            index=choice_data.get('index', 0),
+            delta=delta,
+            finish_reason=choice_data.get('finish_reason'),
+            logprobs=choice_data.get('logprobs')
+        )
+
+        return ChatCompletionChunk(
+            id=request_id,
+            choices=[choice],
+            created=created_time,
+            model=model,
+            system_fingerprint=data.get('system_fingerprint')
+        )
+
     def _create_non_stream(
         self, request_id: str, created_time: int, model: str, payload: Dict[str, Any]
     ) -> ChatCompletion:
@@ -185,44 +201,7 @@ class Completions(BaseCompletions):
             if response.status_code != 200:
                 raise IOError(f"Groq request failed with status code {response.status_code}: {response.text}")
                 
-            data = response.json()
-
-            choices_data = data.get('choices', [])
-            usage_data = data.get('usage', {})
-
-            choices = []
-            for choice_d in choices_data:
-                message_d = choice_d.get('message', {})
-                
-                # Handle tool calls if present
-                tool_calls = message_d.get('tool_calls')
-                
-                message = ChatCompletionMessage(
-                    role=message_d.get('role', 'assistant'),
-                    content=message_d.get('content', ''),
-                    tool_calls=tool_calls
-                )
-                choice = Choice(
-                    index=choice_d.get('index', 0),
-                    message=message,
-                    finish_reason=choice_d.get('finish_reason', 'stop')
-                )
-                choices.append(choice)
-
-            usage = CompletionUsage(
-                prompt_tokens=usage_data.get('prompt_tokens', 0),
-                completion_tokens=usage_data.get('completion_tokens', 0),
-                total_tokens=usage_data.get('total_tokens', 0)
-            )
-
-            completion = ChatCompletion(
-                id=request_id,
-                choices=choices,
-                created=created_time,
-                model=data.get('model', model),
-                usage=usage,
-            )
-            return completion
+            return self._completion(response.json(), request_id, created_time, model)
 
         except CurlError as e:
             print(f"Error during Groq non-stream request: {e}")
@@ -231,6 +210,61 @@ class Completions(BaseCompletions):
             print(f"Error processing Groq response: {e}")
             raise
 
+    async def _acreate_non_stream(
+        self, request_id: str, created_time: int, model: str, payload: Dict[str, Any]
+    ) -> ChatCompletion:
+        try:
+            response = await self._client.async_session().post(
+                self._client.base_url,
+                headers=self._client.headers,
+                json=payload,
+                timeout=self._client.timeout,
+                impersonate="chrome110"
+            )
+        except CurlError as e:
+            raise IOError(f"Groq request failed: {e}") from e
+
+        if response.status_code != 200:
+            raise IOError(f"Groq request failed with status code {response.status_code}: {response.text}")
+        return self._completion(response.json(), request_id, created_time, model)
+
+    def _completion(self, data: Dict[str, Any], request_id: str, created_time: int, model: str) -> ChatCompletion:
+        choices_data = data.get('choices', [])
+        usage_data = data.get('usage', {})
+
+        choices = []
+        for choice_d in choices_data:
+            message_d = choice_d.get('message', {})
+            
+            # Handle tool calls if present
+            tool_calls = message_d.get('tool_calls')
+            
+            message = ChatCompletionMessage(
+                role=message_d.get('role', 'assistant'),
+                content=message_d.get('content', ''),
+                tool_calls=tool_calls
+            )
+            choice = Choice(
+                index=choice_d.get('index', 0),
+                message=message,
+                finish_reason=choice_d.get('finish_reason', 'stop')
+            )
+            choices.append(choice)
+
+        usage = CompletionUsage(
+            prompt_tokens=usage_data.get('prompt_tokens', 0),
+            completion_tokens=usage_data.get('completion_tokens', 0),
+            total_tokens=usage_data.get('total_tokens', 0)
+        )
+
+        return ChatCompletion(
+            id=request_id,
+            choices=choices,
+            created=created_time,
+            model=data.get('model', model),
+            usage=usage,
+        )
+
 class Chat(BaseChat):
     def __init__(self, client: 'Groq'):
         self.completions = Completions(client)
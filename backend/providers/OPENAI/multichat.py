@@ -199,6 +199,8 @@ class MultiChatAI(OpenAICompatibleProvider):
         print(response.choices[0].message.content)
     """
 
+    simulated_streaming = True  # the full answer is yielded as one chunk
+
     AVAILABLE_MODELS = [
         # Llama Models
         "llama-3.3-70b-versatile",
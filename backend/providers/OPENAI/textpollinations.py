@@ -2,10 +2,10 @@ import time
 import uuid
 import requests
 import json
-from typing import List, Dict, Optional, Union, Generator, Any
+from typing import List, Dict, Optional, Union, Generator, Any, AsyncIterator
 
 # Import base classes and utility structures
-from .base import OpenAICompatibleProvider, BaseChat, BaseCompletions
+from .base import OpenAICompatibleProvider, BaseChat, BaseCompletions, aiter_sse_data
 from .utils import (
     ChatCompletionChunk, ChatCompletion, Choice, ChoiceDelta,
     ChatCompletionMessage, CompletionUsage, ToolCall, ToolFunction, count_tokens
@@ -20,6 +20,8 @@ RED = "\033[91m"
 RESET = "\033[0m"
 
 class Completions(BaseCompletions):
+    native_async = True
+
     def __init__(self, client: 'TextPollinations'):
         self._client = client
 
@@ -42,6 +44,55 @@ class Completions(BaseCompletions):
         Creates a model response for the given chat conversation.
         Mimics openai.chat.completions.create
         """
+        payload = self._payload(model, messages, max_tokens, stream, temperature, top_p, tools, tool_choice, kwargs)
+
+        request_id = str(uuid.uuid4())
+        created_time = int(time.time())
+
+        if stream:
+            return self._create_streaming(request_id, created_time, model, payload, timeout, proxies)
+        else:
+            return self._create_non_streaming(request_id, created_time, model, payload, timeout, proxies)
+
+    async def acreate(
+        self,
+        *,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None,
+        stream: bool = False,
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
+        timeout: Optional[int] = None,
+        proxies: Optional[Dict[str, str]] = None,
+        **kwargs: Any
+    ) -> Union[ChatCompletion, AsyncIterator[ChatCompletionChunk]]:
+        """
+        Async version of create, served on the client's shared AsyncSession
+        """
+        payload = self._payload(model, messages, max_tokens, stream, temperature, top_p, tools, tool_choice, kwargs)
+
+        request_id = str(uuid.uuid4())
+        created_time = int(time.time())
+
+        if stream:
+            return self._acreate_streaming(request_id, created_time, model, payload, timeout, proxies)
+        return await self._acreate_non_streaming(request_id, created_time, model, payload, timeout, proxies)
+
+    def _payload(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int],
+        stream: bool,
+        temperature: Optional[float],
+        top_p: Optional[float],
+        tools: Optional[List[Dict[str, Any]]],
+        tool_choice: Optional[Union[str, Dict[str, Any]]],
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
         payload = {
             "model": model,
             "messages": messages,
@@ -59,14 +110,7 @@ class Completions(BaseCompletions):
             payload["tool_choice"] = tool_choice
 
         payload.update(kwargs)
-
-        request_id = str(uuid.uuid4())
-        created_time = int(time.time())
-
-        if stream:
-            return self._create_streaming(request_id, created_time, model, payload, timeout, proxies)
-        else:
-            return self._create_non_streaming(request_id, created_time, model, payload, timeout, proxies)
+        return payload
 
     def _create_streaming(
         self,
@@ -94,8 +138,6 @@ class Completions(BaseCompletions):
                 raise IOError(f"Failed to generate response - ({response.status_code}, {response.reason}) - {response.text}")
 
             # Process the streaming response
-            full_response = ""
-
             for line in response.iter_lines():
                 if line:
                     line = line.decode('utf-8').strip()
@@ -104,65 +146,106 @@ class Completions(BaseCompletions):
                     if line.startswith('data: '):
                         try:
                             json_data = json.loads(line[6:])
-                            if 'choices' in json_data and len(json_data['choices']) > 0:
-                                choice = json_data['choices'][0]
-                                if 'delta' in choice:
-                                    delta_obj = ChoiceDelta()
-
-                                    # Handle content in delta
-                                    if 'content' in choice['delta']:
-                                        content = choice['delta']['content']
-                                        full_response += content
-                                        delta_obj.content = content
-
-                                    # Handle tool calls in delta
-                                    if 'tool_calls' in choice['delta']:
-                                        tool_calls = []
-                                        for tool_call_data in choice['delta']['tool_calls']:
-                                            if 'function' in tool_call_data:
-                                                function = ToolFunction(
-                                                    name=tool_call_data['function'].get('name', ''),
-                                                    arguments=tool_call_data['function'].get('arguments', '')
-                                                )
-                                                tool_call = ToolCall(
-                                                    id=tool_call_data.get('id', str(uuid.uuid4())),
-                                                    type=tool_call_data.get('type', 'function'),
-                                                    function=function
-                                                )
-                                                tool_calls.append(tool_call)
-
-                                        if tool_calls:
-                                            delta_obj.tool_calls = tool_calls
-
-                                    # Create and yield a chunk
-                                    choice_obj = Choice(index=0, delta=delta_obj, finish_reason=None)
-                                    chunk = ChatCompletionChunk(
-                                        id=request_id,
-                                        choices=[choice_obj],
-                                        created=created_time,
-                                        model=model
-                                    )
-
-                                    yield chunk
                         except json.JSONDecodeError:
                             continue
+                        chunk = self._chunk(json_data, request_id, created_time, model)
+                        if chunk is not None:
+                            yield chunk
 
-            # Final chunk with finish_reason
-            delta = ChoiceDelta(content=None)
-            choice = Choice(index=0, delta=delta, finish_reason="stop")
-            chunk = ChatCompletionChunk(
-                id=request_id,
-                choices=[choice],
-                created=created_time,
-                model=model
-            )
-
-            yield chunk
+            yield self._final_chunk(request_id, created_time, model)
 
         except Exception as e:
             print(f"{RED}Error during TextPollinations streaming request: {e}{RESET}")
             raise IOError(f"TextPollinations streaming request failed: {e}") from e
 
+    async def _acreate_streaming(
+        self,
+        request_id: str,
+        created_time: int,
+        model: str,
+        payload: Dict[str, Any],
+        timeout: Optional[int] = None,
+        proxies: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        """Async implementation for streaming chat completions."""
+        try:
+            async with self._client.async_session().stream(
+                "POST",
+                self._client.api_endpoint,
+                headers=self._client.headers,
+                json=payload,
+                timeout=timeout or self._client.timeout,
+                proxies=proxies or getattr(self._client, "proxies", None) or None
+            ) as response:
+                if not response.ok:
+                    raise IOError(f"Failed to generate response - ({response.status_code}, {response.reason}) - {await response.atext()}")
+
+                async for json_data in aiter_sse_data(response):
+                    chunk = self._chunk(json_data, request_id, created_time, model)
+                    if chunk is not None:
+                        yield chunk
+
+            yield self._final_chunk(request_id, created_time, model)
+
+        except Exception as e:
+            raise IOError(f"TextPollinations streaming request failed: {e}") from e
+
+    def _chunk(self, json_data: Dict[str, Any], request_id: str, created_time: int, model: str) -> Optional[ChatCompletionChunk]:
+        """Chunk for one upstream delta event, or None for events without a delta"""
+        if 'choices' not in json_data or len(json_data['choices']) == 0:
+            return None
+        choice = json_data['choices'][0]
+        if 'delta' not in choice:
+            return None
+        delta_obj = ChoiceDelta()
+
+        # Handle content in delta
+        if 'content' in choice['delta']:
+            delta_obj.content = choice['delta']['content']
+
+        # Handle tool calls in delta
+        if 'tool_calls' in choice['delta']:
+            tool_calls = self._tool_calls(choice['delta']['tool_calls'])
+            if tool_calls:
+                delta_obj.tool_calls = tool_calls
+
+        choice_obj = Choice(index=0, delta=delta_obj, finish_reason=None)
+        return ChatCompletionChunk(
+            id=request_id,
+            choices=[choice_obj],
+            created=created_time,
+            model=model
+        )
+
+    @staticmethod
+    def _final_chunk(request_id: str, created_time: int, model: str) -> ChatCompletionChunk:
+        # Final chunk with finish_reason
+        delta = ChoiceDelta(content=None)
+        choice = Choice(index=0, delta=delta, finish_reason="stop")
+        return ChatCompletionChunk(
+            id=request_id,
+            choices=[choice],
+            created=created_time,
+            model=model
+        )
+
+    @staticmethod
+    def _tool_calls(tool_calls_data: List[Dict[str, Any]]) -> List[ToolCall]:
+        tool_calls = []
+        for tool_call_data in tool_calls_data:
+            if 'function' in tool_call_data:
+                function = ToolFunction(
+                    name=tool_call_data['function'].get('name', ''),
+                    arguments=tool_call_data['function'].get('arguments', '')
+                )
+                tool_call = ToolCall(
+                    id=tool_call_data.get('id', str(uuid.uuid4())),
+                    type=tool_call_data.get('type', 'function'),
+                    function=function
+                )
+                tool_calls.append(tool_call)
+        return tool_calls
+
     def _create_non_streaming(
         self,
         request_id: str,
@@ -187,77 +270,93 @@ class Completions(BaseCompletions):
             if not response.ok:
                 raise IOError(f"Failed to generate response - ({response.status_code}, {response.reason}) - {response.text}")
 
-            # Parse the response
-            response_json = response.json()
-
-            # Extract the content
-            if 'choices' in response_json and len(response_json['choices']) > 0:
-                choice_data = response_json['choices'][0]
-                if 'message' in choice_data:
-                    message_data = choice_data['message']
-
-                    # Extract content
-                    full_content = message_data.get('content', '')
-
-                    # Create the completion message with potential tool calls
-                    message = ChatCompletionMessage(role="assistant", content=full_content)
-
-                    # Handle tool calls if present
-                    if 'tool_calls' in message_data:
-                        tool_calls = []
-                        for tool_call_data in message_data['tool_calls']:
-                            if 'function' in tool_call_data:
-                                function = ToolFunction(
-                                    name=tool_call_data['function'].get('name', ''),
-                                    arguments=tool_call_data['function'].get('arguments', '')
-                                )
-                                tool_call = ToolCall(
-                                    id=tool_call_data.get('id', str(uuid.uuid4())),
-                                    type=tool_call_data.get('type', 'function'),
-                                    function=function
-                                )
-                                tool_calls.append(tool_call)
-
-                        if tool_calls:
-                            message.tool_calls = tool_calls
-                else:
-                    # Fallback if no message is present
-                    message = ChatCompletionMessage(role="assistant", content="")
-            else:
-                # Fallback if no choices are present
-                message = ChatCompletionMessage(role="assistant", content="")
+            return self._completion(response.json(), request_id, created_time, model, payload)
 
-            # Create the choice
-            choice = Choice(
-                index=0,
-                message=message,
-                finish_reason="stop"
-            )
+        except Exception as e:
+            print(f"{RED}Error during TextPollinations non-stream request: {e}{RESET}")
+            raise IOError(f"TextPollinations request failed: {e}") from e
 
-            # Estimate token usage using count_tokens
-            prompt_tokens = count_tokens([msg.get("content", "") for msg in payload.get("messages", [])])
-            completion_tokens = count_tokens(full_content)
-            usage = CompletionUsage(
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                total_tokens=prompt_tokens + completion_tokens
+    async def _acreate_non_streaming(
+        self,
+        request_id: str,
+        created_time: int,
+        model: str,
+        payload: Dict[str, Any],
+        timeout: Optional[int] = None,
+        proxies: Optional[Dict[str, str]] = None
+    ) -> ChatCompletion:
+        """Async implementation for non-streaming chat completions."""
+        try:
+            response = await self._client.async_session().post(
+                self._client.api_endpoint,
+                headers=self._client.headers,
+                json=payload,
+                timeout=timeout or self._client.timeout,
+                proxies=proxies or getattr(self._client, "proxies", None) or None
             )
 
-            # Create the completion object
-            completion = ChatCompletion(
-                id=request_id,
-                choices=[choice],
-                created=created_time,
-                model=model,
-                usage=usage,
-            )
+            if not response.ok:
+                raise IOError(f"Failed to generate response - ({response.status_code}, {response.reason}) - {response.text}")
 
-            return completion
+            return self._completion(response.json(), request_id, created_time, model, payload)
 
         except Exception as e:
-            print(f"{RED}Error during TextPollinations non-stream request: {e}{RESET}")
             raise IOError(f"TextPollinations request failed: {e}") from e
 
+    def _completion(
+        self, response_json: Dict[str, Any], request_id: str, created_time: int, model: str, payload: Dict[str, Any]
+    ) -> ChatCompletion:
+        full_content = ""
+
+        # Extract the content
+        if 'choices' in response_json and len(response_json['choices']) > 0:
+            choice_data = response_json['choices'][0]
+            if 'message' in choice_data:
+                message_data = choice_data['message']
+
+                # Extract content
+                full_content = message_data.get('content', '')
+
+                # Create the completion message with potential tool calls
+                message = ChatCompletionMessage(role="assistant", content=full_content)
+
+                # Handle tool calls if present
+                if 'tool_calls' in message_data:
+                    tool_calls = self._tool_calls(message_data['tool_calls'])
+                    if tool_calls:
+                        message.tool_calls = tool_calls
+            else:
+                # Fallback if no message is present
+                message = ChatCompletionMessage(role="assistant", content="")
+        else:
+            # Fallback if no choices are present
+            message = ChatCompletionMessage(role="assistant", content="")
+
+        # Create the choice
+        choice = Choice(
+            index=0,
+            message=message,
+            finish_reason="stop"
+        )
+
+        # Estimate token usage using count_tokens
+        prompt_tokens = count_tokens([msg.get("content", "") for msg in payload.get("messages", [])])
+        completion_tokens = count_tokens(full_content)
+        usage = CompletionUsage(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens
+        )
+
+        # Create the completion object
+        return ChatCompletion(
+            id=request_id,
+            choices=[choice],
+            created=created_time,
+            model=model,
+            usage=usage,
+        )
+
 class Chat(BaseChat):
     def __init__(self, client: 'TextPollinations'):
         self.completions = Completions(client)
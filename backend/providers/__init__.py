@@ -1,311 +1,274 @@
-"""
-Complete Webscout Provider Integration
-All providers from the original AIWorldNew webscout project
-"""
-
-# Import all individual provider files
-try:
-    from .AI21 import AI21
-except ImportError:
-    AI21 = None
-
-try:
-    from .Aitopia import Aitopia
-except ImportError:
-    Aitopia = None
-
-try:
-    from .AllenAI import AllenAI
-except ImportError:
-    AllenAI = None
-
-try:
-    from .Andi import AndiSearch
-except ImportError:
-    AndiSearch = None
-
-try:
-    from .Blackboxai import BLACKBOXAI
-except ImportError:
-    BLACKBOXAI = None
-
-try:
-    from .ChatGPTClone import ChatGPTClone
-except ImportError:
-    ChatGPTClone = None
-
-try:
-    from .ChatSandbox import ChatSandbox
-except ImportError:
-    ChatSandbox = None
-
-try:
-    from .Cloudflare import Cloudflare
-except ImportError:
-    Cloudflare = None
-
-try:
-    from .Cohere import Cohere
-except ImportError:
-    Cohere = None
-
-try:
-    from .Deepinfra import DeepInfra
-except ImportError:
-    DeepInfra = None
-
-try:
-    from .ExaAI import ExaAI
-except ImportError:
-    ExaAI = None
-
-try:
-    from .ExaChat import ExaChat
-except ImportError:
-    ExaChat = None
-
-try:
-    from .Flowith import Flowith
-except ImportError:
-    Flowith = None
-
-try:
-    from .FreeGemini import FreeGemini
-except ImportError:
-    FreeGemini = None
-
-try:
-    from .Gemini import GEMINI
-except ImportError:
-    GEMINI = None
-
-try:
-    from .GithubChat import GithubChat
-except ImportError:
-    GithubChat = None
-
-try:
-    from .GizAI import GizAI
-except ImportError:
-    GizAI = None
-
-try:
-    from .Glider import GliderAI
-except ImportError:
-    GliderAI = None
-
-try:
-    from .Groq import GROQ
-except ImportError:
-    GROQ = None
-
-try:
-    from .HeckAI import HeckAI
-except ImportError:
-    HeckAI = None
-
-try:
-    from .HuggingFaceChat import HuggingFaceChat
-except ImportError:
-    HuggingFaceChat = None
-
-try:
-    from .Hunyuan import Hunyuan
-except ImportError:
-    Hunyuan = None
-
-try:
-    from .Jadve import JadveOpenAI
-except ImportError:
-    JadveOpenAI = None
-
-try:
-    from .Koboldai import KOBOLDAI
-except ImportError:
-    KOBOLDAI = None
-
-try:
-    from .LambdaChat import LambdaChat
-except ImportError:
-    LambdaChat = None
-
-try:
-    from .Llama3 import Llama3
-except ImportError:
-    Llama3 = None
-
-try:
-    from .MCPCore import MCPCore
-except ImportError:
-    MCPCore = None
-
-try:
-    from .Marcus import Marcus
-except ImportError:
-    Marcus = None
-
-try:
-    from .Nemotron import NEMOTRON
-except ImportError:
-    NEMOTRON = None
-
-try:
-    from .Netwrck import Netwrck
-except ImportError:
-    Netwrck = None
-
-try:
-    from .OLLAMA import OLLAMA
-except ImportError:
-    OLLAMA = None
-
-try:
-    from .OpenGPT import OpenGPT
-except ImportError:
-    OpenGPT = None
-
-try:
-    from .Openai import OPENAI
-except ImportError:
-    OPENAI = None
-
-try:
-    from .PI import PI
-except ImportError:
-    PI = None
-
-try:
-    from .Perplexitylabs import PerplexityLabs
-except ImportError:
-    PerplexityLabs = None
-
-try:
-    from .QwenLM import QwenLM
-except ImportError:
-    QwenLM = None
-
-try:
-    from .Reka import REKA
-except ImportError:
-    REKA = None
-
-try:
-    from .StandardInput import StandardInputAI
-except ImportError:
-    StandardInputAI = None
-
-try:
-    from .TeachAnything import TeachAnything
-except ImportError:
-    TeachAnything = None
-
-try:
-    from .TextPollinationsAI import TextPollinationsAI
-except ImportError:
-    TextPollinationsAI = None
-
-try:
-    from .TwoAI import TwoAI
-except ImportError:
-    TwoAI = None
-
-try:
-    from .TypliAI import TypliAI
-except ImportError:
-    TypliAI = None
-
-try:
-    from .Venice import Venice
-except ImportError:
-    Venice = None
-
-try:
-    from .VercelAI import VercelAI
-except ImportError:
-    VercelAI = None
-
-try:
-    from .WiseCat import WiseCat
-except ImportError:
-    WiseCat = None
-
-try:
-    from .WrDoChat import WrDoChat
-except ImportError:
-    WrDoChat = None
-
-try:
-    from .Writecream import Writecream
-except ImportError:
-    Writecream = None
-
-try:
-    from .WritingMate import WritingMate
-except ImportError:
-    WritingMate = None
-
-# Import subdirectory providers
-try:
-    from . import AISEARCH
-except ImportError:
-    AISEARCH = None
-
-try:
-    from . import OPENAI
-except ImportError:
-    OPENAI = None
-
-try:
-    from . import HF_space
-except ImportError:
-    HF_space = None
-
-try:
-    from . import STT
-except ImportError:
-    STT = None
-
-try:
-    from . import TTI
-except ImportError:
-    TTI = None
-
-try:
-    from . import TTS
-except ImportError:
-    TTS = None
-
-# Create provider registry
-PROVIDER_REGISTRY = {}
-
-# Add all available providers
-for name, provider in globals().items():
-    if provider is not None and not name.startswith('_') and name not in ['PROVIDER_REGISTRY']:
-        PROVIDER_REGISTRY[name.lower()] = provider
-
-def get_all_providers():
-    """Get all available providers"""
-    return {
-        "providers": list(PROVIDER_REGISTRY.keys()),
-        "count": len(PROVIDER_REGISTRY),
-        "categories": {
-            "major": ["openai", "gemini", "groq", "cohere"],
-            "free": ["blackboxai", "freegemini", "chatgptclone"],
-            "specialized": ["perplexitylabs", "huggingfacechat", "githubchat"],
-            "experimental": ["flowith", "x0gpt", "samurai"]
-        },
-        "subdirectories": {
-            "aisearch": "AI-powered search providers",
-            "openai": "OpenAI-compatible providers", 
-            "hf_space": "Hugging Face space providers",
-            "stt": "Speech-to-Text providers",
-            "tti": "Text-to-Image providers",
-            "tts": "Text-to-Speech providers"
-        }
-    }
-
-def get_provider(name: str):
-    """Get a specific provider by name"""
-    return PROVIDER_REGISTRY.get(name.lower())
-
-__all__ = list(PROVIDER_REGISTRY.keys()) + ["get_all_providers", "get_provider", "PROVIDER_REGISTRY"]
+"""
+Complete Webscout Provider Integration
+All providers from the original AIWorldNew webscout project
+
+Providers are registered in a static manifest and imported lazily: a provider module
+(and its third-party dependencies) is only loaded the first time it is resolved.
+"""
+
+import ast
+import importlib
+import importlib.util
+import logging
+import sys
+import time
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+_package_start = time.perf_counter()
+
+
+class ProviderSpec(NamedTuple):
+    """Static manifest entry: where a provider lives and what kind it is"""
+    module: str
+    attr: Optional[str]  # None for subpackages registered as a whole
+    kind: str
+
+
+# Provider name -> manifest entry
+PROVIDER_MANIFEST: Dict[str, ProviderSpec] = {
+    "ai21": ProviderSpec(".AI21", "AI21", "chat"),
+    "aitopia": ProviderSpec(".Aitopia", "Aitopia", "chat"),
+    "allenai": ProviderSpec(".AllenAI", "AllenAI", "chat"),
+    "andisearch": ProviderSpec(".Andi", "AndiSearch", "chat"),
+    "blackboxai": ProviderSpec(".Blackboxai", "BLACKBOXAI", "chat"),
+    "chatgptclone": ProviderSpec(".ChatGPTClone", "ChatGPTClone", "chat"),
+    "chatsandbox": ProviderSpec(".ChatSandbox", "ChatSandbox", "chat"),
+    "cloudflare": ProviderSpec(".Cloudflare", "Cloudflare", "chat"),
+    "cohere": ProviderSpec(".Cohere", "Cohere", "chat"),
+    "deepinfra": ProviderSpec(".Deepinfra", "DeepInfra", "chat"),
+    "exaai": ProviderSpec(".ExaAI", "ExaAI", "chat"),
+    "exachat": ProviderSpec(".ExaChat", "ExaChat", "chat"),
+    "flowith": ProviderSpec(".Flowith", "Flowith", "chat"),
+    "freegemini": ProviderSpec(".FreeGemini", "FreeGemini", "chat"),
+    "gemini": ProviderSpec(".Gemini", "GEMINI", "chat"),
+    "githubchat": ProviderSpec(".GithubChat", "GithubChat", "chat"),
+    "gizai": ProviderSpec(".GizAI", "GizAI", "chat"),
+    "gliderai": ProviderSpec(".Glider", "GliderAI", "chat"),
+    "groq": ProviderSpec(".Groq", "GROQ", "chat"),
+    "heckai": ProviderSpec(".HeckAI", "HeckAI", "chat"),
+    "huggingfacechat": ProviderSpec(".HuggingFaceChat", "HuggingFaceChat", "chat"),
+    "hunyuan": ProviderSpec(".Hunyuan", "Hunyuan", "chat"),
+    "jadveopenai": ProviderSpec(".Jadve", "JadveOpenAI", "chat"),
+    "koboldai": ProviderSpec(".Koboldai", "KOBOLDAI", "chat"),
+    "lambdachat": ProviderSpec(".LambdaChat", "LambdaChat", "chat"),
+    "llama3": ProviderSpec(".Llama3", "Sambanova", "chat"),
+    "mcpcore": ProviderSpec(".MCPCore", "MCPCore", "chat"),
+    "marcus": ProviderSpec(".Marcus", "Marcus", "chat"),
+    "nemotron": ProviderSpec(".Nemotron", "NEMOTRON", "chat"),
+    "netwrck": ProviderSpec(".Netwrck", "Netwrck", "chat"),
+    "ollama": ProviderSpec(".OLLAMA", "OLLAMA", "chat"),
+    "opengpt": ProviderSpec(".OpenGPT", "OpenGPT", "chat"),
+    "openai": ProviderSpec(".Openai", "OPENAI", "chat"),
+    "pi": ProviderSpec(".PI", "PiAI", "chat"),
+    "perplexitylabs": ProviderSpec(".Perplexitylabs", "PerplexityLabs", "chat"),
+    "qwenlm": ProviderSpec(".QwenLM", "QwenLM", "chat"),
+    "reka": ProviderSpec(".Reka", "REKA", "chat"),
+    "standardinputai": ProviderSpec(".StandardInput", "StandardInputAI", "chat"),
+    "teachanything": ProviderSpec(".TeachAnything", "TeachAnything", "chat"),
+    "textpollinationsai": ProviderSpec(".TextPollinationsAI", "TextPollinationsAI", "chat"),
+    "twoai": ProviderSpec(".TwoAI", "TwoAI", "chat"),
+    "typliai": ProviderSpec(".TypliAI", "TypliAI", "chat"),
+    "venice": ProviderSpec(".Venice", "Venice", "chat"),
+    "vercelai": ProviderSpec(".VercelAI", "VercelAI", "chat"),
+    "wisecat": ProviderSpec(".WiseCat", "WiseCat", "chat"),
+    "wrdochat": ProviderSpec(".WrDoChat", "WrDoChat", "chat"),
+    "writecream": ProviderSpec(".Writecream", "Writecream", "chat"),
+    "writingmate": ProviderSpec(".WritingMate", "WritingMate", "chat"),
+    # Subdirectory providers
+    "aisearch": ProviderSpec(".AISEARCH", None, "package"),
+    "hf_space": ProviderSpec(".HF_space", None, "package"),
+    "stt": ProviderSpec(".STT", None, "package"),
+    "tti": ProviderSpec(".TTI", None, "package"),
+    "tts": ProviderSpec(".TTS", None, "package"),
+}
+
+# Subpackages that are reachable as attributes but not as registry names
+_SUBPACKAGES = {"AISEARCH", "OPENAI", "HF_space", "STT", "TTI", "TTS"}
+
+# Module-level attribute name (e.g. ``GROQ``) -> provider name
+_ATTR_INDEX = {
+    (spec.attr or spec.module.lstrip(".")): name for name, spec in PROVIDER_MANIFEST.items()
+}
+
+# Heavy third-party dependencies pulled in by provider modules
+_HEAVY_DEPENDENCIES = (
+    "curl_cffi", "cloudscraper", "PIL", "tiktoken", "google.generativeai",
+    "gradio_client", "nodriver", "lxml", "zstandard", "brotli", "openai", "ollama",
+)
+
+_loaded: Dict[str, Any] = {}
+_failed: Dict[str, str] = {}
+_import_seconds: Dict[str, float] = {}
+
+
+def _load(name: str) -> Any:
+    """Import a provider on first use; failures resolve to None like missing providers"""
+    if name in _loaded:
+        return _loaded[name]
+    if name in _failed:
+        return None
+
+    spec = PROVIDER_MANIFEST[name]
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(spec.module, __name__)
+        provider = getattr(module, spec.attr) if spec.attr else module
+    except Exception as e:
+        _failed[name] = f"{e.__class__.__name__}: {e}"
+        logger.warning(f"Provider '{name}' unavailable: {_failed[name]}")
+        provider = None
+    finally:
+        _import_seconds[name] = time.perf_counter() - start
+
+    if provider is not None:
+        _loaded[name] = provider
+    return provider
+
+
+class LazyProviderRegistry(Mapping):
+    """Read-only name -> provider mapping that imports providers on access"""
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in PROVIDER_MANIFEST:
+            raise KeyError(name)
+        provider = _load(name)
+        if provider is None:
+            raise KeyError(name)
+        return provider
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name in PROVIDER_MANIFEST if name not in _failed)
+
+    def __len__(self) -> int:
+        return len(PROVIDER_MANIFEST) - len(_failed)
+
+    def __contains__(self, name: object) -> bool:
+        return name in PROVIDER_MANIFEST and name not in _failed
+
+
+# Create provider registry
+PROVIDER_REGISTRY = LazyProviderRegistry()
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve ``providers.GROQ`` / ``providers.TTS`` style attributes lazily"""
+    if name in _ATTR_INDEX:
+        return _load(_ATTR_INDEX[name])
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_all_providers():
+    """Get all available providers (no provider modules are imported)
+
+    Providers whose import has failed are left out of ``providers`` and listed under
+    ``unavailable`` with the error; ``deferred`` ones have not been imported yet.
+    """
+    failed = dict(_failed)
+    providers = [name for name in PROVIDER_MANIFEST if name not in failed]
+    return {
+        "providers": providers,
+        "count": len(providers),
+        "unavailable": failed,
+        "deferred": [name for name in providers if name not in _loaded],
+        "categories": {
+            "major": ["openai", "gemini", "groq", "cohere"],
+            "free": ["blackboxai", "freegemini", "chatgptclone"],
+            "specialized": ["perplexitylabs", "huggingfacechat", "githubchat"],
+            "experimental": ["flowith", "x0gpt", "samurai"]
+        },
+        "subdirectories": {
+            "aisearch": "AI-powered search providers",
+            "openai": "OpenAI-compatible providers", 
+            "hf_space": "Hugging Face space providers",
+            "stt": "Speech-to-Text providers",
+            "tti": "Text-to-Image providers",
+            "tts": "Text-to-Speech providers"
+        }
+    }
+
+
+def get_provider(name: str):
+    """Get a specific provider by name, importing it on first use"""
+    return PROVIDER_REGISTRY.get(name.lower())
+
+
+def get_loaded_provider(name: str):
+    """A provider by name if it has already been imported, else ``None`` (never imports)"""
+    return _loaded.get(name.lower())
+
+
+def get_static_models(name: str) -> Optional[List[str]]:
+    """A provider's models as its source declares them, read without importing it
+
+    Only a literal ``AVAILABLE_MODELS`` in the provider's class body is understood;
+    anything computed returns ``None``.
+    """
+    spec = PROVIDER_MANIFEST.get(name.lower())
+    if spec is None or spec.attr is None:
+        return None
+    if name.lower() not in _static_models:
+        _static_models[name.lower()] = _read_static_models(spec)
+    return _static_models[name.lower()]
+
+
+_static_models: Dict[str, Optional[List[str]]] = {}
+
+
+def _read_static_models(spec: ProviderSpec) -> Optional[List[str]]:
+    try:
+        module_spec = importlib.util.find_spec(spec.module, __name__)
+        with open(module_spec.origin, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+    except Exception as e:
+        logger.debug(f"Cannot read {spec.module} source: {e}")
+        return None
+
+    for node in tree.body:
+        if not (isinstance(node, ast.ClassDef) and node.name == spec.attr):
+            continue
+        for statement in node.body:
+            if isinstance(statement, ast.Assign):
+                targets, value = statement.targets, statement.value
+            elif isinstance(statement, ast.AnnAssign) and statement.value is not None:
+                targets, value = [statement.target], statement.value
+            else:
+                continue
+            if any(isinstance(t, ast.Name) and t.id == "AVAILABLE_MODELS" for t in targets):
+                try:
+                    models = ast.literal_eval(value)
+                except ValueError:
+                    return None
+                if isinstance(models, (dict, list, tuple, set)):
+                    return [str(model) for model in models]
+                return None
+    return None
+
+
+def get_import_report() -> Dict[str, Any]:
+    """Report what lazy loading has imported so far and what it has deferred"""
+    loaded_seconds = {name: round(_import_seconds[name], 4) for name in _loaded}
+    pending = [name for name in PROVIDER_MANIFEST if name not in _loaded and name not in _failed]
+    average = (sum(loaded_seconds.values()) / len(loaded_seconds)) if loaded_seconds else None
+    return {
+        "registry_seconds": round(_registry_seconds, 4),
+        "loaded": loaded_seconds,
+        "failed": dict(_failed),
+        "deferred": pending,
+        "deferred_count": len(pending),
+        "loaded_import_seconds": round(sum(loaded_seconds.values()), 4),
+        "estimated_deferred_seconds": round(average * len(pending), 4) if average is not None else None,
+        "deferred_dependencies": [m for m in _HEAVY_DEPENDENCIES if m not in sys.modules],
+    }
+
+
+_registry_seconds = time.perf_counter() - _package_start
+
+__all__ = [
+    "get_all_providers", "get_provider", "get_loaded_provider", "get_static_models", "get_import_report",
+     "PROVIDER_REGISTRY", "PROVIDER_MANIFEST",
+]
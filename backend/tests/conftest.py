@@ -0,0 +1,38 @@
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+BACKEND = Path(__file__).resolve().parent.parent
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="session")
+def mock_upstream():
+    """Base URL of a local OpenAI-compatible upstream serving ``/v1/chat/completions``"""
+    uvicorn = pytest.importorskip("uvicorn")
+    from benchmarks.mock_upstream import UpstreamProfile, create_app
+
+    profile = UpstreamProfile(ttft=0.0, chunks=3, chunk_delay=0.0, chunk_text="hi ")
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(create_app(profile), host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("mock upstream did not start")
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{port}/v1/chat/completions"
+    server.should_exit = True
+    thread.join(timeout=5)
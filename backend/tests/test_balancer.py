@@ -0,0 +1,37 @@
+import random
+
+from gateway.balancer import LoadBalancer
+from gateway.health import HealthRegistry
+from gateway.routing import ModelRouter
+
+MODELS = {
+    "groq": ["llama-3.3-70b-versatile"],
+    "cloudflare": ["@cf/meta/llama-3.3-70b"],
+    "deepinfra": ["meta-llama/Llama-3.3-70B"],
+    "together": ["llama-3.3-70b-specdec"],
+}
+
+
+def test_only_routes_to_the_same_model_are_balanced():
+    router = ModelRouter.from_mapping(MODELS, prefix_matching=True)
+    health = HealthRegistry()
+    # The variants look far cheaper, yet must never be picked over the requested model
+    for provider in ("groq", "together"):
+        health.record_success(provider, 0.001)
+    for provider in ("cloudflare", "deepinfra"):
+        health.record_success(provider, 5.0)
+    balancer = LoadBalancer(health, random.Random(1))
+
+    winners = set()
+    for _ in range(50):
+        ordered = balancer.order(router.resolve("llama-3.3-70b"))
+        winners.add(ordered[0].provider)
+        assert {r.provider for r in ordered[2:]} == {"groq", "together"}
+    assert winners == {"cloudflare", "deepinfra"}
+
+
+def test_prefix_only_routes_balanced_only_when_identical():
+    router = ModelRouter.from_mapping(MODELS, prefix_matching=True)
+    routes = [r for r in router.resolve("llama-3.3-70b") if r.provider in ("groq", "together")]
+    balancer = LoadBalancer(HealthRegistry(), random.Random(1))
+    assert balancer.order(routes) == routes
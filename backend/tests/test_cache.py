@@ -0,0 +1,113 @@
+import asyncio
+import os
+import time
+
+from gateway.cache import ResponseCache, cache_key, cache_policy, replay_pieces
+from gateway.shared_state import SQLiteStore
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_cache_key_normalizes_messages_and_params():
+    key = cache_key("Groq", "m", MESSAGES, {"temperature": 0, "max_tokens": 5})
+    assert key == cache_key("groq", "m", [{"role": "user", "content": "  hello\n"}], {
+        "max_tokens": 5, "temperature": 0, "stream": True, "user": "u", "tools": None, "top_p": None,
+    })
+    assert key != cache_key("groq", "other", MESSAGES, {"temperature": 0, "max_tokens": 5})
+    assert key != cache_key("groq", "m", MESSAGES, {"temperature": 0, "max_tokens": 6})
+    assert key != cache_key("groq", "m", [{"role": "system", "content": "hello"}], {"temperature": 0, "max_tokens": 5})
+    # Composed and decomposed forms of the same text are one request
+    assert cache_key("p", "m", [{"content": "caf\u00e9"}], {}) == cache_key("p", "m", [{"content": "cafe\u0301"}], {})
+
+
+def test_cache_policy():
+    assert cache_policy(None) == (True, True)
+    assert cache_policy("no-cache") == (False, True)
+    assert cache_policy("max-age=0, No-Store") == (False, False)
+
+
+def test_deterministic_only():
+    cache = ResponseCache()
+    assert cache.cacheable({"temperature": 0})
+    assert cache.cacheable({"temperature": 0.7, "seed": 1})
+    assert not cache.cacheable({"temperature": 0.7})
+    assert ResponseCache(deterministic_only=False).cacheable({"temperature": 0.7})
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path), ttl=0.05)
+
+    async def scenario():
+        await cache.put("k", {"choices": []}, text="hi")
+        fresh = await cache.get("k")
+        await asyncio.sleep(0.1)
+        return fresh, await cache.get("k")
+
+    fresh, expired = run(scenario())
+    assert fresh == {"value": {"choices": []}, "text": "hi"}
+    assert expired is None
+    assert not any(files for _, _, files in os.walk(tmp_path))
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+
+    async def scenario():
+        for key in ("a", "b"):
+            await cache.put(key, key)
+        await cache.get("a")
+        await cache.put("c", "c")
+        return [await cache.get(key) is not None for key in ("a", "b", "c")]
+
+    assert run(scenario()) == [True, False, True]
+    assert cache.stats()["entries"] == 2
+
+
+def test_disk_tier_serves_other_workers_and_trims_oldest(tmp_path):
+    writer = ResponseCache(directory=str(tmp_path))
+    reader = ResponseCache(directory=str(tmp_path))
+
+    async def scenario():
+        await writer.put("k1", "v1", text="one")
+        return await reader.get("k1")
+
+    assert run(scenario())["value"] == "v1"
+    assert reader.stats()["disk_hits"] == 1
+
+    writer.max_disk_bytes = 400
+    body = "x" * 150
+
+    async def fill():
+        for index in range(2, 6):
+            await writer.put(f"k{index}", body)
+            time.sleep(0.01)  # distinct mtimes
+
+    run(fill())
+    remaining = sorted(name[:-5] for _, _, names in os.walk(tmp_path) for name in names)
+    assert "k1" not in remaining and "k5" in remaining
+    assert writer.stats()["disk_bytes"] <= 400
+
+
+def test_shared_store_tier_replaces_disk(tmp_path):
+    path = str(tmp_path / "state.db")
+    first = ResponseCache(directory=str(tmp_path / "disk"), store=SQLiteStore(path))
+    second = ResponseCache(directory=str(tmp_path / "disk"), store=SQLiteStore(path))
+
+    async def scenario():
+        await first.put("k", "v", text="t")
+        return await second.get("k")
+
+    assert run(scenario()) == {"value": "v", "text": "t"}
+    assert not os.path.exists(tmp_path / "disk")
+    assert second.stats()["shared"]
+
+
+def test_replay_pieces_rejoin_to_text():
+    text = "word " * 40
+    pieces = replay_pieces(text, size=16)
+    assert "".join(pieces) == text
+    assert all(len(piece) <= 16 for piece in pieces)
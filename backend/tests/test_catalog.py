@@ -0,0 +1,46 @@
+import asyncio
+import sys
+
+import providers
+from gateway.catalog import ModelCatalog
+
+
+class Loaded:
+    AVAILABLE_MODELS = ["loaded-model"]
+
+
+def test_build_uses_static_models_and_loaded_providers_only():
+    catalog = ModelCatalog(
+        lambda: ["loaded", "static", "dynamic"],
+        {"loaded": Loaded}.get,
+        {"static": ["static-model"]}.get,
+    )
+    payload = catalog.build()["providers"]
+    assert payload["loaded"]["models"] == ["loaded-model"]
+    assert payload["static"]["models"] == ["static-model"]
+    assert payload["dynamic"] == {"models": [], "count": 0, "deferred": True}
+
+
+def test_deferred_provider_listed_once_loaded():
+    loaded = {}
+
+    async def run():
+        catalog = ModelCatalog(lambda: ["dynamic"], loaded.get)
+        await catalog.refresh()
+        catalog.provider_loaded("dynamic")
+        assert catalog._update_task is None or catalog._update_task.done()
+        loaded["dynamic"] = Loaded
+        catalog.provider_loaded("dynamic")
+        await catalog._update_task
+        return catalog.payload["providers"]["dynamic"]
+
+    assert asyncio.run(run()) == {"models": ["loaded-model"], "count": 1}
+
+
+def test_real_manifest_read_without_imports(monkeypatch):
+    monkeypatch.setattr(providers, "_static_models", {})
+    before = {name for name in sys.modules if name.startswith("providers.")}
+    groq = providers.get_static_models("groq")
+    assert groq and all(isinstance(model, str) for model in groq)
+    assert providers.get_static_models("tts") is None
+    assert {name for name in sys.modules if name.startswith("providers.")} == before
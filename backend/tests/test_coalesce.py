@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+import pytest
+
+from gateway.coalesce import coalesce_deltas, coalescing_requested
+from gateway.sse import ChunkEncoder
+
+FINISH = {"finish_reason": "stop"}
+
+
+def text(item):
+    return item if isinstance(item, str) else None
+
+
+def merge(items):
+    return "".join(items)
+
+
+async def source(items, gap=0.0, error=None):
+    for item in items:
+        yield item
+        await asyncio.sleep(gap)
+    if error is not None:
+        raise error
+
+
+def collect(items, window=0.05, max_chars=512, timed=False):
+    async def run():
+        start = time.perf_counter()
+        out = []
+        async for item in coalesce_deltas(items, text, merge, window, max_chars):
+            out.append((item, time.perf_counter() - start) if timed else item)
+        return out
+    return asyncio.run(run())
+
+
+def test_deltas_within_window_are_merged():
+    out = collect(source(["a", "b", "c", "d", FINISH]), window=0.5)
+    assert out == ["a", "bcd", FINISH]
+
+
+def test_first_token_is_not_delayed():
+    out = collect(source(["first", "b", "c"], gap=0.05), window=1.0, timed=True)
+    (first, first_at), (rest, _) = out
+    assert (first, rest) == ("first", "bc")
+    assert first_at < 0.04
+
+
+def test_window_bounds_latency():
+    out = collect(source([""] + list("abcdefghij"), gap=0.02), window=0.05)
+    assert out[0] == "" and "".join(out[1:]) == "abcdefghij"
+    assert 2 <= len(out) - 1 <= 7
+
+
+def test_max_chars_flushes_early():
+    out = collect(source(["x", "aaa", "bbb", "ccc", "d"]), window=10.0, max_chars=6)
+    assert out == ["x", "aaabbb", "cccd"]
+
+
+def test_finish_chunk_kept_after_flush():
+    encoder = ChunkEncoder("chatcmpl-1", "m")
+
+    def chunk(content=None, finish_reason=None, role=None):
+        delta = {k: v for k, v in (("role", role), ("content", content)) if v is not None}
+        return {"choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+
+    items = [chunk("", role="assistant"), chunk("Hel"), chunk("lo"), chunk(" world"), chunk(finish_reason="stop")]
+
+    async def run():
+        merged = coalesce_deltas(source(items), encoder.content_of, encoder.merge, 0.5, 512)
+        return [item async for item in merged]
+
+    out = asyncio.run(run())
+    assert [c["choices"][0]["delta"] for c in out] == [
+        {"role": "assistant", "content": ""}, {"content": "Hel"}, {"content": "lo world"}, {},
+    ]
+    assert out[-1]["choices"][0]["finish_reason"] == "stop"
+
+
+def test_error_flushes_buffer_then_raises():
+    async def run():
+        out = []
+        with pytest.raises(ConnectionError):
+            async for item in coalesce_deltas(source(["a", "b", "c"], error=ConnectionError()), text, merge, 1.0, 512):
+                out.append(item)
+        return out
+
+    assert asyncio.run(run()) == ["a", "bc"]
+
+
+def test_zero_window_passes_stream_through():
+    items = source(["a", "b"])
+    assert coalesce_deltas(items, text, merge, 0.0, 512) is items
+
+
+def test_opt_out_header():
+    assert coalescing_requested({})
+    assert not coalescing_requested({"x-stream-coalesce": "Off"})
+    assert coalescing_requested({"x-stream-coalesce": "on"})
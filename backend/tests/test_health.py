@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from gateway.health import HealthRegistry, UpstreamHTMLError, response_text
+
+pytest.importorskip("webscout.Provider.OPENAI")
+
+from providers.OPENAI.utils import (
+    ChatCompletion, ChatCompletionChunk, ChatCompletionMessage, Choice, ChoiceDelta,
+)
+
+PAGE = "<!DOCTYPE html><html><head><title>Just a moment...</title></head></html>"
+
+
+def completion(content):
+    message = ChatCompletionMessage(role="assistant", content=content)
+    return ChatCompletion(model="m", choices=[Choice(index=0, message=message, finish_reason="stop")])
+
+
+def chunk(content):
+    return ChatCompletionChunk(model="m", choices=[Choice(index=0, delta=ChoiceDelta(content=content))])
+
+
+def as_dict(model):
+    return model.model_dump() if hasattr(model, "model_dump") else model.dict()
+
+
+async def _value(value):
+    return value
+
+
+async def _stream(items):
+    for item in items:
+        yield item
+
+
+def observe(result):
+    registry = HealthRegistry()
+    return registry, asyncio.run(registry.observe("p", _value(result)))
+
+
+def observe_stream(items):
+    registry = HealthRegistry()
+
+    async def run():
+        return [c async for c in registry.observe_stream("p", _stream(items))]
+    return registry, asyncio.run(run())
+
+
+@pytest.mark.parametrize("shape", [lambda m: m, as_dict])
+def test_response_text_reads_message_and_delta(shape):
+    assert response_text(shape(completion("hello"))) == "hello"
+    assert response_text(shape(chunk("hel"))) == "hel"
+    assert response_text(shape(chunk(None))) is None
+
+
+@pytest.mark.parametrize("shape", [lambda m: m, as_dict])
+def test_observe_rejects_html_completion(shape):
+    with pytest.raises(UpstreamHTMLError):
+        observe(shape(completion(PAGE)))
+
+
+@pytest.mark.parametrize("shape", [lambda m: m, as_dict])
+def test_observe_accepts_completion(shape):
+    registry, result = observe(shape(completion("```html\n<html></html>\n```")))
+    assert response_text(result).startswith("```")
+    assert registry.snapshot()["p"]["successes"] == 1
+
+
+@pytest.mark.parametrize("shape", [lambda m: m, as_dict])
+def test_observe_stream_rejects_html_first_chunk(shape):
+    with pytest.raises(UpstreamHTMLError):
+        observe_stream([shape(chunk(PAGE)), shape(chunk("more"))])
+
+
+@pytest.mark.parametrize("shape", [lambda m: m, as_dict])
+def test_observe_stream_accepts_chunks(shape):
+    registry, chunks = observe_stream([shape(chunk("hi")), shape(chunk(" there"))])
+    assert len(chunks) == 2
+    assert registry.snapshot()["p"]["successes"] == 1
+
+
+def trip(registry, provider="p"):
+    for _ in range(registry.failure_threshold):
+        registry.record_failure(provider, "boom")
+
+
+def test_breaker_changes_reach_store_only_on_sync(tmp_path):
+    from gateway.shared_state import SQLiteStore
+
+    path = str(tmp_path / "state.db")
+    first = HealthRegistry(failure_threshold=1, store=SQLiteStore(path))
+    second = HealthRegistry(failure_threshold=1, store=SQLiteStore(path))
+    trip(first)
+    second.sync()
+    assert second.available("p")
+    first.sync()
+    second.sync()
+    assert not second.available("p")
+
+
+def test_stale_snapshot_does_not_close_newer_local_breaker(tmp_path):
+    from gateway.shared_state import SQLiteStore
+
+    path = str(tmp_path / "state.db")
+    first = HealthRegistry(failure_threshold=1, store=SQLiteStore(path))
+    second = HealthRegistry(failure_threshold=1, store=SQLiteStore(path))
+    trip(first, "other")
+    first.sync()
+    trip(second)
+    # The snapshot knows nothing of "p" yet; the local breaker stays open
+    second._adopt(first.store.get("health:breakers"))
+    assert second.snapshot()["p"]["state"] == "open"
+
+    second.sync()
+    first.sync()
+    assert first.snapshot()["p"]["state"] == "open"
@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+import pytest
+
+from gateway.hedging import HedgeBudget, TTFTStats, hedged_stream
+
+
+class Stream:
+    """Upstream stream: waits ``first`` seconds, then yields ``items`` (or raises ``error``)"""
+
+    def __init__(self, name, first=0.0, items=3, error=None):
+        self.name = name
+        self.first = first
+        self.items = items
+        self.error = error
+        self.sent = 0
+        self.cancelled = False
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.sent == 0:
+            try:
+                await asyncio.sleep(self.first)
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+            if self.error is not None:
+                raise self.error
+        if self.sent >= self.items:
+            raise StopAsyncIteration
+        self.sent += 1
+        return f"{self.name}{self.sent}"
+
+    async def aclose(self):
+        self.closed = True
+
+
+def backup_opener(backup, opened):
+    async def open_backup():
+        opened.append(time.perf_counter())
+        return backup
+    return open_backup
+
+
+def hedge(primary, backup, delay, budget=None):
+    opened = []
+
+    async def run():
+        start = time.perf_counter()
+        chunks = [c async for c in hedged_stream(
+            primary, backup_opener(backup, opened), delay, budget or HedgeBudget(ratio=1.0)
+        )]
+        return chunks, [t - start for t in opened]
+    chunks, opened_after = asyncio.run(run())
+    return chunks, opened_after
+
+
+def test_fast_primary_is_not_hedged():
+    primary, backup = Stream("p", first=0.0), Stream("b")
+    chunks, opened = hedge(primary, backup, delay=0.2)
+    assert chunks == ["p1", "p2", "p3"]
+    assert opened == []
+    assert primary.closed
+
+
+def test_hedge_fires_only_after_delay():
+    primary, backup = Stream("p", first=0.3), Stream("b", first=0.5)
+    chunks, opened = hedge(primary, backup, delay=0.1)
+    assert len(opened) == 1 and opened[0] >= 0.1
+    assert chunks == ["p1", "p2", "p3"]
+
+
+def test_loser_cancelled_and_closed_when_winner_yields():
+    primary, backup = Stream("p", first=5.0), Stream("b", first=0.0)
+    budget = HedgeBudget(ratio=1.0)
+    start = time.perf_counter()
+    chunks, _ = hedge(primary, backup, delay=0.05, budget=budget)
+    assert chunks == ["b1", "b2", "b3"]
+    assert primary.cancelled and primary.closed
+    assert time.perf_counter() - start < 2
+    assert budget.stats()["backup_wins"] == 1
+
+
+def test_primary_error_falls_through_to_hedge():
+    primary = Stream("p", first=0.1, error=ConnectionError("reset"))
+    backup = Stream("b", first=0.2)
+    chunks, _ = hedge(primary, backup, delay=0.05)
+    assert chunks == ["b1", "b2", "b3"]
+    assert primary.closed
+
+
+def test_error_raised_when_no_hedge_answers():
+    primary = Stream("p", first=0.0, error=ConnectionError("reset"))
+    with pytest.raises(ConnectionError):
+        hedge(primary, Stream("b"), delay=1.0)
+
+
+def test_empty_budget_skips_hedge():
+    budget = HedgeBudget(ratio=0.0, burst=0.0)
+    chunks, opened = hedge(Stream("p", first=0.1), Stream("b"), delay=0.01, budget=budget)
+    assert opened == [] and chunks == ["p1", "p2", "p3"]
+
+
+def test_ttft_percentile_needs_min_samples():
+    stats = TTFTStats(min_samples=3)
+    stats.record("m", 1.0)
+    stats.record("m", 3.0)
+    assert stats.percentile("m", 95) is None
+    stats.record("m", 2.0)
+    assert stats.percentile("m", 50) == 2.0
+    assert stats.percentile("m", 100) == 3.0
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from gateway.limiter import AdmissionController, Overloaded
+
+
+async def settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_provider_queue_full_is_429():
+    async def run():
+        limits = AdmissionController(per_provider_limit=1, global_limit=10, max_queue=1)
+        await limits.acquire("p")
+        queued = asyncio.ensure_future(limits.acquire("p"))
+        await settle()
+        with pytest.raises(Overloaded) as rejected:
+            await limits.acquire("p")
+        stats = limits.stats()
+        limits.release("p")
+        await queued
+        limits.release("p")
+        return rejected.value, stats, limits.stats()
+
+    error, during, after = asyncio.run(run())
+    assert (error.status_code, error.reason) == (429, "queue full")
+    assert int(error.headers["Retry-After"]) >= 1
+    assert during["providers"]["p"]["queued"] == 1 and during["rejected"] == 1
+    assert after["global"]["active"] == 0 and after["queue_depth"] == 0
+
+
+def test_global_queue_full_is_503():
+    async def run():
+        limits = AdmissionController(per_provider_limit=10, global_limit=1, max_queue=1)
+        await limits.acquire("a")
+        queued = asyncio.ensure_future(limits.acquire("b"))
+        await settle()
+        with pytest.raises(Overloaded) as rejected:
+            await limits.acquire("c")
+        limits.release("a")
+        await queued
+        limits.release("b")
+        return rejected.value, limits.stats()
+
+    error, stats = asyncio.run(run())
+    assert (error.scope, error.status_code) == ("global", 503)
+    # The rejected request gave its provider slot back
+    assert stats["providers"] == {} and stats["global"]["active"] == 0
+
+
+def test_queue_deadline():
+    async def run():
+        limits = AdmissionController(per_provider_limit=1, max_queue=4, queue_timeout=0.05)
+        await limits.acquire("p")
+        with pytest.raises(Overloaded) as timed_out:
+            await limits.acquire("p")
+        return timed_out.value, limits.stats()
+
+    error, stats = asyncio.run(run())
+    assert error.reason == "queue deadline exceeded" and error.status_code == 429
+    assert stats["timed_out"] == 1 and stats["queue_depth"] == 0
+
+
+def test_cancelled_waiter_releases_its_place():
+    async def run():
+        limits = AdmissionController(per_provider_limit=1, global_limit=10, max_queue=1)
+        await limits.acquire("p")
+        waiter = asyncio.ensure_future(limits.acquire("p"))
+        await settle()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        # The queue has room again and the slot goes to the next request
+        nxt = asyncio.ensure_future(limits.acquire("p"))
+        await settle()
+        limits.release("p")
+        await asyncio.wait_for(nxt, 1)
+        limits.release("p")
+        return limits.stats()
+
+    stats = asyncio.run(run())
+    assert stats["global"]["active"] == 0 and stats["providers"] == {}
+
+
+def test_cancellation_inside_slot_releases_it():
+    async def run():
+        limits = AdmissionController(per_provider_limit=1, global_limit=1)
+        entered = asyncio.Event()
+
+        async def work():
+            async with limits.slot("p"):
+                entered.set()
+                await asyncio.sleep(3600)
+
+        task = asyncio.ensure_future(work())
+        await entered.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        async with limits.slot("p"):
+            pass
+        return limits.stats()
+
+    stats = asyncio.run(run())
+    assert stats["global"]["active"] == 0 and stats["wait_count"] == 2
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from gateway.listing import ModelListing
+
+ENTRIES = [
+    {"id": "Groq/llama-3", "owned_by": "Groq", "capabilities": ["chat", "tools"],
+     "modalities": {"input": ["text"], "output": ["text"]}},
+    {"id": "Alpha/gpt-4o", "owned_by": "Alpha", "capabilities": ["chat", "vision"],
+     "modalities": {"input": ["text", "image"], "output": ["text"]}},
+    {"id": "Beta/claude", "owned_by": "Beta", "capabilities": ["chat"]},
+    {"id": "Alpha/gpt-4o", "owned_by": "Duplicate"},
+]
+
+
+def ids(body):
+    return [entry["id"] for entry in json.loads(body)["data"]]
+
+
+def test_payload_is_sorted_deduplicated_and_stamped():
+    listing = ModelListing(ENTRIES, created=123)
+    payload = json.loads(listing.body)
+    assert payload["object"] == "list"
+    assert [e["id"] for e in payload["data"]] == ["Beta/claude", "Alpha/gpt-4o", "Groq/llama-3"]
+    assert len(listing) == 3
+    # The first entry for an id wins
+    assert payload["data"][1]["owned_by"] == "Alpha"
+    assert all(e["object"] == "model" and e["created"] == 123 for e in payload["data"])
+    assert "has_more" not in payload
+
+
+def test_etag_depends_only_on_content():
+    etag = ModelListing(ENTRIES, created=1).etag
+    assert etag.startswith('"') and etag.endswith('"')
+    assert ModelListing(ENTRIES, created=1).etag == etag
+    assert ModelListing(ENTRIES, created=2).etag != etag
+    assert ModelListing(ENTRIES[:2], created=1).etag != etag
+
+
+def test_unfiltered_page_is_the_prebuilt_body():
+    listing = ModelListing(ENTRIES, created=1)
+    assert listing.page() == (listing.body, listing.etag)
+    assert listing.page(provider="", limit=0) == (listing.body, listing.etag)
+
+
+def test_filters():
+    listing = ModelListing(ENTRIES, created=1)
+    assert ids(listing.page(provider="ALPHA")[0]) == ["Alpha/gpt-4o"]
+    assert ids(listing.page(capability="tools")[0]) == ["Groq/llama-3"]
+    assert ids(listing.page(modality="image")[0]) == ["Alpha/gpt-4o"]
+    assert ids(listing.page(capability="chat", modality="text")[0]) == ["Alpha/gpt-4o", "Groq/llama-3"]
+    assert ids(listing.page(provider="nobody")[0]) == []
+    assert listing.page(provider="alpha")[1] != listing.etag
+
+
+def test_cursor_pagination():
+    listing = ModelListing(ENTRIES, created=1)
+    first = json.loads(listing.page(limit=2)[0])
+    assert [e["id"] for e in first["data"]] == ["Beta/claude", "Alpha/gpt-4o"]
+    assert first["has_more"] is True
+    assert (first["first_id"], first["last_id"]) == ("Beta/claude", "Alpha/gpt-4o")
+
+    second = json.loads(listing.page(after=first["last_id"], limit=2)[0])
+    assert [e["id"] for e in second["data"]] == ["Groq/llama-3"]
+    assert second["has_more"] is False
+
+    # A cursor for a model no longer listed resumes at its sort position
+    resumed = json.loads(listing.page(after="Gone/delta")[0])
+    assert [e["id"] for e in resumed["data"]] == ["Alpha/gpt-4o", "Groq/llama-3"]
+
+    empty = json.loads(listing.page(after="Groq/llama-3")[0])
+    assert empty["data"] == [] and empty["first_id"] is None and empty["has_more"] is False
+
+
+def test_pages_are_cached_and_bounded():
+    listing = ModelListing(ENTRIES, created=1, page_cache_size=2)
+    page = listing.page(provider="alpha")
+    assert listing.page(provider="Alpha") is page
+    listing.page(provider="beta")
+    listing.page(provider="groq")
+    assert len(listing._pages) == 2
+    assert listing.page(provider="alpha") is not page
+    assert listing.page(provider="alpha") == page
+
+
+def test_response_revalidation():
+    listing = ModelListing(ENTRIES, created=1)
+    response = listing.response()
+    assert response.status_code == 200
+    assert response.body == listing.body
+    assert response.headers["etag"] == listing.etag
+    assert response.headers["cache-control"] == "no-cache"
+
+    for header in (listing.etag, f"W/{listing.etag}", f'"other", {listing.etag}', "*"):
+        not_modified = listing.response(if_none_match=header)
+        assert not_modified.status_code == 304
+        assert not_modified.body == b""
+        assert not_modified.headers["etag"] == listing.etag
+
+    assert listing.response(if_none_match='"stale"').status_code == 200
+    # A filtered page has its own tag
+    page_body, page_etag = listing.page(provider="beta")
+    assert listing.response(if_none_match=listing.etag, provider="beta").body == page_body
+    assert listing.response(if_none_match=page_etag, provider="beta").status_code == 304
@@ -0,0 +1,43 @@
+import asyncio
+
+from gateway.metrics import IN_FLIGHT, RequestMetrics
+
+
+def in_flight(endpoint):
+    return IN_FLIGHT.labels(endpoint)._value.get()
+
+
+async def chunks(n):
+    for i in range(n):
+        yield f"chunk {i}"
+
+
+def test_unsent_stream_leaves_no_request_in_flight():
+    with RequestMetrics("unsent") as metrics:
+        assert in_flight("unsent") == 1
+        stream = metrics.wrap(chunks(3))
+    assert in_flight("unsent") == 0
+    del stream
+
+
+def test_stream_in_flight_until_closed_early():
+    async def run():
+        with RequestMetrics("early") as metrics:
+            stream = metrics.wrap(chunks(3))
+        await stream.__anext__()
+        during = in_flight("early")
+        await stream.aclose()
+        return during
+
+    assert asyncio.run(run()) == 1
+    assert in_flight("early") == 0
+
+
+def test_stream_in_flight_until_exhausted():
+    async def run():
+        with RequestMetrics("full") as metrics:
+            stream = metrics.wrap(chunks(3))
+        return [chunk async for chunk in stream]
+
+    assert len(asyncio.run(run())) == 3
+    assert in_flight("full") == 0
@@ -0,0 +1,140 @@
+import threading
+import time
+
+from gateway.model_sets import ModelSetCache
+
+
+class Static:
+    AVAILABLE_MODELS = ["a", "b", ""]
+
+
+class Inherited(Static):
+    pass
+
+
+class Runtime:
+    def __init__(self, models):
+        self.models = models
+
+    @property
+    def AVAILABLE_MODELS(self):
+        return self.models
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.005)
+
+
+def test_class_level_models_need_no_instance():
+    def instance_for(cls):
+        raise AssertionError("provider constructed")
+
+    cache = ModelSetCache(instance_for)
+    assert cache.get(Static) == frozenset({"a", "b"})
+    assert cache.get(Inherited) == frozenset({"a", "b"})
+    assert cache.get(Static) is cache.get(Static)
+    assert cache.stats() == {"classes": 2, "loading": 0}
+
+
+def test_runtime_models_load_in_background():
+    instance = Runtime(["x", "y"])
+    calls = []
+    release = threading.Event()
+
+    def instance_for(cls):
+        calls.append(threading.current_thread())
+        release.wait(2)
+        return instance
+
+    cache = ModelSetCache(instance_for)
+    # Not loaded yet: callers skip validation, and repeated gets share one load
+    assert cache.get(Runtime) is None
+    assert cache.get(Runtime) is None
+    release.set()
+    wait_for(lambda: cache.get(Runtime) is not None)
+    assert cache.get(Runtime) == frozenset({"x", "y"})
+    assert len(calls) == 1
+    assert calls[0] is not threading.current_thread()
+
+
+def test_failed_load_is_remembered_as_empty():
+    def instance_for(cls):
+        raise RuntimeError("boom")
+
+    cache = ModelSetCache(instance_for)
+    assert cache.get(Runtime) is None
+    wait_for(lambda: cache.get(Runtime) is not None)
+    assert cache.get(Runtime) == frozenset()
+
+
+def test_invalid_runtime_list_is_empty():
+    cache = ModelSetCache(lambda cls: Runtime("not-a-list"))
+    cache.get(Runtime)
+    wait_for(lambda: cache.get(Runtime) is not None)
+    assert cache.get(Runtime) == frozenset()
+
+
+def test_invalidate_drops_every_set():
+    instance = Runtime(["old"])
+    cache = ModelSetCache(lambda cls: instance)
+    cache.get(Static)
+    cache.get(Runtime)
+    wait_for(lambda: cache.get(Runtime) is not None)
+
+    instance.models = ["new"]
+    Static.AVAILABLE_MODELS = ["c"]
+    try:
+        cache.invalidate()
+        assert cache.stats()["classes"] == 0
+        assert cache.get(Static) == frozenset({"c"})
+        assert cache.get(Runtime) is None
+        wait_for(lambda: cache.get(Runtime) is not None)
+        assert cache.get(Runtime) == frozenset({"new"})
+    finally:
+        Static.AVAILABLE_MODELS = ["a", "b", ""]
+
+
+def test_expired_set_is_served_while_refreshing():
+    instance = Runtime(["old"])
+    release = threading.Event()
+
+    def instance_for(cls):
+        release.wait(2)
+        return instance
+
+    cache = ModelSetCache(instance_for, ttl=0.05)
+    release.set()
+    cache.get(Runtime)
+    wait_for(lambda: cache.get(Runtime) is not None)
+    assert cache.get(Runtime) == frozenset({"old"})
+
+    release.clear()
+    instance.models = ["new"]
+    time.sleep(0.06)
+    # Stale set is returned at once; the refresh runs behind it
+    assert cache.get(Runtime) == frozenset({"old"})
+    assert cache.stats()["loading"] == 1
+    release.set()
+    wait_for(lambda: cache.get(Runtime) == frozenset({"new"}))
+
+
+def test_zero_ttl_never_expires():
+    instance = Runtime(["x"])
+    calls = []
+
+    def instance_for(cls):
+        calls.append(cls)
+        return instance
+
+    cache = ModelSetCache(instance_for, ttl=0)
+    cache.get(Runtime)
+    wait_for(lambda: cache.get(Runtime) is not None)
+    instance.models = ["y"]
+    for _ in range(3):
+        assert cache.get(Runtime) == frozenset({"x"})
+    time.sleep(0.02)
+    assert len(calls) == 1
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("curl_cffi")
+pytest.importorskip("webscout.Provider.OPENAI")
+
+from providers.OPENAI.TogetherAI import TogetherAI
+from providers.OPENAI.deepinfra import DeepInfra
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+def _deepinfra(url):
+    provider = DeepInfra()
+    provider.base_url = url
+    return provider
+
+
+def _together(url):
+    provider = TogetherAI()
+    provider.api_endpoint = url
+    # Skip the activation round trip.
+    provider.headers["Authorization"] = "Bearer test"
+    provider.session.headers.update(provider.headers)
+    return provider
+
+
+def _text(chunks):
+    return "".join(c.choices[0].delta.content or "" for c in chunks if c.choices)
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+@pytest.mark.parametrize("make", [_deepinfra, _together])
+def test_create(mock_upstream, make):
+    provider = make(mock_upstream)
+    model = provider.AVAILABLE_MODELS[0]
+
+    completion = provider.chat.completions.create(model=model, messages=MESSAGES)
+    assert completion.choices[0].message.content == "hi hi hi "
+
+    chunks = list(provider.chat.completions.create(model=model, messages=MESSAGES, stream=True))
+    assert _text(chunks) == "hi hi hi "
+
+
+@pytest.mark.parametrize("make", [_deepinfra, _together])
+def test_acreate(mock_upstream, make):
+    provider = make(mock_upstream)
+    model = provider.AVAILABLE_MODELS[0]
+    assert provider.chat.completions.native_async
+
+    async def run():
+        completion = await provider.chat.completions.acreate(model=model, messages=MESSAGES)
+        stream = await provider.chat.completions.acreate(model=model, messages=MESSAGES, stream=True)
+        return completion, await _collect(stream)
+
+    completion, chunks = asyncio.run(run())
+    assert completion.choices[0].message.content == "hi hi hi "
+    assert _text(chunks) == "hi hi hi "
+
+
+def test_gateway_streams_registered_provider_on_event_loop(mock_upstream, monkeypatch):
+    from providers.OPENAI import api
+
+    api.initialize_provider_map()
+    provider_class = api.AppConfig.provider_map["DeepInfra"]
+    assert provider_class is DeepInfra
+    assert api.AppConfig.provider_map[f"DeepInfra/{DeepInfra.AVAILABLE_MODELS[0]}"] is DeepInfra
+
+    provider = provider_class()
+    provider.base_url = mock_upstream
+    opened = []
+    open_async_stream = api.executor.open_async_stream
+
+    async def spy(provider_name, fn, **params):
+        opened.append(provider_name)
+        return await open_async_stream(provider_name, fn, **params)
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("native async provider was sent to the thread pool")
+
+    monkeypatch.setattr(api.executor, "open_async_stream", spy)
+    monkeypatch.setattr(api.executor, "open_stream", fail)
+
+    async def run():
+        stream = await api.open_provider_stream(
+            "DeepInfra", provider, model=DeepInfra.AVAILABLE_MODELS[0], messages=MESSAGES, stream=True
+        )
+        return await _collect(stream)
+
+    chunks = asyncio.run(run())
+    assert opened == ["DeepInfra"]
+    assert _text(chunks) == "hi hi hi "
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+
+from gateway.pool import ProviderPool, call_params, split_params
+
+
+class Native:
+    """Provider whose chat, like the webscout ones, takes no sampling parameters"""
+
+    def __init__(self, model="m", max_tokens=600, temperature=1.0):
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+
+    def chat(self, prompt, stream=False, optimizer=None):
+        return prompt
+
+
+class Compatible:
+    def __init__(self, model="m"):
+        self.model = model
+
+    def chat(self, messages, stream=False, **kwargs):
+        return kwargs
+
+
+def test_call_params_filters_by_signature():
+    kwargs = {"max_tokens": 5, "temperature": 0.2, "tools": [], "optimizer": "code"}
+    assert call_params(Native().chat, kwargs) == {"optimizer": "code"}
+    assert call_params(Compatible().chat, kwargs) == kwargs
+
+
+def test_sampling_params_kept_on_instance_when_chat_lacks_them():
+    instance, call = split_params({"model": "x", "max_tokens": 5, "temperature": 0.2, "top_k": 3}, Native)
+    assert instance == {"model": "x", "max_tokens": 5, "temperature": 0.2}
+    assert call == {}
+
+    instance, call = split_params({"model": "x", "max_tokens": 5, "temperature": 0.2}, Compatible)
+    assert instance == {"model": "x"}
+    assert call == {"max_tokens": 5, "temperature": 0.2}
+
+
+def test_pool_keys_native_instances_by_sampling_params():
+    pool = ProviderPool({"native": Native, "compatible": Compatible}.get)
+    a = pool.acquire("native", model="x", temperature=0.2)
+    b = pool.acquire("native", model="x", temperature=0.9)
+    assert (a.temperature, b.temperature) == (0.2, 0.9)
+    c = pool.acquire("compatible", model="x", temperature=0.2)
+    d = pool.acquire("compatible", model="x", temperature=0.9)
+    assert c is d
+
+
+def test_real_native_provider_signature():
+    providers = pytest.importorskip("providers")
+    groq = providers.get_provider("groq")
+    if groq is None:
+        pytest.skip("groq provider unavailable")
+    instance, call = split_params({"model": "x", "max_tokens": 5, "temperature": 0.2, "stream": True}, groq)
+    assert instance == {"model": "x", "max_tokens": 5, "temperature": 0.2}
+    assert call == {"stream": True}
+
+
+def test_close_instance_closes_every_session():
+    closed = []
+
+    class Session:
+        def __init__(self, name):
+            self.name = name
+
+        def close(self):
+            closed.append(self.name)
+
+    class Provider:
+        def __init__(self, model="m"):
+            self.session = Session("session")
+            self.client = Session("client")
+
+        def close(self):
+            closed.append("instance")
+
+    pool = ProviderPool({"p": Provider}.get, max_instances=1)
+    pool.release(pool.acquire("p", model="a"))
+    pool.release(pool.acquire("p", model="b"))
+    assert closed == ["instance", "session", "client"]
+
+
+def test_async_session_closed_on_eviction_and_shutdown():
+    pytest.importorskip("curl_cffi")
+    base = pytest.importorskip("providers.OPENAI.base")
+
+    class Provider(base.OpenAICompatibleProvider):
+        def __init__(self, model="m"):
+            self.model = model
+
+        @property
+        def models(self):
+            return []
+
+    async def run():
+        pool = ProviderPool({"p": Provider}.get, max_instances=1)
+        first = pool.acquire("p", model="a")
+        evicted = first.async_session()
+        pool.release(first)
+        pool.release(pool.acquire("p", model="b"))
+        await asyncio.sleep(0.01)
+
+        second = pool.acquire("p", model="c")
+        kept = second.async_session()
+        await pool.aclose()
+        return evicted, kept
+
+    evicted, kept = asyncio.run(run())
+    assert evicted._closed and kept._closed
+
+
+def test_async_session_replaced_on_another_loop():
+    pytest.importorskip("curl_cffi")
+    base = pytest.importorskip("providers.OPENAI.base")
+
+    class Provider(base.OpenAICompatibleProvider):
+        def __init__(self):
+            pass
+
+        @property
+        def models(self):
+            return []
+
+    provider = Provider()
+
+    async def session():
+        return provider.async_session()
+
+    first = asyncio.run(session())
+    second = asyncio.run(session())
+    assert first is not second and provider.async_loop is not None
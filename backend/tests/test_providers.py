@@ -0,0 +1,17 @@
+import providers
+
+
+def test_failed_imports_are_reported_unavailable(monkeypatch):
+    monkeypatch.setattr(providers, "_failed", {})
+    monkeypatch.setattr(providers, "_import_seconds", dict(providers._import_seconds))
+    monkeypatch.setitem(
+        providers.PROVIDER_MANIFEST, "broken", providers.ProviderSpec(".DoesNotExist", "Broken", "chat")
+    )
+    assert "broken" in providers.get_all_providers()["providers"]
+
+    assert providers.get_provider("broken") is None
+    listing = providers.get_all_providers()
+    assert "broken" not in listing["providers"]
+    assert listing["count"] == len(listing["providers"])
+    assert "ModuleNotFoundError" in listing["unavailable"]["broken"]
+    assert listing["unavailable"].keys() == providers.get_import_report()["failed"].keys()
@@ -0,0 +1,25 @@
+from gateway.routing import ALIAS, EXACT, PREFIX, ModelRouter
+
+MODELS = {
+    "groq": ["llama-3.3-70b-versatile"],
+    "cloudflare": ["@cf/meta/llama-3.3-70b-instruct"],
+    "deepinfra": ["meta-llama/Llama-3.3-70B-Instruct"],
+}
+
+
+def test_exact_and_alias_matches():
+    router = ModelRouter.from_mapping(MODELS)
+    routes = router.resolve("meta-llama/Llama-3.3-70B-Instruct")
+    assert [(r.provider, r.match) for r in routes] == [("deepinfra", EXACT), ("cloudflare", ALIAS)]
+    assert router.providers_for("LLAMA-3.3-70B-INSTRUCT:free") == ["cloudflare", "deepinfra"]
+
+
+def test_prefix_matches_are_opt_in():
+    assert ModelRouter.from_mapping(MODELS).resolve("llama-3.3-70b") == []
+    assert ModelRouter.from_mapping(MODELS).resolve("llama-3.3-70b-versatile-2025") == []
+
+    router = ModelRouter.from_mapping(MODELS, prefix_matching=True)
+    routes = router.resolve("llama-3.3-70b")
+    assert routes[0].provider == "groq" and routes[0].model == "llama-3.3-70b-versatile"
+    assert {r.match for r in routes} == {PREFIX}
+    assert router.providers_for("llama-3.3-70b-versatile-2025") == ["groq"]
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from gateway.cache import ResponseCache
+from gateway.shared_state import MemoryStore, SharedStore, SQLiteStore
+
+
+def test_shared_store_is_abstract():
+    with pytest.raises(TypeError):
+        SharedStore()
+
+    class Partial(SharedStore):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_response_cache_entries_shared_through_store(tmp_path):
+    path = str(tmp_path / "state.db")
+    # Two workers: separate caches and connections over one store file, no disk tier
+    first = ResponseCache(store=SQLiteStore(path))
+    second = ResponseCache(store=SQLiteStore(path))
+
+    async def run():
+        await first.put("k", {"choices": []}, text="hello")
+        return await second.get("k")
+
+    assert asyncio.run(run()) == {"value": {"choices": []}, "text": "hello"}
+    assert second.stats()["shared"]
+
+
+def test_response_cache_ignores_process_local_store(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path / "cache"), store=MemoryStore())
+    assert cache.store is None
+
+    async def run():
+        await cache.put("k", "value", text="value")
+        return await ResponseCache(directory=str(tmp_path / "cache")).get("k")
+
+    assert asyncio.run(run())["text"] == "value"
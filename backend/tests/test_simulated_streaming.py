@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("webscout.Provider.OPENAI")
+
+from providers.OPENAI import api
+
+
+@pytest.fixture(scope="module")
+def provider_map():
+    api.initialize_provider_map()
+    return api.AppConfig.provider_map
+
+
+@pytest.mark.parametrize("name", sorted(api.SIMULATED_STREAMING_PROVIDERS))
+def test_registered_provider_is_simulated(provider_map, name):
+    provider_class = provider_map[name]
+    assert api.simulated_streaming(provider_class)
+    assert api.simulated_streaming(provider_class.__new__(provider_class))
+
+
+def test_streaming_provider_is_not_simulated(provider_map):
+    assert not api.simulated_streaming(provider_map["DeepInfra"])
+
+
+def test_listing_omits_streaming_capability(provider_map):
+    entries = {e["id"]: e for e in api.listing_entries(provider_map, "text")}
+    e2b = [e for key, e in entries.items() if key.startswith("E2B/")]
+    assert e2b
+    assert all("streaming" not in e["capabilities"] for e in e2b)
+    assert "streaming" in entries[next(k for k in entries if k.startswith("DeepInfra/"))]["capabilities"]
+
+
+def test_provider_stream_makes_one_non_streaming_call(provider_map, monkeypatch):
+    provider_class = provider_map["ChatGPT"]
+    provider = provider_class.__new__(provider_class)
+    calls = []
+
+    def create(**params):
+        calls.append(params)
+        return {"choices": [{"message": {"role": "assistant", "content": "hello there"}}]}
+
+    provider.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+    monkeypatch.setattr(api.config, "simulated_stream_chunk_chars", 0)
+
+    chunks = list(api.provider_stream(provider, model="gpt-4o", messages=[], stream=True))
+    assert [c["stream"] for c in calls] == [False]
+    assert chunks[0]["choices"][0]["delta"]["content"] == "hello there"
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+
+from gateway.singleflight import SingleFlight, coalescing_allowed
+
+
+class Source:
+    """Upstream stream that counts how many items were pulled"""
+
+    def __init__(self, n, hold=None):
+        self.n = n
+        self.pulled = 0
+        self.closed = False
+        self.hold = hold  # pause after this many items until ``release``
+        self.released = asyncio.Event() if hold is not None else None
+
+    def release(self):
+        self.released.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.pulled >= self.n:
+            raise StopAsyncIteration
+        if self.hold is not None and self.pulled >= self.hold:
+            await self.released.wait()
+        self.pulled += 1
+        await asyncio.sleep(0)
+        return self.pulled
+
+    async def aclose(self):
+        self.closed = True
+
+
+def opener(source):
+    async def open_stream():
+        return source
+    return open_stream
+
+
+async def collect(stream):
+    return [item async for item in stream]
+
+
+async def settle():
+    for _ in range(50):
+        await asyncio.sleep(0)
+
+
+def test_coalescing_allowed():
+    assert coalescing_allowed({"temperature": 0})
+    assert not coalescing_allowed({"temperature": 0.7})
+    assert not coalescing_allowed({})
+    assert coalescing_allowed({"temperature": 0.7}, {"x-request-coalesce": "on"})
+    assert not coalescing_allowed({"temperature": 0.7}, {"x-request-coalesce": "off"})
+
+
+def test_stream_shared_by_concurrent_subscribers():
+    async def run():
+        flights = SingleFlight()
+        source = Source(10)
+        a = await flights.stream("k", opener(source))
+        b = await flights.stream("k", opener(Source(10)))
+        results = await asyncio.gather(collect(a), collect(b))
+        return flights, source, results
+
+    flights, source, (a, b) = asyncio.run(run())
+    assert a == b == list(range(1, 11))
+    assert flights.coalesced == 1
+    assert source.closed
+    assert flights.stats()["in_flight_streams"] == 0
+
+
+def test_pump_waits_for_slowest_subscriber():
+    async def run():
+        flights = SingleFlight(max_buffer=4)
+        source = Source(1000)
+        fast = await flights.stream("k", opener(source))
+        slow = await flights.stream("k", opener(source))
+        fast_items = []
+
+        async def drain():
+            async for item in fast:
+                fast_items.append(item)
+        task = asyncio.ensure_future(drain())
+        for _ in range(3):
+            await slow.__anext__()
+        await settle()
+        pulled = source.pulled
+        await slow.aclose()
+        await asyncio.wait_for(task, 5)
+        return pulled, fast_items
+
+    pulled, fast_items = asyncio.run(run())
+    assert pulled <= 3 + 4 + 1
+    assert fast_items == list(range(1, 1001))
+
+
+def test_late_subscriber_receives_buffered_prefix():
+    async def run():
+        flights = SingleFlight(max_buffer=8)
+        first = Source(5, hold=3)
+        a = await flights.stream("k", opener(first))
+        await a.__anext__()
+        await settle()
+        second = Source(5)
+        b = await flights.stream("k", opener(second))
+        first.release()
+        rest, late = await asyncio.gather(collect(a), collect(b))
+        return flights, [1] + rest, late, second
+
+    flights, a, b, second = asyncio.run(run())
+    assert a == b == [1, 2, 3, 4, 5]
+    assert second.pulled == 0
+    assert flights.coalesced == 1
+
+
+def test_subscriber_after_overflow_opens_own_flight():
+    async def run():
+        flights = SingleFlight(max_buffer=2)
+        first = Source(5)
+        a = await flights.stream("k", opener(first))
+        for _ in range(3):
+            await a.__anext__()
+        await settle()
+        second = Source(5)
+        b = await flights.stream("k", opener(second))
+        await collect(a)
+        return await collect(b), second
+
+    b, second = asyncio.run(run())
+    assert b == [1, 2, 3, 4, 5]
+    assert second.pulled == 5
+
+
+def test_pump_cancelled_while_opening_ends_subscribers():
+    async def run():
+        flights = SingleFlight()
+        opening = asyncio.Event()
+
+        async def open_stream():
+            opening.set()
+            await asyncio.sleep(3600)
+
+        subscribe = asyncio.ensure_future(flights.stream("k", open_stream))
+        await opening.wait()
+        flights._streams["k"].task.cancel()
+        stream = await asyncio.wait_for(subscribe, 5)
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(stream.__anext__(), 5)
+        return flights
+
+    flights = asyncio.run(run())
+    assert flights.stats()["in_flight_streams"] == 0
+
+
+def test_open_error_raised_to_every_subscriber():
+    async def run():
+        flights = SingleFlight()
+
+        async def open_stream():
+            await asyncio.sleep(0)
+            raise ValueError("no such provider")
+
+        return await asyncio.gather(
+            flights.stream("k", open_stream), flights.stream("k", open_stream), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
@@ -0,0 +1,87 @@
+import asyncio
+import copy
+import datetime
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from gateway import sse
+from gateway.sse import DONE_EVENT, ChunkEncoder, chat_completion_events
+
+ENVELOPE = {"id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 1700000000, "model": "m"}
+
+
+def chunk(delta, finish_reason=None, **extra):
+    return dict(ENVELOPE, choices=[dict({"index": 0, "delta": delta, "finish_reason": finish_reason}, **extra)])
+
+
+CHUNKS = [
+    chunk({"role": "assistant", "content": ""}),
+    chunk({"content": "Hello, 世界   \"quoted\"\n\ttab"}),
+    chunk({"content": "bell\x07 null\x00"}),
+    chunk({"tool_calls": [{"index": 0, "id": "call_1", "type": "function",
+                           "function": {"name": "f", "arguments": '{"a": 1}'}}]}),
+    dict(chunk({"content": "x"}), usage={"prompt_tokens": 3, "completion_tokens": 1, "total_tokens": 4}),
+    dict(chunk({"content": "when"}), created_at=datetime.datetime(2024, 1, 2, 3, 4, 5)),
+    chunk({}, finish_reason="stop"),
+]
+
+
+def previous_event(data):
+    """The framing before orjson: json.dumps, with compact separators"""
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+    return f"data: {body}\n\n".encode("utf-8")
+
+
+def encode_all(chunks):
+    encoder = ChunkEncoder()
+    return [encoder.encode(copy.deepcopy(c))[0] for c in chunks]
+
+
+def test_events_match_json_framing_byte_for_byte():
+    pytest.importorskip("orjson")
+    events = encode_all(CHUNKS)
+    for event, data in zip(events, CHUNKS):
+        expected = copy.deepcopy(data)
+        for choice in expected["choices"]:
+            if "content" in choice["delta"]:
+                choice["delta"] = dict(choice["delta"], content=sse.clean_text(choice["delta"]["content"]))
+        assert event == previous_event(expected)
+        assert event.startswith(b"data: ") and event.endswith(b"\n\n")
+    assert DONE_EVENT == b"data: [DONE]\n\n"
+
+
+def test_json_fallback_without_orjson(monkeypatch):
+    with_orjson = encode_all(CHUNKS)
+    monkeypatch.setattr(sse, "orjson", None)
+    without = encode_all(CHUNKS)
+    assert without == with_orjson
+    assert sse.dumps({"a": [1, "é"]}) == '{"a":[1,"é"]}'.encode("utf-8")
+
+
+def test_attribute_chunks_encode_like_dicts():
+    delta = SimpleNamespace(role=None, content="hi", tool_calls=None, function_call=None)
+    obj = SimpleNamespace(
+        id="chatcmpl-1", created=1700000000, model="m", usage=None, system_fingerprint=None,
+        choices=[SimpleNamespace(index=0, delta=delta, finish_reason=None, logprobs=None)],
+    )
+    assert ChunkEncoder().encode(obj) == ChunkEncoder().encode(chunk({"content": "hi"}))
+
+
+def test_chat_completion_events_stream():
+    async def text():
+        for piece in ("Hel", "lo"):
+            yield piece
+
+    async def run():
+        return [e async for e in chat_completion_events(text(), model="m", request_id="chatcmpl-1")]
+
+    events = asyncio.run(run())
+    assert events[-1] == DONE_EVENT
+    payloads = [json.loads(e[len(b"data: "):]) for e in events[:-1]]
+    assert [p["choices"][0]["delta"] for p in payloads] == [
+        {"role": "assistant", "content": ""}, {"content": "Hel"}, {"content": "lo"}, {},
+    ]
+    assert payloads[-1]["choices"][0]["finish_reason"] == "stop"
+    assert all(p["id"] == "chatcmpl-1" and p["model"] == "m" for p in payloads)
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+try:
+    import webscout_core
+except ImportError as e:  # config needs pydantic v1's BaseSettings
+    pytest.skip(f"webscout_core unavailable: {e}", allow_module_level=True)
+
+
+class Native:
+    """Provider shaped like the webscout ones: sampling parameters fixed at construction"""
+
+    def __init__(self, model="m", max_tokens=600, temperature=1.0):
+        self.model = model
+        self.max_tokens_to_sample = max_tokens
+        self.temperature = temperature
+
+    def chat(self, messages, stream=False):
+        return f"{self.max_tokens_to_sample}/{self.temperature}"
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    monkeypatch.setattr(webscout_core.settings, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(webscout_core.settings, "RESPONSE_CACHE_ENABLED", False)
+    instance = webscout_core.WebscoutAPI()
+    instance.providers.factory = {"native": Native}.get
+    instance.default_provider = "native"
+    yield instance
+    instance.executor.shutdown()
+
+
+def test_warmed_instance_serves_default_request(api):
+    api.warm_provider("native", "native")
+
+    result = asyncio.run(api.chat_completions({"model": "native", "messages": [{"role": "user", "content": "hi"}]}))
+    stats = api.providers.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert result == "1000/0.7"
+
+
+def test_cache_hit_leaves_half_open_probe_unclaimed(api, monkeypatch):
+    monkeypatch.setattr(webscout_core.settings, "RESPONSE_CACHE_ENABLED", True)
+    cached = webscout_core.WebscoutAPI()
+    cached.providers.factory = {"native": Native}.get
+    cached.default_provider = "native"
+    request = {"model": "native", "messages": [{"role": "user", "content": "hi"}], "temperature": 0}
+    try:
+        asyncio.run(cached.chat_completions(dict(request)))
+        for _ in range(cached.health.failure_threshold):
+            cached.health.record_failure("native", "boom")
+        cached.health._breakers["native"].open_until = 0.0
+
+        asyncio.run(cached.chat_completions(dict(request)))
+        assert cached.health.snapshot()["native"]["state"] == "open"
+
+        asyncio.run(cached.chat_completions(dict(request), cache_control="no-cache"))
+        assert cached.health.snapshot()["native"]["state"] == "closed"
+    finally:
+        cached.executor.shutdown()
+
+
+def test_resolved_model_reported_in_response_headers(api):
+    api._rebuild_router({"providers": {"native": {"models": ["Native-Large"]}}})
+    headers = {}
+    asyncio.run(api.chat_completions(
+        {"model": "native-large", "messages": [{"role": "user", "content": "hi"}]}, response_headers=headers
+    ))
+    assert headers == {"X-Resolved-Model": "native/Native-Large"}
@@ -3,69 +3,336 @@ Webscout Core API Integration
 Main API handler for all webscout functionality
 """
 
+import os
 import json
+import math
 import asyncio
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Mapping, MutableMapping, Optional, Union
 from fastapi import HTTPException
-from providers import get_provider, get_all_providers
+from providers import get_provider, get_all_providers, get_loaded_provider, get_static_models
 from config import settings
+from gateway import ModelCatalog, ModelRouter, ProviderExecutor, ProviderPool, Route, TrafficStats, Warmup
+from gateway.cache import ResponseCache, cache_key, cache_policy, completion_text, replay_stream
+from gateway.balancer import LoadBalancer
+from gateway.executor import native_coroutine
+from gateway.health import HealthRegistry, ProviderUnavailable, UpstreamHTMLError
+from gateway.limiter import Overloaded
+from gateway.metrics import RequestMetrics
+from gateway.pool import SAMPLING_PARAMS, call_params
+from gateway.routing import RESOLVED_MODEL_HEADER
+from gateway.shared_state import create_store
+from gateway.singleflight import SingleFlight, coalescing_allowed
+from gateway.sse import delta_text
+from gateway.warmup import preconnect
+
+
+# Sampling parameters a chat request gets when it does not set them. Native providers
+# build these into pooled instances, so warm-up leases with them too.
+DEFAULT_SAMPLING = {"max_tokens": 1000, "temperature": 0.7}
 
 
 class WebscoutAPI:
     """Main Webscout API handler"""
     
     def __init__(self):
-        self.providers = {}
         self.default_provider = settings.DEFAULT_PROVIDER
+        self.shared_state = create_store(
+            settings.SHARED_STATE_URL, settings.DATA_DIR, workers=settings.WEB_CONCURRENCY
+        )
+        self.providers = ProviderPool(
+            get_provider,
+            max_instances=settings.PROVIDER_POOL_MAX_INSTANCES,
+            max_memory_mb=settings.PROVIDER_POOL_MAX_MEMORY_MB,
+            idle_ttl=settings.PROVIDER_POOL_IDLE_TTL
+        )
+        self.executor = ProviderExecutor(
+            max_workers=settings.EXECUTOR_MAX_WORKERS,
+            per_provider_limit=settings.PROVIDER_MAX_CONCURRENCY,
+            global_limit=settings.GLOBAL_MAX_CONCURRENCY,
+            max_queue=settings.PROVIDER_QUEUE_MAX,
+            queue_timeout=settings.PROVIDER_QUEUE_TIMEOUT,
+            async_per_provider_limit=settings.ASYNC_PROVIDER_MAX_CONCURRENCY,
+            async_global_limit=settings.ASYNC_GLOBAL_MAX_CONCURRENCY
+        )
+        self.catalog = ModelCatalog(
+            lambda: get_all_providers()["providers"],
+            get_loaded_provider,
+            get_static_models,
+            path=os.path.join(settings.DATA_DIR, "model_catalog.json"),
+            refresh_interval=settings.MODEL_CATALOG_REFRESH_INTERVAL,
+            store=self.shared_state
+        )
+        self.router = ModelRouter(settings.MODEL_PREFIX_MATCHING)
+        self.catalog.subscribe(self._rebuild_router)
+        self.response_cache = ResponseCache(
+            directory=os.path.join(settings.DATA_DIR, "response_cache"),
+            ttl=settings.RESPONSE_CACHE_TTL,
+            max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+            max_memory_mb=settings.RESPONSE_CACHE_MAX_MEMORY_MB,
+            max_disk_mb=settings.RESPONSE_CACHE_MAX_DISK_MB,
+            deterministic_only=settings.RESPONSE_CACHE_DETERMINISTIC_ONLY,
+            store=self.shared_state
+        ) if settings.RESPONSE_CACHE_ENABLED else None
+        self.health = HealthRegistry(
+            failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+            open_seconds=settings.CIRCUIT_OPEN_SECONDS,
+            max_open_seconds=settings.CIRCUIT_MAX_OPEN_SECONDS,
+            store=self.shared_state
+        )
+        self.balancer = LoadBalancer(self.health) if settings.LOAD_BALANCING_ENABLED else None
+        self.inflight = SingleFlight() if settings.REQUEST_COALESCING_ENABLED else None
+        self.traffic = TrafficStats(path=os.path.join(settings.DATA_DIR, "provider_traffic.json"))
+        self.warmup = Warmup(
+            self.traffic,
+            self.warm_provider,
+            top_n=settings.WARMUP_TOP_N,
+            timeout=settings.WARMUP_TIMEOUT
+        )
     
     def get_provider_instance(self, provider_name: str, **kwargs):
-        """Get or create a provider instance"""
-        provider_key = f"{provider_name}_{hash(str(kwargs))}"
-        
-        if provider_key not in self.providers:
-            provider_class = get_provider(provider_name)
-            if not provider_class:
-                raise HTTPException(status_code=404, detail=f"Provider '{provider_name}' not found")
-            
-            self.providers[provider_key] = provider_class(**kwargs)
-        
-        return self.providers[provider_key]
+        """Lease a pooled provider instance; pair with ``release_provider_instance``
+
+        Sampling parameters (``max_tokens``, ``temperature``, ...) that the provider's
+        ``chat`` accepts do not create new instances; they are passed on each call instead.
+        """
+        try:
+            return self.providers.acquire(provider_name, **kwargs)
+        except LookupError:
+            raise HTTPException(status_code=404, detail=f"Provider '{provider_name}' not found")
+    
+    def release_provider_instance(self, provider) -> None:
+        """Return a leased provider instance to the pool"""
+        self.providers.release(provider)
+    
+    def warm_provider(self, provider_name: str, model: Optional[str] = None) -> None:
+        """Import, construct and pre-connect a provider so its first request is fast
+
+        The instance is leased as a default request would lease it, so that request
+        reuses it.
+        """
+        kwargs = {"model": model} if model else {}
+        provider = self.get_provider_instance(provider_name, **kwargs, **DEFAULT_SAMPLING)
+        try:
+            preconnect(provider)
+        finally:
+            self.release_provider_instance(provider)
+    
+    async def _release_after(self, provider, chunks: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """Hold the provider lease for the lifetime of a stream"""
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await chunks.aclose()
+            self.release_provider_instance(provider)
+    
+    async def _cache_stream(self, key: str, chunks: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """Relay a stream and cache its text once it completes without error"""
+        parts: List[str] = []
+        async for chunk in chunks:
+            text = delta_text(chunk)
+            if text:
+                parts.append(text)
+            yield chunk
+        text = "".join(parts)
+        await self.response_cache.put(key, text, text=text)
+    
+    async def _lease(self, provider_name: str, model: str, call_kwargs: Dict[str, Any]):
+        """Get a provider instance (constructors may do network I/O); failures count against its health
+
+        This is where a call is committed to the upstream, so the circuit breaker is
+        consulted (and a half-open probe claimed) here rather than when the route is
+        chosen. Sampling parameters go along so the pool can build them into instances of
+        providers whose ``chat`` does not take them.
+        """
+        self.health.check(provider_name)
+        sampling = {k: v for k, v in call_kwargs.items() if k in SAMPLING_PARAMS}
+        try:
+            provider = await self.executor.run(
+                provider_name, self.get_provider_instance, provider_name, model=model, **sampling
+            )
+            self.catalog.provider_loaded(provider_name)
+            return provider
+        except (HTTPException, Overloaded):
+            raise
+        except Exception as e:
+            self.health.record_failure(provider_name, e)
+            raise
+    
+    def _choose_route(self, model: str) -> Optional[Route]:
+        """Best route under current load whose provider's circuit breaker would let a call through"""
+        routes = self.resolve_routes(model)
+        if not routes:
+            return None
+        if self.balancer is not None:
+            routes = self.balancer.order(routes)
+        for route in routes:
+            if self.health.available(route.provider):
+                return route
+        provider = routes[0].provider
+        raise ProviderUnavailable(provider, self.health.retry_after(provider))
     
-    async def chat_completions(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle OpenAI-compatible chat completions"""
+    async def _open_stream(
+        self,
+        provider_name: str,
+        model: str,
+        messages: List[Dict[str, Any]],
+        call_kwargs: Dict[str, Any],
+        key: Optional[str] = None
+    ) -> AsyncIterator[Any]:
+        """Lease a provider and start streaming from it
+
+        Providers with an ``async def`` chat (``achat`` preferred) stream on the event
+        loop; the rest stream through the executor's thread pool.
+        """
+        provider = await self._lease(provider_name, model, call_kwargs)
+        try:
+            achat = native_coroutine(provider, "achat", "chat")
+            if achat is not None:
+                chunks = await self.executor.open_async_stream(
+                    provider_name, achat, messages=messages, stream=True, **call_params(achat, call_kwargs)
+                )
+            else:
+                chunks = await self.executor.open_stream(
+                    provider_name, provider.chat, messages=messages, stream=True,
+                    **call_params(provider.chat, call_kwargs)
+                )
+        except BaseException:
+            self.release_provider_instance(provider)
+            raise
+        chunks = self._release_after(provider, self.health.observe_stream(provider_name, chunks))
+        return self._cache_stream(key, chunks) if key else chunks
+    
+    async def _complete(
+        self,
+        provider_name: str,
+        model: str,
+        messages: List[Dict[str, Any]],
+        call_kwargs: Dict[str, Any],
+        key: Optional[str] = None
+    ) -> Any:
+        """Lease a provider and run a non-streaming completion on it"""
+        provider = await self._lease(provider_name, model, call_kwargs)
+        try:
+            achat = native_coroutine(provider, "achat", "chat")
+            if achat is not None:
+                call = self.executor.run_async(
+                    provider_name, achat, messages=messages, stream=False, **call_params(achat, call_kwargs)
+                )
+            else:
+                call = self.executor.run(
+                    provider_name, provider.chat, messages=messages, stream=False,
+                    **call_params(provider.chat, call_kwargs)
+                )
+            result = await self.health.observe(provider_name, call)
+        finally:
+            self.release_provider_instance(provider)
+        if key:
+            await self.response_cache.put(key, result, text=completion_text(result))
+        return result
+    
+    async def chat_completions(
+        self,
+        request: Dict[str, Any],
+        cache_control: Optional[str] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        response_headers: Optional[MutableMapping[str, str]] = None
+    ) -> Union[Dict[str, Any], AsyncIterator[Any]]:
+        """Handle OpenAI-compatible chat completions
+
+        Provider construction and the provider call itself run on the executor's thread
+        pool. For ``stream=True`` an async iterator over the provider's chunks is returned.
+        With the response cache enabled, deterministic requests are answered from cache
+        unless ``cache_control`` says ``no-cache`` / ``no-store``; concurrent identical
+        requests are coalesced onto one upstream call when they sample greedily
+        (``temperature: 0``) or ``headers`` opt in with ``X-Request-Coalesce: on``. The
+        provider and model that serve the request go into ``response_headers`` as
+        ``X-Resolved-Model``.
+        """
+        with RequestMetrics("chat", model=request.get("model", self.default_provider)) as metrics:
+            response = await self._chat_completions(request, cache_control, headers, response_headers, metrics)
+            if request.get("stream", False):
+                return metrics.wrap(response)
+            return response
+    
+    async def _chat_completions(
+        self,
+        request: Dict[str, Any],
+        cache_control: Optional[str],
+        headers: Optional[Mapping[str, str]],
+        response_headers: Optional[MutableMapping[str, str]],
+        metrics: RequestMetrics
+    ) -> Union[Dict[str, Any], AsyncIterator[Any]]:
         try:
             # Extract request parameters
             model = request.get("model", self.default_provider)
             messages = request.get("messages", [])
             stream = request.get("stream", False)
-            max_tokens = request.get("max_tokens", 1000)
-            temperature = request.get("temperature", 0.7)
+            max_tokens = request.get("max_tokens", DEFAULT_SAMPLING["max_tokens"])
+            temperature = request.get("temperature", DEFAULT_SAMPLING["temperature"])
             
-            # Determine provider from model name
-            provider_name = self._get_provider_from_model(model)
+            # Determine provider (and that provider's id for the model) from the model name
+            route = self._choose_route(model)
+            if route is not None:
+                provider_name, model = route.provider, route.model
+            else:
+                provider_name = self.default_provider.lower()
+                if not self.health.available(provider_name):
+                    raise ProviderUnavailable(provider_name, self.health.retry_after(provider_name))
+            self.traffic.record(provider_name, model)
+            metrics.provider, metrics.model = provider_name, model
+            if response_headers is not None:
+                response_headers[RESOLVED_MODEL_HEADER] = f"{provider_name}/{model}"
             
-            # Get provider instance
-            provider = self.get_provider_instance(
-                provider_name,
-                model=model,
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
+            # Sampling parameters travel with the call where the provider's chat takes them
+            call_kwargs = {"max_tokens": max_tokens, "temperature": temperature}
+            call_kwargs.update({k: v for k, v in request.items() if k not in ["model", "messages", "stream"]})
             
-            # Make the request
-            response = provider.chat(
-                messages=messages,
-                stream=stream,
-                **{k: v for k, v in request.items() if k not in ["model", "messages", "stream"]}
-            )
+            lookup, store = cache_policy(cache_control)
+            request_key = cache_key(provider_name, model, messages, call_kwargs)
+            key = None
+            if self.response_cache is not None and self.response_cache.cacheable(call_kwargs):
+                if lookup:
+                    entry = await self.response_cache.get(request_key)
+                    if entry is not None:
+                        return replay_stream(entry["text"]) if stream else entry["value"]
+                if store:
+                    key = request_key
             
-            return response
+            if self.inflight is None or not lookup or not coalescing_allowed(call_kwargs, headers):
+                if stream:
+                    return await self._open_stream(provider_name, model, messages, call_kwargs, key)
+                return await self._complete(provider_name, model, messages, call_kwargs, key)
             
+            # Identical requests already in flight share their upstream call
+            flight_key = f"{'stream' if stream else 'call'}:{request_key}"
+            if stream:
+                return await self.inflight.stream(
+                    flight_key, lambda: self._open_stream(provider_name, model, messages, call_kwargs, key)
+                )
+            return await self.inflight.run(
+                flight_key, lambda: self._complete(provider_name, model, messages, call_kwargs, key)
+            )
+            
+        except HTTPException:
+            raise
+        except Overloaded as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers)
+        except ProviderUnavailable as e:
+            raise HTTPException(
+                status_code=503, detail=str(e), headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+            )
+        except UpstreamHTMLError as e:
+            raise HTTPException(status_code=502, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
     async def search(self, query: str, engine: str = "google", max_results: int = 10) -> Dict[str, Any]:
         """Handle web search requests"""
+        with RequestMetrics("search", provider=engine):
+            return await self._search(query, engine, max_results)
+    
+    async def _search(self, query: str, engine: str, max_results: int) -> Dict[str, Any]:
         try:
             # This would integrate with webscout's search functionality
             # For now, return a mock response
@@ -86,60 +353,44 @@ class WebscoutAPI:
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
+    def _rebuild_router(self, catalog: Dict[str, Any]) -> None:
+        """Re-index model -> provider routes whenever the catalog changes"""
+        self.router = ModelRouter.from_mapping({
+            name: info.get("models", []) for name, info in catalog.get("providers", {}).items()
+        }, prefix_matching=settings.MODEL_PREFIX_MATCHING)
+    
+    def resolve_routes(self, model: str) -> List[Route]:
+        """Ranked (provider, provider model id) routes able to serve ``model``
+
+        ``provider/model`` pins a provider explicitly; anything else goes through the
+        routing index built from every provider's model list.
+        """
+        if "/" in model:
+            provider_name, provider_model = model.split("/", 1)
+            if provider_name.lower() in self.router.providers:
+                return [Route(provider_name.lower(), provider_model)]
+        return self.router.resolve(model)
+    
     def _get_provider_from_model(self, model: str) -> str:
         """Determine provider from model name"""
-        model_lower = model.lower()
-        
-        # Model to provider mapping
-        if "gpt" in model_lower or "openai" in model_lower:
-            return "openai"
-        elif "gemini" in model_lower or "google" in model_lower:
-            return "gemini"
-        elif "claude" in model_lower or "anthropic" in model_lower:
-            return "claude"
-        elif "llama" in model_lower and "groq" in model_lower:
-            return "groq"
-        elif "llama" in model_lower or "meta" in model_lower:
-            return "meta"
-        elif "command" in model_lower or "cohere" in model_lower:
-            return "cohere"
-        elif "mixtral" in model_lower or "groq" in model_lower:
-            return "groq"
-        else:
-            # Default to the configured default provider
-            return self.default_provider.lower()
+        routes = self.resolve_routes(model)
+        if routes:
+            return routes[0].provider
+        # Default to the configured default provider
+        return self.default_provider.lower()
     
     def get_available_models(self) -> Dict[str, Any]:
-        """Get all available models from all providers"""
-        all_models = {}
-        providers_info = get_all_providers()
-        
-        for provider_name in providers_info["providers"]:
-            try:
-                provider_class = get_provider(provider_name)
-                if provider_class:
-                    # Create a temporary instance to get models
-                    temp_provider = provider_class()
-                    models = temp_provider.get_models()
-                    all_models[provider_name] = {
-                        "models": models,
-                        "count": len(models)
-                    }
-            except Exception as e:
-                all_models[provider_name] = {
-                    "models": [],
-                    "count": 0,
-                    "error": str(e)
-                }
-        
-        return {
-            "providers": all_models,
-            "total_providers": len(all_models),
-            "total_models": sum(info.get("count", 0) for info in all_models.values())
-        }
+        """Get all available models from all providers (served from the catalog)"""
+        if self.catalog.payload is None:
+            return self.catalog.build()
+        return self.catalog.payload
     
     async def generate_image(self, prompt: str, **kwargs) -> Dict[str, Any]:
         """Handle image generation requests"""
+        with RequestMetrics("image", provider=kwargs.get("provider"), model=kwargs.get("model")):
+            return await self._generate_image(prompt, **kwargs)
+    
+    async def _generate_image(self, prompt: str, **kwargs) -> Dict[str, Any]:
         try:
             # This would integrate with webscout's image generation
             # For now, return a mock response
@@ -160,6 +411,10 @@ class WebscoutAPI:
     
     async def text_to_speech(self, text: str, voice: str = "default", **kwargs) -> Dict[str, Any]:
         """Handle text-to-speech requests"""
+        with RequestMetrics("tts", provider=kwargs.get("provider"), model=kwargs.get("model")):
+            return await self._text_to_speech(text, voice, **kwargs)
+    
+    async def _text_to_speech(self, text: str, voice: str = "default", **kwargs) -> Dict[str, Any]:
         try:
             # This would integrate with webscout's TTS functionality
             # For now, return a mock response